@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+未映射按键放行基准测试
+使用内存后端比较三种情况下按键到达“操作系统”的额外延迟：
+未安装钩子（基线）、钩子放行原事件（未映射 / 暂停）、屏蔽后补发（旧的处理方式）
+
+运行方式:
+    python bench_passthrough.py
+    python bench_passthrough.py --count 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加当前目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from key_mapper import ModeManager
+from key_mapper.backends import use_backend
+from key_mapper.core.action_queue import ActionQueue
+from key_mapper.core.models import KeyMapping
+from key_mapper.utils.latency import LatencyHistogram
+from wheel_tool.config.settings import GlobalConfig
+from wheel_tool.input.replay import TraceReplayer
+
+
+def measure_feed(backend, key_name: str, count: int) -> LatencyHistogram:
+    """测量按下事件从进入钩子到被放行的时间"""
+    hist = LatencyHistogram()
+    for _ in range(count):
+        t0 = time.perf_counter_ns()
+        passed = backend.key_down(key_name)
+        hist.record(time.perf_counter_ns() - t0)
+        backend.key_up(key_name)
+        if not passed:
+            raise RuntimeError(f"{key_name} 被屏蔽，预期应放行")
+    return hist
+
+
+def measure_resend(backend, listener, key_name: str, count: int) -> LatencyHistogram:
+    """测量按下事件被屏蔽后由执行线程补发出去的时间"""
+    hist = LatencyHistogram()
+    for _ in range(count):
+        backend.clear()
+        t0 = time.perf_counter_ns()
+        backend.key_down(key_name)
+        listener.action_queue.wait_idle(timeout=5)
+        backend.key_up(key_name)
+        if backend.injected:
+            hist.record(backend.injected[0][0] - t0)
+    return hist
+
+
+def report(label: str, hist: LatencyHistogram, baseline: float = 0.0):
+    s = hist.summary()
+    print(f"{label:<12} p50={s['p50_us']:7.1f}us  p99={s['p99_us']:7.1f}us  "
+          f"max={s['max_us']:8.1f}us  额外(p50)={s['p50_us'] - baseline:7.1f}us")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="未映射按键放行基准测试")
+    parser.add_argument("--count", type=int, default=2000, help="每种情况的按键次数")
+    args = parser.parse_args()
+
+    GlobalConfig.load()
+    use_backend("memory")
+    mode_manager = ModeManager()
+    mode = mode_manager.modes[0]
+    mode.set_mapping(KeyMapping("f13", "a", True, "", "keyboard"))
+    # 把按键映射为自身，模拟旧的“屏蔽后补发”处理
+    mode.set_mapping(KeyMapping("f14", "f14", True, "", "keyboard"))
+
+    replayer = TraceReplayer(mode_manager)
+    backend, listener = replayer.backend, replayer.listener
+    listener.action_queue = ActionQueue()
+    listener.action_queue.start()
+    listener.reload()
+
+    baseline = measure_feed(backend, "j", args.count)
+
+    backend.hook(listener._on_key_event)
+    unmapped = measure_feed(backend, "j", args.count)
+    listener.running = True  # 暂停时换成只监听的钩子（不启动界面）
+    listener.set_pause_state(True)
+    paused = measure_feed(backend, "f13", args.count)
+    listener.set_pause_state(False)
+    resend = measure_resend(backend, listener, "f14", args.count)
+
+    listener.action_queue.stop()
+    backend.unhook()
+
+    base_us = baseline.summary()['p50_us']
+    print("=" * 72)
+    print(f"每种情况 {args.count} 次按键")
+    report("无钩子", baseline, base_us)
+    report("未映射放行", unmapped, base_us)
+    report("暂停放行", paused, base_us)
+    report("屏蔽后补发", resend, base_us)
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
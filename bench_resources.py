@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+动作资源共享基准测试
+比较随模式数量增长时创建所有模式的耗时和内存：
+每个执行器各自创建资源（旧的处理方式：各自的后端即键盘鼠标控制器，Windows 上同时创建窗口切换器）
+与所有模式共享一份资源
+memory 后端的控制器几乎没有开销，--backend native 才能测出真实键盘鼠标控制器的差距
+
+运行方式:
+    python bench_resources.py
+    python bench_resources.py --modes 4 16 64 --repeat 5
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加当前目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from key_mapper.backends import get_backend, use_backend
+from key_mapper.core import executors
+from key_mapper.core.models import KeyMapping
+from key_mapper.core.modes import CustomMode
+from wheel_tool.config.settings import GlobalConfig
+
+MAPPINGS = [
+    KeyMapping("f13", "ctrl+w", True, "", "keyboard"),
+    KeyMapping("f14", "down:3", True, "", "mouse_scroll"),
+    KeyMapping("f15", "next", True, "", "window_cycle"),
+    KeyMapping("f16", "echo hi", True, "", "command"),
+]
+
+
+def private_resources():
+    """旧的处理方式：每个执行器各自创建后端（控制器）和资源，窗口切换器在启动时创建"""
+    resources = executors.ActionResources(backend=type(get_backend())())
+    resources.window_cycler
+    return resources
+
+
+def build_modes(count: int):
+    """创建 count 个模式并编译映射"""
+    modes = []
+    for i in range(count):
+        mode = CustomMode(f"模式{i}")
+        for mapping in MAPPINGS:
+            mode.set_mapping(KeyMapping.from_dict(mapping.to_dict()))
+        modes.append(mode)
+    return modes
+
+
+def measure(count: int, shared: bool, repeat: int) -> tuple:
+    """返回 (耗时中位数 ms, 内存 KB, 资源份数, 后端份数)"""
+    original = executors.get_action_resources
+    if not shared:
+        executors.get_action_resources = private_resources
+    try:
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            t0 = time.perf_counter()
+            modes = build_modes(count)
+            times.append((time.perf_counter() - t0) * 1000)
+            del modes
+
+        gc.collect()
+        tracemalloc.start()
+        modes = build_modes(count)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        executors.get_action_resources = original
+
+    resources = len({id(mode.action_executor.resources) for mode in modes})
+    backends = len({id(mode.action_executor.resources.backend) for mode in modes})
+    return statistics.median(times), memory / 1024, resources, backends
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="动作资源共享基准测试")
+    parser.add_argument("--modes", type=int, nargs="+", default=[4, 16, 64, 256], help="模式数量")
+    parser.add_argument("--repeat", type=int, default=5, help="每种情况的重复次数")
+    parser.add_argument("--backend", default="memory", help="输入后端 (memory / native)")
+    args = parser.parse_args()
+
+    GlobalConfig.load()
+    use_backend(args.backend)
+    executors.get_action_resources()  # 后端本身的创建不计入
+
+    print("=" * 72)
+    print(f"后端: {args.backend}  窗口切换器: {'创建' if sys.platform == 'win32' else '不可用（非 Windows）'}")
+    print(f"{'模式数':>6}  {'独立资源 ms':>12} {'KB':>9}  {'共享资源 ms':>12} {'KB':>9}  {'节省 ms':>9} {'KB':>9}")
+    for count in args.modes:
+        p_ms, p_kb, p_res, p_backends = measure(count, False, args.repeat)
+        s_ms, s_kb, s_res, s_backends = measure(count, True, args.repeat)
+        print(f"{count:>6}  {p_ms:>12.2f} {p_kb:>9.1f}  {s_ms:>12.2f} {s_kb:>9.1f}  "
+              f"{p_ms - s_ms:>9.2f} {p_kb - s_kb:>9.1f}   "
+              f"(资源 {p_res} -> {s_res} 份，后端 {p_backends} -> {s_backends} 份)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,18 @@ Key Mapper Module
 """
 
 from .core.manager import ModeManager
+from .core.mode_state import ModeState, ModeSnapshot
 from .core.models import BaseMode, KeyMapping
+from .core.actions import ActionCompileError, CompiledAction
 from .core.modes import BrowseMode, MediaMode, VideoMode, WindowMode, CustomMode
 from .config.storage import ConfigManager, load_config, save_config
 from .ui.mapping_panel import MappingPanel
 from .ui.components import BasePanel, UIHelper
 
 __all__ = [
-    'ModeManager',
+    'ModeManager', 'ModeState', 'ModeSnapshot',
     'BaseMode', 'KeyMapping',
+    'ActionCompileError', 'CompiledAction',
     'BrowseMode', 'MediaMode', 'VideoMode', 'WindowMode', 'CustomMode',
     'ConfigManager', 'load_config', 'save_config',
     'MappingPanel',
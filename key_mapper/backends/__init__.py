@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+输入输出后端
+通过配置 input.backend 选择：native（keyboard + pynput）或 memory（内存假后端）
+"""
+
+import threading
+from typing import Optional
+
+from .base import InputBackend, KeyStroke, KEY_DOWN, KEY_UP, KEY_NAMES, MOUSE_BUTTONS, combo_strokes
+from .memory import MemoryBackend, MemoryEvent
+
+
+def _native_backend() -> InputBackend:
+    from .native import NativeBackend
+    return NativeBackend()
+
+
+_FACTORIES = {
+    "native": _native_backend,
+    "memory": MemoryBackend,
+}
+
+_backend: Optional[InputBackend] = None
+_backend_name = "native"
+_lock = threading.Lock()
+
+
+def register_backend(name: str, factory):
+    """注册自定义后端"""
+    _FACTORIES[name] = factory
+
+
+def use_backend(name: str):
+    """选择进程使用的后端，须在创建 ModeManager / HotkeyListener 之前调用"""
+    global _backend, _backend_name
+    if name not in _FACTORIES:
+        print(f"[后端] 未知的后端: {name}，使用 native")
+        name = "native"
+    with _lock:
+        if _backend is not None and _backend.name != name:
+            _backend = None
+        _backend_name = name
+
+
+def get_backend() -> InputBackend:
+    """获取进程内共享的后端实例（首次调用时创建）"""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = _FACTORIES[_backend_name]()
+    return _backend
+
+
+__all__ = [
+    'InputBackend', 'MemoryBackend', 'MemoryEvent', 'KeyStroke', 'combo_strokes',
+    'KEY_DOWN', 'KEY_UP', 'KEY_NAMES', 'MOUSE_BUTTONS',
+    'register_backend', 'use_backend', 'get_backend',
+]
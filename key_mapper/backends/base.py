@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+输入输出后端接口
+抽象全局键盘钩子（拦截/放行）与按键、鼠标事件注入
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Sequence, Tuple
+
+KEY_DOWN = 'down'
+KEY_UP = 'up'
+
+# 可注入的按键名（单个字符之外）
+KEY_NAMES = frozenset({
+    "space", "enter", "tab", "backspace", "delete",
+    "up", "down", "left", "right", "home", "end", "page_up", "page_down", "esc",
+    "f1", "f2", "f3", "f4", "f5", "f6", "f7", "f8", "f9", "f10", "f11", "f12",
+    "f13", "f14", "f15", "f16", "f17", "f18", "f19", "f20",
+    "alt", "alt_l", "alt_r", "ctrl", "ctrl_l", "ctrl_r",
+    "shift", "shift_l", "shift_r", "win", "cmd",
+})
+
+MOUSE_BUTTONS = ("left", "right", "middle")
+
+# 批量注入的单个按键动作：(按键对象, 是否按下)
+KeyStroke = Tuple[object, bool]
+
+
+def combo_strokes(keys: Sequence[object]) -> tuple:
+    """组合键 -> 依次按下、反向释放的按键动作序列"""
+    return tuple((key, True) for key in keys) + tuple((key, False) for key in reversed(keys))
+
+
+class InputBackend(ABC):
+    """输入输出后端基类
+
+    钩子回调接收带 event_type / scan_code / name 属性的事件对象，
+    返回 True 放行原始事件，返回 False 屏蔽。
+    注入接口使用 resolve_key / resolve_button 返回的后端私有对象，
+    编译动作时解析一次，执行时不再做字符串处理。
+    """
+
+    name = ""
+
+    # ---- 钩子 ----
+
+    @abstractmethod
+    def hook(self, callback: Callable[[object], bool], suppress: bool = True):
+        """安装全局键盘钩子（替换已安装的钩子）
+
+        suppress 为 False 时只监听不拦截，回调的返回值被忽略，原始事件总是放行。
+        """
+
+    @abstractmethod
+    def unhook(self):
+        """移除钩子"""
+
+    def reinstall(self):
+        """重新向系统注册钩子（系统静默移除了钩子时），之后由调用方重新 hook"""
+
+    def keys_pressed(self) -> bool:
+        """不经过钩子查询当前是否有按键按下，无法查询时返回 False"""
+        return False
+
+    @abstractmethod
+    def resolve_scan_codes(self, key_name: str) -> tuple:
+        """按键名 -> 扫描码元组，无法识别时返回空元组"""
+
+    @abstractmethod
+    def is_pressed(self, key_name: str) -> bool:
+        """按键当前是否按下"""
+
+    # ---- 注入 ----
+
+    @abstractmethod
+    def resolve_key(self, key_name: str) -> Optional[object]:
+        """按键名 -> 注入用的按键对象，无法识别时返回 None"""
+
+    @abstractmethod
+    def resolve_button(self, button_name: str) -> Optional[object]:
+        """鼠标按钮名 -> 注入用的按钮对象，无法识别时返回 None"""
+
+    @abstractmethod
+    def press(self, key):
+        """按下按键"""
+
+    @abstractmethod
+    def release(self, key):
+        """释放按键"""
+
+    def prepare_batch(self, strokes: Sequence[KeyStroke]) -> object:
+        """把按键动作序列预先转换为 send_batch 可直接发送的批次（编译动作时调用一次）"""
+        return tuple(strokes)
+
+    def send_batch(self, batch: object):
+        """一次性发送 prepare_batch 生成的批次
+
+        默认逐个调用 press / release；能原子注入的后端应重写为单次系统调用，
+        避免其他输入插入到组合键中间。
+        """
+        for key, down in batch:
+            if down:
+                self.press(key)
+            else:
+                self.release(key)
+
+    @abstractmethod
+    def scroll(self, clicks: int):
+        """滚动鼠标滚轮，正数向上，负数向下"""
+
+    @abstractmethod
+    def click(self, button):
+        """点击鼠标按钮"""
+
+    @abstractmethod
+    def send(self, key_name: str):
+        """按名称发送一次按键（按下并释放）"""
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+内存后端
+不接触真实键盘和鼠标：记录所有注入的事件，并可向钩子注入合成输入，
+用于无界面环境下的基准测试和压力测试
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .base import InputBackend, KEY_DOWN, KEY_UP, KEY_NAMES, MOUSE_BUTTONS
+
+
+class MemoryEvent:
+    """合成按键事件，属性与 keyboard.KeyboardEvent 一致"""
+
+    __slots__ = ('event_type', 'scan_code', 'name', 'time')
+
+    def __init__(self, event_type: str, scan_code: int, name: str):
+        self.event_type = event_type
+        self.scan_code = scan_code
+        self.name = name
+        self.time = time.time()
+
+
+class MemoryBackend(InputBackend):
+    """内存后端
+
+    injected 记录注入的事件 (时间戳ns, 操作, 参数)，
+    passed 记录钩子放行的合成输入（即“操作系统”实际收到的事件）。
+    """
+
+    name = "memory"
+
+    FIRST_SCAN_CODE = 0x1000  # 自动分配的扫描码起点
+
+    def __init__(self):
+        self._callback: Optional[Callable[[object], bool]] = None
+        self._suppress = True  # 钩子是否可以屏蔽事件
+        self._scan_codes: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._pressed: set = set()
+        self._lock = threading.Lock()
+        self.injected: List[tuple] = []
+        self.passed: List[tuple] = []
+
+    # ---- 钩子 ----
+
+    def hook(self, callback: Callable[[object], bool], suppress: bool = True):
+        self._callback = callback
+        self._suppress = suppress
+
+    def unhook(self):
+        self._callback = None
+
+    @property
+    def hooked(self) -> bool:
+        """是否已安装钩子"""
+        return self._callback is not None
+
+    def keys_pressed(self) -> bool:
+        return bool(self._pressed)
+
+    def bind_scan_codes(self, codes: Dict[str, int]):
+        """指定按键名与扫描码的对应关系（如按录制轨迹中的扫描码）"""
+        for name, code in codes.items():
+            self._scan_codes[name.lower()] = code
+            self._names.setdefault(code, name.lower())
+
+    def resolve_scan_codes(self, key_name: str) -> tuple:
+        name = key_name.lower()
+        code = self._scan_codes.get(name)
+        if code is None:
+            code = self.FIRST_SCAN_CODE + len(self._scan_codes)
+            while code in self._names:
+                code += 1
+            self._scan_codes[name] = code
+            self._names[code] = name
+        return (code,)
+
+    def is_pressed(self, key_name: str) -> bool:
+        return self.resolve_scan_codes(key_name)[0] in self._pressed
+
+    def feed(self, event) -> bool:
+        """把一个事件交给钩子，返回是否放行"""
+        if event.event_type == KEY_DOWN:
+            self._pressed.add(event.scan_code)
+        else:
+            self._pressed.discard(event.scan_code)
+
+        passed = True
+        if self._callback:
+            passed = self._callback(event) or not self._suppress
+        if passed:
+            self.passed.append((time.perf_counter_ns(), event.event_type, event.name))
+        return passed
+
+    def key_down(self, key_name: str) -> bool:
+        """合成一次按下事件，返回是否放行"""
+        code = self.resolve_scan_codes(key_name)[0]
+        return self.feed(MemoryEvent(KEY_DOWN, code, key_name.lower()))
+
+    def key_up(self, key_name: str) -> bool:
+        """合成一次抬起事件，返回是否放行"""
+        code = self.resolve_scan_codes(key_name)[0]
+        return self.feed(MemoryEvent(KEY_UP, code, key_name.lower()))
+
+    def tap(self, key_name: str) -> bool:
+        """合成一次按下+抬起，返回按下事件是否放行"""
+        passed = self.key_down(key_name)
+        self.key_up(key_name)
+        return passed
+
+    # ---- 注入 ----
+
+    def resolve_key(self, key_name: str) -> Optional[object]:
+        if key_name in KEY_NAMES or len(key_name) == 1:
+            return key_name
+        return None
+
+    def resolve_button(self, button_name: str) -> Optional[object]:
+        return button_name if button_name in MOUSE_BUTTONS else None
+
+    def _record(self, op: str, arg):
+        with self._lock:
+            self.injected.append((time.perf_counter_ns(), op, arg))
+
+    def press(self, key):
+        self._record('press', key)
+
+    def release(self, key):
+        self._record('release', key)
+
+    def send_batch(self, batch: tuple):
+        # 整批记录为一条，便于检查批次内没有插入其他事件
+        self._record('batch', batch)
+
+    def scroll(self, clicks: int):
+        self._record('scroll', clicks)
+
+    def click(self, button):
+        self._record('click', button)
+
+    def send(self, key_name: str):
+        self._record('send', key_name)
+
+    def count(self, op: str) -> int:
+        """统计某种注入操作的次数"""
+        with self._lock:
+            return sum(1 for _, o, _ in self.injected if o == op)
+
+    def clear(self):
+        """清空记录"""
+        with self._lock:
+            self.injected.clear()
+            self.passed.clear()
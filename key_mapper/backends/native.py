@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+原生后端
+钩子使用 keyboard 库，注入使用 pynput（Windows 滚轮使用 mouse_event）
+"""
+
+import sys
+import threading
+from typing import Callable, List, Optional, Sequence
+
+from .base import InputBackend, KeyStroke
+
+# Windows 特定的鼠标滚轮与批量按键注入支持
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    # Windows 常量
+    MOUSEEVENTF_WHEEL = 0x0800
+    WHEEL_DELTA = 120  # Windows 标准滚轮单位
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_EXTENDEDKEY = 0x0001
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+
+    WM_QUIT = 0x0012
+
+    # VkKeyScanW 高字节的换挡状态位 -> 需要按住的修饰键
+    SHIFT_STATE_VKS = ((0x01, 0x10), (0x02, 0x11), (0x04, 0x12))  # Shift / Ctrl / Alt
+    # 左右修饰键 -> 通用修饰键
+    MODIFIER_VKS = {0x10: 0x10, 0xA0: 0x10, 0xA1: 0x10,
+                    0x11: 0x11, 0xA2: 0x11, 0xA3: 0x11,
+                    0x12: 0x12, 0xA4: 0x12, 0xA5: 0x12}
+
+    # 检测按键状态时跳过的鼠标按钮虚拟键
+    MOUSE_VKS = frozenset({0x01, 0x02, 0x04, 0x05, 0x06})
+
+    # 需要扩展键标志的虚拟键：翻页、方向、Insert/Delete、Win、右侧 Ctrl/Alt
+    EXTENDED_VKS = frozenset({0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28,
+                              0x2D, 0x2E, 0x5B, 0x5C, 0xA3, 0xA5})
+
+    ULONG_PTR = ctypes.c_size_t
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD), ("wParamH", wintypes.WORD)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+
+class SystemHooks:
+    """keyboard 库安装的系统键盘钩子
+
+    keyboard 库不保存钩子句柄，这里包装它的 SetWindowsHookEx，记录每个钩子的句柄和所在线程；
+    重新安装时先移除旧钩子并结束其消息循环，任何时候只有一个系统钩子生效，事件不会重复分发。
+    """
+
+    def __init__(self, os_keyboard, unhook: Callable[[int], object], stop_thread: Callable[[int], object]):
+        self._os_keyboard = os_keyboard
+        self._unhook = unhook  # unhook(钩子句柄)
+        self._stop_thread = stop_thread  # stop_thread(线程 ID)：结束该线程的消息循环
+        self._lock = threading.Lock()
+        self.hooks: List[tuple] = []  # 生效中的钩子 [(钩子句柄, 线程 ID)]
+
+        install = os_keyboard.SetWindowsHookEx
+
+        def tracked_install(*args):
+            handle = install(*args)
+            if handle:
+                with self._lock:
+                    self.hooks.append((handle, threading.get_native_id()))
+            return handle
+
+        os_keyboard.SetWindowsHookEx = tracked_install
+
+    def remove_all(self) -> int:
+        """移除所有已记录的钩子并结束其线程，返回移除的数量"""
+        with self._lock:
+            hooks, self.hooks = self.hooks, []
+        for handle, thread_id in hooks:
+            self._unhook(handle)
+            self._stop_thread(thread_id)
+        return len(hooks)
+
+    def reinstall(self, callback: Callable):
+        """移除旧钩子后在新线程中重新注册，事件交给 callback"""
+        self.remove_all()
+        threading.Thread(target=self._os_keyboard.listen, args=(callback,),
+                         name="KeyboardHook", daemon=True).start()
+
+
+_system_hooks: Optional[SystemHooks] = None
+_system_hooks_lock = threading.Lock()
+
+
+def get_system_hooks(os_keyboard) -> SystemHooks:
+    """获取全局系统钩子记录（Windows，需在 keyboard 库安装第一个钩子之前调用）"""
+    global _system_hooks
+    if _system_hooks is None:
+        with _system_hooks_lock:
+            if _system_hooks is None:
+                user32 = ctypes.windll.user32
+                _system_hooks = SystemHooks(
+                    os_keyboard,
+                    lambda handle: user32.UnhookWindowsHookEx(wintypes.HHOOK(handle)),
+                    lambda thread_id: user32.PostThreadMessageW(thread_id, WM_QUIT, 0, 0),
+                )
+    return _system_hooks
+
+
+class NativeBackend(InputBackend):
+    """keyboard + pynput 后端（依赖在创建时才导入）"""
+
+    name = "native"
+
+    def __init__(self):
+        import keyboard
+        from pynput.keyboard import Controller as KeyboardController, Key, KeyCode
+        from pynput.mouse import Controller as MouseController, Button
+
+        self._kb = keyboard
+        self._key_code = KeyCode
+        self.keyboard_ctrl = KeyboardController()
+        self.mouse_ctrl = MouseController()
+        self._hook = None
+        self._callback: Optional[Callable[[object], bool]] = None  # 当前注册的钩子回调
+        self._suppress = True  # 当前钩子是否可以屏蔽事件
+        # 记录系统钩子句柄（keyboard 库在第一次 hook 时才安装钩子）
+        self._system_hooks = get_system_hooks(keyboard._os_keyboard) if sys.platform == 'win32' else None
+
+        # 按键名 -> pynput 按键对象
+        self._special_keys = {
+            "space": Key.space, "enter": Key.enter, "tab": Key.tab,
+            "backspace": Key.backspace, "delete": Key.delete,
+            "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right,
+            "home": Key.home, "end": Key.end, "page_up": Key.page_up, "page_down": Key.page_down,
+            "esc": Key.esc, "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
+            "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
+            "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
+            "f13": Key.f13, "f14": Key.f14, "f15": Key.f15, "f16": Key.f16,
+            "f17": Key.f17, "f18": Key.f18, "f19": Key.f19, "f20": Key.f20,
+            "alt": Key.alt, "alt_l": Key.alt_l, "alt_r": Key.alt_r,
+            "ctrl": Key.ctrl, "ctrl_l": Key.ctrl_l, "ctrl_r": Key.ctrl_r,
+            "shift": Key.shift, "shift_l": Key.shift_l, "shift_r": Key.shift_r,
+            "win": Key.cmd, "cmd": Key.cmd,
+        }
+        self._buttons = {
+            'left': Button.left,
+            'right': Button.right,
+            'middle': Button.middle
+        }
+
+    # ---- 钩子 ----
+
+    def hook(self, callback: Callable[[object], bool], suppress: bool = True):
+        self.unhook()
+        self._callback, self._suppress = callback, suppress
+        self._hook = self._kb.hook(callback, suppress=suppress)
+
+    def unhook(self):
+        if self._hook:
+            try:
+                self._kb.unhook(self._hook)
+            except (KeyError, ValueError):
+                pass
+            self._hook = None
+        self._callback = None
+
+    def reinstall(self):
+        # 超时被 Windows 移除的低级钩子不会恢复，keyboard 库也不会察觉，
+        # 移除旧钩子（误判时它仍然有效）后在新线程中重新注册，事件直接交给后端自己的分发函数
+        if self._system_hooks is not None:
+            self._system_hooks.reinstall(self._dispatch)
+
+    def _dispatch(self, event) -> bool:
+        """重新安装的系统钩子的回调：把事件交给当前注册的回调，返回是否放行
+
+        之后通过 hook 更换的回调同样由这里分发；keyboard 库自己的按键状态（is_pressed）不再更新。
+        """
+        callback = self._callback
+        if callback is None:
+            return True
+        passed = callback(event)
+        return passed or not self._suppress
+
+    def keys_pressed(self) -> bool:
+        if sys.platform != 'win32':
+            return False
+        state = ctypes.windll.user32.GetAsyncKeyState
+        return any(state(vk) & 0x8000 for vk in range(0x08, 0xFF) if vk not in MOUSE_VKS)
+
+    def resolve_scan_codes(self, key_name: str) -> tuple:
+        try:
+            return self._kb.key_to_scan_codes(key_name, error_if_missing=False)
+        except ValueError:
+            return ()
+
+    def is_pressed(self, key_name: str) -> bool:
+        return self._kb.is_pressed(key_name)
+
+    # ---- 注入 ----
+
+    def resolve_key(self, key_name: str) -> Optional[object]:
+        key = self._special_keys.get(key_name)
+        if key is None and len(key_name) == 1:
+            key = self._key_code.from_char(key_name)
+        return key
+
+    def resolve_button(self, button_name: str) -> Optional[object]:
+        return self._buttons.get(button_name)
+
+    def press(self, key):
+        self.keyboard_ctrl.press(key)
+
+    def release(self, key):
+        self.keyboard_ctrl.release(key)
+
+    def prepare_batch(self, strokes: Sequence[KeyStroke]) -> object:
+        # Windows 上预先构建 INPUT 数组，发送时只需一次 SendInput
+        if sys.platform != 'win32':
+            return tuple(strokes)
+        events = []  # (虚拟键, 扫描码, 标志)
+        held = set()  # 批次中已按下的修饰键（通用虚拟键）
+        for key, down in strokes:
+            vk, scan, flags, shift_vks = self._key_input(key)
+            modifier = MODIFIER_VKS.get(vk)
+            if modifier is not None:
+                (held.add if down else held.discard)(modifier)
+            # 字符需要的换挡键（如 "!" 需要 Shift）只包住这一次按下或抬起，已按住的不重复
+            wrap = [mod for mod in shift_vks if mod not in held]
+            events.extend((mod, 0, 0) for mod in wrap)
+            events.append((vk, scan, flags if down else flags | KEYEVENTF_KEYUP))
+            events.extend((mod, 0, KEYEVENTF_KEYUP) for mod in reversed(wrap))
+
+        inputs = (INPUT * len(events))()
+        for item, (vk, scan, flags) in zip(inputs, events):
+            item.type = INPUT_KEYBOARD
+            item.union.ki = KEYBDINPUT(vk, scan, flags, 0, 0)
+        return inputs
+
+    def send_batch(self, batch: object):
+        if sys.platform != 'win32':
+            super().send_batch(batch)
+            return
+        sent = ctypes.windll.user32.SendInput(len(batch), batch, ctypes.sizeof(INPUT))
+        if sent != len(batch):
+            print(f"[后端] SendInput 只发送了 {sent}/{len(batch)} 个事件")
+
+    def _key_input(self, key) -> tuple:
+        """pynput 按键对象 -> (虚拟键, 扫描码, 标志, 需要同时按住的修饰键)"""
+        code = getattr(key, 'value', key)  # Key 枚举 -> KeyCode
+        vk = getattr(code, 'vk', None)
+        shift_vks = ()
+        if vk is None and code.char:
+            result = ctypes.windll.user32.VkKeyScanW(ord(code.char)) & 0xFFFF  # 返回值为 SHORT
+            if result == 0xFFFF:
+                # 当前键盘布局没有的字符按 Unicode 字符发送
+                return 0, ord(code.char), KEYEVENTF_UNICODE, ()
+            vk = result & 0xFF
+            # 高字节为输入该字符需要的换挡状态（如 "A"、"!" 需要 Shift，AltGr 字符需要 Ctrl+Alt）
+            shift_state = (result >> 8) & 0xFF
+            shift_vks = tuple(mod for bit, mod in SHIFT_STATE_VKS if shift_state & bit)
+        return vk, 0, KEYEVENTF_EXTENDEDKEY if vk in EXTENDED_VKS else 0, shift_vks
+
+    def scroll(self, clicks: int):
+        # 在 Windows 上使用原生 API 以获得更好的效果
+        if sys.platform == 'win32':
+            # WHEEL_DELTA (120) 是标准滚轮单位
+            ctypes.windll.user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, clicks * WHEEL_DELTA, 0)
+        else:
+            # 其他平台使用 pynput
+            self.mouse_ctrl.scroll(0, clicks)
+
+    def click(self, button):
+        self.mouse_ctrl.click(button)
+
+    def send(self, key_name: str):
+        self._kb.send(key_name)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+异步动作队列
+钩子回调只负责做屏蔽决定并入队，动作由专用执行线程取出执行
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+
+class ActionQueue:
+    """有界动作队列 - 带优先级通道和溢出策略
+
+    队列项为 (func, args, key) 元组，key 为合并用的键（默认即 (func, args)）。
+    优先通道（模式切换）总是先于普通通道执行。普通通道满时按溢出策略处理：
+        - drop_oldest: 丢弃最早的待执行动作
+        - merge: 与已在队列中 key 相同的动作合并（丢弃新动作），无可合并项时丢弃最早的
+        - block: 阻塞入队线程直到有空位；执行线程自己入队或调用方不允许阻塞时
+          （持有锁的序列匹配、共享调度线程）不等待，暂时超出容量入队（计入 deferred）
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "merge", "block")
+
+    def __init__(self, maxsize: int = 64, overflow: str = "drop_oldest"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            print(f"[动作队列] 未知的溢出策略: {overflow}，使用 drop_oldest")
+            overflow = "drop_oldest"
+        self.maxsize = max(1, int(maxsize))
+        self.overflow = overflow
+
+        self._priority = deque()  # 高优先级通道（模式切换）
+        self._normal = deque()  # 普通动作通道
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._busy = False  # 执行线程是否正在执行动作
+
+        # 统计
+        self.dropped = 0  # 因溢出丢弃的动作数
+        self.merged = 0  # 因溢出合并的动作数
+        self.deferred = 0  # block 策略下未等待、超出容量入队的动作数
+
+    def start(self):
+        """启动执行线程"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ActionQueue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """停止执行线程，未执行的动作将被丢弃"""
+        with self._cond:
+            self._running = False
+            self._priority.clear()
+            self._normal.clear()
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def put(self, func: Callable, *args, priority: bool = False, key=None, block: bool = True) -> bool:
+        """
+        入队一个动作
+
+        Args:
+            func: 要执行的函数
+            *args: 函数参数
+            priority: 是否进入优先通道（用于模式切换）
+            key: merge 策略比较的键，None 时为 (func, args)；参数含时间戳等每次不同的值时应指定
+            block: block 策略下队列满时是否允许阻塞等待
+
+        Returns:
+            bool: 是否入队（被合并或丢弃时返回 False）
+        """
+        if key is None:
+            key = (func, args)
+        with self._cond:
+            lane = self._priority if priority else self._normal
+            if len(lane) >= self.maxsize:
+                if self.overflow == "block" and self._running:
+                    if block and threading.current_thread() is not self._thread:
+                        while len(lane) >= self.maxsize and self._running:
+                            self._cond.wait()
+                    else:
+                        self.deferred += 1
+                elif self.overflow == "merge" and any(queued == key for _, _, queued in lane):
+                    self.merged += 1
+                    return False
+                else:
+                    lane.popleft()
+                    self.dropped += 1
+            lane.append((func, args, key))
+            self._cond.notify_all()
+        return True
+
+    def pending(self) -> int:
+        """待执行动作数量"""
+        with self._cond:
+            return len(self._priority) + len(self._normal)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待队列清空且当前动作执行完毕，返回是否在超时前完成"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._priority or self._normal or self._busy), timeout)
+
+    def _next(self):
+        """取出下一个动作，队列为空时等待，停止时返回 None"""
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+            while self._running and not self._priority and not self._normal:
+                self._cond.wait()
+            if not self._running:
+                return None
+            item = self._priority.popleft() if self._priority else self._normal.popleft()
+            self._busy = True
+            # 唤醒 block 策略下等待入队的线程
+            self._cond.notify_all()
+            return item
+
+    def _run(self):
+        """执行线程主循环"""
+        while True:
+            item = self._next()
+            if item is None:
+                break
+            func, args, _ = item
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[动作队列] 执行动作失败: {e}")
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+预编译动作
+在加载配置时把映射目标解析成可直接调用的动作对象，热路径上不再做字符串处理
+"""
+
+from typing import Callable, Tuple
+from ..backends import InputBackend, get_backend
+
+
+class ActionCompileError(ValueError):
+    """映射目标无法解析"""
+    pass
+
+
+def parse_key_combo(key_str: str, backend: InputBackend = None) -> list:
+    """
+    解析按键字符串，支持组合键
+
+    Args:
+        key_str: 按键字符串，如 "ctrl+w" 或 "alt+tab"
+        backend: 解析按键对象的后端，默认使用进程共享后端
+
+    Returns:
+        list: 解析后的按键对象列表，无法解析时返回空列表
+    """
+    backend = backend or get_backend()
+    result = []
+    for part in key_str.lower().split("+"):
+        key = backend.resolve_key(part.strip())
+        if key is None:
+            return []  # 无法解析
+        result.append(key)
+    return result
+
+
+class CompiledAction:
+    """预编译动作 - 参数已解析好的可调用对象"""
+
+    __slots__ = ('action_type', 'target', 'func', 'args')
+
+    def __init__(self, action_type: str, target: str, func: Callable[..., bool], args: Tuple = ()):
+        self.action_type = action_type  # 动作类型
+        self.target = target  # 原始目标字符串（仅用于显示）
+        self.func = func  # 执行函数
+        self.args = args  # 预解析的参数
+
+    def __call__(self) -> bool:
+        """执行动作，返回是否成功"""
+        try:
+            return self.func(*self.args)
+        except Exception as e:
+            print(f"[执行器] 执行动作失败 ({self.action_type}): {e}")
+            return False
+
+    def __repr__(self):
+        return f"CompiledAction({self.action_type}, '{self.target}')"
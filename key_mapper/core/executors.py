@@ -4,64 +4,449 @@
 实现不同类型的动作执行：键盘、鼠标、系统命令等
 """
 
-import subprocess
 import sys
-from pynput.mouse import Controller as MouseController, Button
-from pynput.keyboard import Controller as KeyboardController, Key, KeyCode
+import threading
+from typing import Callable, List, Optional, Union
+from .actions import ActionCompileError, CompiledAction, parse_key_combo
+from .plugins import ActionContext, get_plugin_registry
+from ..backends import InputBackend, combo_strokes, get_backend
+from ..utils.command_runner import PreparedCommand, get_command_runner
+from ..utils.scheduler import get_scheduler
+from ..utils.window_filter import WindowFilter
+from ..utils.window_index import WindowQuery
+
+
+class ScrollCoalescer:
+    """滚轮事件合并器 - 高速旋转编码器的滚动在时间窗口内合并成一次注入
+
+    窗口内的第一个滚动立即注入，之后到达的滚动量累加，窗口结束时一次性注入。
+    持续旋转时每个窗口最多注入一次；窗口为 0 时不合并。
+    leading 为 False 时第一个事件也等到窗口结束，窗口内的所有事件只注入一次
+    （用于窗口切换：连续的切换合并成一次 N 步跳转）。
+    """
+
+    def __init__(self, inject: Callable[[int], None], window_ms: float = 8, leading: bool = True):
+        self.inject = inject  # 实际注入函数，参数为滚动格数（正数向上）
+        self.window = max(0.0, window_ms) / 1000.0
+        self.leading = leading  # 窗口内的第一个事件是否立即注入
+        self._lock = threading.Lock()
+        self._pending = 0  # 窗口内累计的滚动格数
+        self._window_open = False
+
+        # 统计
+        self.events_in = 0  # 收到的滚动事件数
+        self.events_merged = 0  # 被合并（未单独注入）的滚动事件数
+        self.injections = 0  # 实际注入次数
+
+    def add(self, clicks: int) -> bool:
+        """提交一次滚动"""
+        if self.window <= 0:
+            self.events_in += 1
+            self.injections += 1
+            self.inject(clicks)
+            return True
+
+        with self._lock:
+            self.events_in += 1
+            if self._window_open:
+                self._pending += clicks
+                self.events_merged += 1
+                return True
+            self._window_open = True
+            if self.leading:
+                self.injections += 1
+            else:
+                self._pending = clicks
+
+        if self.leading:
+            self.inject(clicks)
+        get_scheduler().call_later(self.window, self._flush)
+        return True
+
+    def _flush(self):
+        """窗口结束：注入累计的滚动量，若有注入则继续开启下一个窗口"""
+        with self._lock:
+            clicks, self._pending = self._pending, 0
+            if clicks == 0 or not self.leading:
+                self._window_open = False
+            if clicks == 0:
+                return
+            self.injections += 1
+
+        self.inject(clicks)
+        if self.leading:
+            get_scheduler().call_later(self.window, self._flush)
+
+    def stats(self) -> dict:
+        """获取合并统计"""
+        return {
+            "events_in": self.events_in,
+            "events_merged": self.events_merged,
+            "injections": self.injections,
+        }
+
+
+class MacroRun:
+    """一次正在执行的宏
+
+    连续的非延时步骤直接执行，遇到延时步骤时由共享调度器计时，到期后只把后续步骤
+    通过 post 交回执行线程，因此任意多个宏同时运行也不占用额外线程，
+    步骤（窗口激活、python 插件等）也不会在调度线程中执行、拖慢其他定时任务。
+    """
+
+    def __init__(self, steps: List[Union[float, CompiledAction]], on_done: Callable[["MacroRun"], None],
+                 post: Optional[Callable] = None):
+        self.steps = steps  # 步骤：CompiledAction 或延时秒数
+        self.on_done = on_done
+        # 把后续步骤交给执行线程的函数 post(func, *args)，默认在调度线程中直接执行
+        self.post: Callable = post or (lambda func, *args: func(*args))
+        self.index = 0
+        self.cancelled = False
+        self._timer = None
+
+    def start(self):
+        """从第一步开始执行"""
+        self._continue()
+
+    def cancel(self):
+        """取消尚未执行的步骤"""
+        self.cancelled = True
+        if self._timer:
+            self._timer.cancel()
+
+    def _continue(self):
+        self._timer = None
+        while self.index < len(self.steps) and not self.cancelled:
+            step = self.steps[self.index]
+            self.index += 1
+            if isinstance(step, float):
+                self._timer = get_scheduler().call_precise(step, self.post, self._continue)
+                return
+            step()
+        self.on_done(self)
+
+
+class ActionResources:
+    """动作资源 - 所有模式的执行器共享
+
+    后端、滚轮和窗口切换合并器、命令执行器和插件注册表只有一份；
+    窗口切换器在第一次切换窗口时才创建，虚拟桌面管理器（COM）在每个使用它的线程中各自创建。
+    窗口切换合并窗口在调度线程中结束，合并后的步数通过 dispatch 交给执行线程，
+    创建切换器、更换过滤规则、激活窗口和确认前台都在执行线程中进行，不占用共享的调度线程。
+    """
+
+    def __init__(self, backend: InputBackend = None, scroll_window_ms: float = 8, cycle_window_ms: float = 40):
+        self.backend = backend or get_backend()  # 输入输出后端
+        self.plugins = get_plugin_registry()  # python 动作插件
+        self.commands = get_command_runner()  # command 动作执行器
+        self.scroll_coalescer = ScrollCoalescer(self._inject_scroll, scroll_window_ms)
+        # 连续的窗口切换合并成一次跳转，只激活一次窗口
+        self.cycle_coalescer = ScrollCoalescer(self._post_jump, cycle_window_ms, leading=False)
+        self.dispatch: Callable = self.call_direct  # 把窗口切换和宏的后续步骤交给执行线程，由监听器替换为动作队列入队
+        self.window_filter = None  # 窗口过滤规则，None 为默认规则
+        self._window_cycler = None
+        self._window_cycler_lock = threading.Lock()
+        self._window_cycler_failed = False
+
+    @staticmethod
+    def call_direct(func: Callable, *args):
+        """默认的调用方式：在当前线程中直接调用"""
+        func(*args)
+
+    def post(self, func: Callable, *args):
+        """通过 dispatch 把窗口切换和宏的后续步骤交给执行线程"""
+        self.dispatch(func, *args)
+
+    @property
+    def window_cycler(self):
+        """窗口切换器（仅 Windows，首次访问时创建），不可用时为 None"""
+        if self._window_cycler is None and not self._window_cycler_failed:
+            with self._window_cycler_lock:
+                if self._window_cycler is None and not self._window_cycler_failed:
+                    self._window_cycler = self._create_window_cycler(self.window_filter, self.post)
+                    self._window_cycler_failed = self._window_cycler is None
+        return self._window_cycler
+
+    @staticmethod
+    def _create_window_cycler(window_filter, dispatch: Callable):
+        if sys.platform != 'win32':
+            return None
+        try:
+            from key_mapper.utils.window_cycler import WindowCycler
+            return WindowCycler(window_filter, dispatch)
+        except Exception as e:
+            print(f"[执行器] 初始化窗口切换器失败: {e}")
+            return None
+
+    def set_scroll_window(self, window_ms: float):
+        """设置滚轮合并窗口（毫秒），0 表示不合并"""
+        self.scroll_coalescer.window = max(0.0, window_ms) / 1000.0
+
+    def set_window_filter(self, rules: Optional[dict]):
+        """设置窗口过滤规则（格式见 WindowFilter），已创建的窗口切换器在执行线程中更换"""
+        with self._window_cycler_lock:
+            self.window_filter = WindowFilter(rules)
+            window_cycler = self._window_cycler
+        if window_cycler is not None:
+            self.post(window_cycler.set_filter, self.window_filter)
+
+    def set_cycle_window(self, window_ms: float):
+        """设置窗口切换合并窗口（毫秒），0 表示每次切换立即执行"""
+        self.cycle_coalescer.window = max(0.0, window_ms) / 1000.0
+
+    def _inject_scroll(self, clicks: int) -> bool:
+        """滚动鼠标滚轮，正数向上，负数向下"""
+        self.backend.scroll(clicks)
+        return True
+
+    def _post_jump(self, steps: int) -> bool:
+        """合并窗口结束（调度线程）：只把合并后的步数交给执行线程"""
+        self.post(self._jump_windows, steps)
+        return True
+
+    def _jump_windows(self, steps: int) -> bool:
+        """沿最近使用顺序切换 steps 个窗口（执行线程），正数向后"""
+        window_cycler = self.window_cycler
+        if not window_cycler:
+            print("[执行器] 窗口切换器不可用 (仅支持 Windows)")
+            return False
+        return window_cycler.jump(steps) is not None
 
-# Windows 特定的鼠标滚轮支持
-if sys.platform == 'win32':
-    import ctypes
-    from ctypes import wintypes
 
-    # Windows 常量
-    MOUSEEVENTF_WHEEL = 0x0800
-    WHEEL_DELTA = 120  # Windows 标准滚轮单位
+_action_resources: Optional[ActionResources] = None
+_action_resources_lock = threading.Lock()
 
-    # 导入窗口切换器
-    from key_mapper.utils.window_cycler import WindowCycler
+
+def get_action_resources() -> ActionResources:
+    """获取进程内共享的动作资源（绑定当前后端，切换后端后重新创建）"""
+    global _action_resources
+    backend = get_backend()
+    resources = _action_resources
+    if resources is None or resources.backend is not backend:
+        with _action_resources_lock:
+            if _action_resources is None or _action_resources.backend is not backend:
+                _action_resources = ActionResources(backend)
+            resources = _action_resources
+    return resources
 
 
 class ActionExecutor:
-    """动作执行器基类"""
-
-    def __init__(self):
-        self.keyboard_ctrl = KeyboardController()
-        self.mouse_ctrl = MouseController()
-        # Windows 窗口切换器
-        if sys.platform == 'win32':
-            self.window_cycler = WindowCycler()
-        else:
-            self.window_cycler = None
+    """动作执行器基类
+
+    每个模式一个执行器，只保存模式相关的状态（python 动作上下文、运行中的宏），
+    其余资源来自共享的 ActionResources。
+    """
+
+    MACRO_SEPARATOR = ';'  # 宏步骤分隔符
+
+    def __init__(self, mode=None, resources: ActionResources = None):
+        self.resources = resources or get_action_resources()  # 共享资源
+        self.backend = self.resources.backend  # 输入输出后端
+        self.plugins = self.resources.plugins  # python 动作插件
+        self.scroll_coalescer = self.resources.scroll_coalescer
+        self.mode = mode  # 所属模式，作为 python 动作的上下文
+
+        self._macros: set = set()  # 正在运行的宏
+        self._macro_lock = threading.Lock()
+
+        # 动作类型 -> 编译函数
+        self._compilers = {
+            "keyboard": self._compile_keyboard,
+            "mouse_scroll": self._compile_mouse_scroll,
+            "mouse_click": self._compile_mouse_click,
+            "command": self._compile_command,
+            "window_cycle": self._compile_window_cycle,
+            "window_jump": self._compile_window_jump,
+            "macro": self._compile_macro,
+            "python": self._compile_python,
+        }
+
+    def compile(self, action_type: str, target: str, mapping=None) -> CompiledAction:
+        """
+        将动作描述编译为可直接执行的动作对象
+
+        Args:
+            action_type: 动作类型 (keyboard, mouse_scroll, mouse_click, command, window_cycle, window_jump, macro, python)
+            target: 目标动作描述
+            mapping: 所属的 KeyMapping，作为 python 动作的上下文
+
+        Returns:
+            CompiledAction: 预编译动作
+
+        Raises:
+            ActionCompileError: 动作类型未知或目标无法解析
+        """
+        compiler = self._compilers.get(action_type)
+        if compiler is None:
+            raise ActionCompileError(f"未知的动作类型: {action_type}")
+        return compiler(str(target), mapping)
 
     def execute(self, action_type: str, target: str) -> bool:
         """
         执行动作
 
         Args:
-            action_type: 动作类型 (keyboard, mouse_scroll, mouse_click, command, window_cycle)
+            action_type: 动作类型 (keyboard, mouse_scroll, mouse_click, command, window_cycle, window_jump, macro, python)
             target: 目标动作描述
 
         Returns:
             bool: 执行是否成功
         """
         try:
-            if action_type == "keyboard":
-                return self.execute_keyboard(target)
-            elif action_type == "mouse_scroll":
-                return self.execute_mouse_scroll(target)
-            elif action_type == "mouse_click":
-                return self.execute_mouse_click(target)
-            elif action_type == "command":
-                return self.execute_command(target)
-            elif action_type == "window_cycle":
-                return self.execute_window_cycle(target)
+            action = self.compile(action_type, target)
+        except ActionCompileError as e:
+            print(f"[执行器] {e}")
+            return False
+        return action()
+
+    # ---- 编译 ----
+
+    def _compile_keyboard(self, target: str, mapping=None) -> CompiledAction:
+        keys = parse_key_combo(target, self.backend)
+        if not keys:
+            raise ActionCompileError(f"无法解析按键: {target}")
+        return CompiledAction("keyboard", target, self.send_batch, (self.prepare_keys(keys),))
+
+    def _compile_mouse_scroll(self, target: str, mapping=None) -> CompiledAction:
+        parts = target.lower().split(':')
+        direction = parts[0].strip()
+        try:
+            amount = int(parts[1].strip()) if len(parts) > 1 else 1
+        except ValueError:
+            raise ActionCompileError(f"无效的滚动量: {target}")
+
+        if direction == 'down':
+            clicks = -amount
+        elif direction == 'up':
+            clicks = amount
+        else:
+            raise ActionCompileError(f"未知的滚动方向: {direction}")
+        return CompiledAction("mouse_scroll", target, self.scroll_coalescer.add, (clicks,))
+
+    def _compile_mouse_click(self, target: str, mapping=None) -> CompiledAction:
+        button = self.backend.resolve_button(target.lower().strip())
+        if button is None:
+            raise ActionCompileError(f"未知的鼠标按钮: {target}")
+        return CompiledAction("mouse_click", target, self._click, (button,))
+
+    def _compile_command(self, target: str, mapping=None) -> CompiledAction:
+        if not target.strip():
+            raise ActionCompileError("命令不能为空")
+        return CompiledAction("command", target, self._run_command, (self.resources.commands.prepare(target),))
+
+    def _compile_window_cycle(self, target: str, mapping=None) -> CompiledAction:
+        direction = target.lower().strip()
+        if direction not in ("next", "prev"):
+            raise ActionCompileError(f"未知的窗口切换方向: {target}")
+        return CompiledAction("window_cycle", target, self._cycle_window, (direction == "next",))
+
+    def _compile_window_jump(self, target: str, mapping=None) -> CompiledAction:
+        try:
+            query = WindowQuery(target)
+        except ValueError as e:
+            raise ActionCompileError(str(e))
+        return CompiledAction("window_jump", target, self._jump_to_window, (query,))
+
+    def _compile_macro(self, target: str, mapping=None) -> CompiledAction:
+        """宏：以分号分隔的步骤，每步为 "动作类型:目标" 或 "delay:毫秒"
+
+        例如 "keyboard:ctrl+c; delay:50; keyboard:alt+tab; delay:100; keyboard:ctrl+v"
+        """
+        steps: List[Union[float, CompiledAction]] = []
+        for part in target.split(self.MACRO_SEPARATOR):
+            part = part.strip()
+            if not part:
+                continue
+            action_type, _, step_target = part.partition(':')
+            action_type = action_type.strip().lower()
+            if action_type == "delay":
+                try:
+                    delay = float(step_target) / 1000.0
+                except ValueError:
+                    raise ActionCompileError(f"无效的延时: {part}")
+                if delay < 0:
+                    raise ActionCompileError(f"无效的延时: {part}")
+                steps.append(delay)
+            elif action_type == "macro":
+                raise ActionCompileError("宏不能嵌套")
             else:
-                print(f"[执行器] 未知的动作类型: {action_type}")
-                return False
-        except Exception as e:
-            print(f"[执行器] 执行动作失败 ({action_type}): {e}")
+                steps.append(self.compile(action_type, step_target.strip(), mapping))
+        if not steps:
+            raise ActionCompileError("宏不能为空")
+        return CompiledAction("macro", target, self._run_macro, (steps,))
+
+    def _compile_python(self, target: str, mapping=None) -> CompiledAction:
+        """python 动作：只检查格式，函数在第一次执行时导入"""
+        target = target.strip()
+        self.plugins.validate(target)
+        context = ActionContext(self.mode, mapping, self.backend, self)
+        return CompiledAction("python", target, self._call_python, (target, context))
+
+    # ---- 执行 ----
+
+    def prepare_keys(self, keys) -> object:
+        """把组合键预先转换为注入批次：按下所有键后反向释放"""
+        return self.backend.prepare_batch(combo_strokes(tuple(keys)))
+
+    def send_batch(self, batch) -> bool:
+        """一次性注入整个按键批次，组合键中间不会插入其他输入"""
+        self.backend.send_batch(batch)
+        return True
+
+    def _send_keys(self, keys: tuple) -> bool:
+        """按下所有键后反向释放（未预编译的组合键）"""
+        return self.send_batch(self.prepare_keys(keys))
+
+    def set_scroll_window(self, window_ms: float):
+        """设置滚轮合并窗口（毫秒），0 表示不合并（共享资源，影响所有模式）"""
+        self.resources.set_scroll_window(window_ms)
+
+    def _click(self, button) -> bool:
+        """点击鼠标按钮"""
+        self.backend.click(button)
+        return True
+
+    def _run_command(self, command: PreparedCommand) -> bool:
+        """执行系统命令 - 只交给命令执行器排队，进程在后台启动"""
+        return self.resources.commands.submit(command)
+
+    def _call_python(self, target: str, context: ActionContext) -> bool:
+        """在进程内调用 python 动作，函数返回 False 表示失败"""
+        return self.plugins.resolve(target)(context) is not False
+
+    def _jump_to_window(self, query: WindowQuery) -> bool:
+        """按名称跳转到最匹配的窗口"""
+        window_cycler = self.resources.window_cycler
+        if not window_cycler:
+            print("[执行器] 窗口切换器不可用 (仅支持 Windows)")
             return False
+        return window_cycler.jump_to(query) is not None
+
+    def _run_macro(self, steps: list) -> bool:
+        """启动宏，延时之后的步骤交回执行线程执行"""
+        run = MacroRun(steps, self._macro_done, self.resources.post)
+        with self._macro_lock:
+            self._macros.add(run)
+        run.start()
+        return True
+
+    def _macro_done(self, run: MacroRun):
+        with self._macro_lock:
+            self._macros.discard(run)
+
+    def cancel_macros(self) -> int:
+        """取消所有正在运行的宏，返回取消的数量"""
+        with self._macro_lock:
+            runs, self._macros = self._macros, set()
+        for run in runs:
+            run.cancel()
+        return len(runs)
+
+    def _cycle_window(self, forward: bool) -> bool:
+        """循环切换窗口 - 合并窗口内的连续切换，窗口结束时一次跳转到目标窗口"""
+        return self.resources.cycle_coalescer.add(1 if forward else -1)
+
+    # ---- 兼容接口 ----
 
     def execute_keyboard(self, target: str) -> bool:
         """
@@ -73,20 +458,7 @@ class ActionExecutor:
         Returns:
             bool: 执行是否成功
         """
-        keys = self._parse_key_combo(target)
-        if not keys:
-            print(f"[执行器] 无法解析按键: {target}")
-            return False
-
-        # 按下所有键
-        for key in keys:
-            self.keyboard_ctrl.press(key)
-
-        # 反向释放所有键
-        for key in reversed(keys):
-            self.keyboard_ctrl.release(key)
-
-        return True
+        return self.execute("keyboard", target)
 
     def execute_mouse_scroll(self, target: str) -> bool:
         """
@@ -100,48 +472,7 @@ class ActionExecutor:
         Returns:
             bool: 执行是否成功
         """
-        print(f"[执行器] 准备执行鼠标滚轮: {target}")
-        parts = target.lower().split(':')
-        direction = parts[0].strip()
-        amount = int(parts[1].strip()) if len(parts) > 1 else 1
-
-        print(f"[执行器] 解析结果 - 方向: {direction}, 滚动量: {amount}")
-
-        # 在 Windows 上使用原生 API 以获得更好的效果
-        if sys.platform == 'win32':
-            return self._windows_scroll(direction, amount)
-        else:
-            # 其他平台使用 pynput
-            if direction == 'down':
-                self.mouse_ctrl.scroll(0, -amount)
-                return True
-            elif direction == 'up':
-                self.mouse_ctrl.scroll(0, amount)
-                return True
-            else:
-                print(f"[执行器] 未知的滚动方向: {direction}")
-                return False
-
-    def _windows_scroll(self, direction: str, amount: int) -> bool:
-        """Windows 特定的滚轮实现"""
-        try:
-            # Windows 使用 mouse_event 实现滚轮
-            # WHEEL_DELTA (120) 是标准滚轮单位
-            if direction == 'down':
-                delta = -WHEEL_DELTA * amount
-            elif direction == 'up':
-                delta = WHEEL_DELTA * amount
-            else:
-                print(f"[执行器] 未知的滚动方向: {direction}")
-                return False
-
-            print(f"[执行器] Windows API 滚轮: delta={delta}")
-            ctypes.windll.user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, delta, 0)
-            print(f"[执行器] 滚轮操作已执行")
-            return True
-        except Exception as e:
-            print(f"[执行器] Windows 滚轮失败: {e}")
-            return False
+        return self.execute("mouse_scroll", target)
 
     def execute_mouse_click(self, target: str) -> bool:
         """
@@ -153,21 +484,7 @@ class ActionExecutor:
         Returns:
             bool: 执行是否成功
         """
-        button_map = {
-            'left': Button.left,
-            'right': Button.right,
-            'middle': Button.middle
-        }
-
-        target = target.lower().strip()
-        button = button_map.get(target)
-
-        if button:
-            self.mouse_ctrl.click(button)
-            return True
-        else:
-            print(f"[执行器] 未知的鼠标按钮: {target}")
-            return False
+        return self.execute("mouse_click", target)
 
     def execute_command(self, target: str) -> bool:
         """
@@ -179,52 +496,7 @@ class ActionExecutor:
         Returns:
             bool: 执行是否成功
         """
-        try:
-            # 使用 Popen 异步执行，避免阻塞
-            subprocess.Popen(target, shell=True)
-            print(f"[执行器] 执行命令: {target}")
-            return True
-        except Exception as e:
-            print(f"[执行器] 命令执行失败: {e}")
-            return False
-
-    def _parse_key_combo(self, key_str: str) -> list:
-        """
-        解析按键字符串，支持组合键
-
-        Args:
-            key_str: 按键字符串，如 "ctrl+w" 或 "alt+tab"
-
-        Returns:
-            list: 解析后的按键对象列表
-        """
-        special_keys = {
-            "space": Key.space, "enter": Key.enter, "tab": Key.tab,
-            "backspace": Key.backspace, "delete": Key.delete,
-            "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right,
-            "home": Key.home, "end": Key.end, "page_up": Key.page_up, "page_down": Key.page_down,
-            "esc": Key.esc, "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
-            "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
-            "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
-            "f13": Key.f13, "f14": Key.f14, "f15": Key.f15, "f16": Key.f16,
-            "f17": Key.f17, "f18": Key.f18, "f19": Key.f19, "f20": Key.f20,
-            "alt": Key.alt, "alt_l": Key.alt_l, "alt_r": Key.alt_r,
-            "ctrl": Key.ctrl, "ctrl_l": Key.ctrl_l, "ctrl_r": Key.ctrl_r,
-            "shift": Key.shift, "shift_l": Key.shift_l, "shift_r": Key.shift_r,
-            "win": Key.cmd, "cmd": Key.cmd,
-        }
-
-        parts = key_str.lower().split("+")
-        result = []
-        for part in parts:
-            part = part.strip()
-            if part in special_keys:
-                result.append(special_keys[part])
-            elif len(part) == 1:
-                result.append(KeyCode.from_char(part))
-            else:
-                return []  # 无法解析
-        return result
+        return self.execute("command", target)
 
     def execute_window_cycle(self, target: str) -> bool:
         """
@@ -236,19 +508,8 @@ class ActionExecutor:
         Returns:
             bool: 执行是否成功
         """
-        if not self.window_cycler:
-            print("[执行器] 窗口切换器不可用 (仅支持 Windows)")
-            return False
-
-        target = target.lower().strip()
-
-        if target == "next":
-            result = self.window_cycler.switch_next()
-            return result is not None
-        elif target == "prev":
-            result = self.window_cycler.switch_prev()
-            return result is not None
-        else:
-            print(f"[执行器] 未知的窗口切换方向: {target}")
-            return False
+        return self.execute("window_cycle", target)
 
+    def _parse_key_combo(self, key_str: str) -> list:
+        """解析按键字符串，支持组合键"""
+        return parse_key_combo(key_str, self.backend)
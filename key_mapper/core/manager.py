@@ -4,8 +4,9 @@
 统一管理所有按键映射模式
 """
 
-from typing import List
+from typing import Callable, List, Optional
 from .models import BaseMode
+from .mode_state import ModeState
 from .modes import BrowseMode, MediaMode, VideoMode, WindowMode
 from ..config.storage import ConfigManager
 
@@ -25,35 +26,69 @@ class ModeManager:
         if custom_modes:
             self.modes.extend(custom_modes)
             
-        self.current_index = 0
+        self.mode_state = ModeState(len(self.modes))  # 当前模式的权威状态
+        self.mode_state.add_observer(self._on_mode_changed)
         self.config = ConfigManager()
+        self.on_config_changed: Optional[Callable[[], None]] = None  # 配置保存后的回调（用于热重载）
         self._load_config()
 
     def _load_config(self):
-        """加载配置"""
+        """加载配置并编译所有映射，解析错误在此处报告而不是按键时"""
         data = self.config.load()
         for mode in self.modes:
             if mode.name in data:
                 mode.from_dict(data[mode.name])
             else:
                 mode.load_defaults()
+            for error in mode.compile_errors:
+                print(f"[模式管理] {mode.name} 映射编译失败 - {error}")
 
-    def save_config(self):
-        """保存配置"""
+    def save_config(self, notify: bool = True):
+        """保存配置
+
+        Args:
+            notify: 是否通知监听器立即应用新配置
+        """
         data = {mode.name: mode.to_dict() for mode in self.modes}
         self.config.save(data)
+        if notify:
+            self.notify_config_changed()
+
+    def notify_config_changed(self):
+        """通知配置已变化，触发热重载"""
+        if self.on_config_changed:
+            try:
+                self.on_config_changed()
+            except Exception as e:
+                print(f"[模式管理] 应用新配置失败: {e}")
+
+    def _on_mode_changed(self, snapshot, direction: int):
+        """模式切换时取消仍在运行的宏"""
+        self.cancel_macros()
+
+    def cancel_macros(self) -> int:
+        """取消所有模式中正在运行的宏"""
+        cancelled = sum(mode.action_executor.cancel_macros() for mode in self.modes)
+        if cancelled:
+            print(f"[模式管理] 已取消 {cancelled} 个运行中的宏")
+        return cancelled
+
+    @property
+    def current_index(self) -> int:
+        """当前模式索引（由 mode_state 维护）"""
+        return self.mode_state.index
 
     def get_current_mode(self) -> BaseMode:
         return self.modes[self.current_index]
 
     def set_current_index(self, index: int):
-        self.current_index = index % len(self.modes)
+        self.mode_state.set_index(index % len(self.modes))
 
     def set_current_mode_by_name(self, name: str) -> bool:
         """根据模式名称设置当前模式"""
         for i, mode in enumerate(self.modes):
             if mode.name == name:
-                self.current_index = i
+                self.mode_state.set_index(i)
                 return True
         return False
 
@@ -71,18 +106,68 @@ class ModeManager:
     def add_mode(self, mode: BaseMode):
         """添加新模式"""
         self.modes.append(mode)
+        self._sync_mode_state(self.current_index)
 
     def remove_mode(self, name: str) -> bool:
         """移除模式"""
         for i, mode in enumerate(self.modes):
             if mode.name == name:
+                current = self.current_index
                 del self.modes[i]
-                # 调整当前索引
-                if self.current_index >= len(self.modes) and self.current_index > 0:
-                    self.current_index = len(self.modes) - 1
+                # 调整当前索引：移除的模式在当前模式之前时前移一位，越界时取最后一个
+                if i < current:
+                    current -= 1
+                self._sync_mode_state(max(0, min(current, len(self.modes) - 1)))
                 return True
         return False
 
+    def _sync_mode_state(self, index: int):
+        """模式列表变化后同步 mode_state 的模式数量、分发表和当前索引"""
+        if self.on_config_changed:
+            self.notify_config_changed()  # 与配置变化相同，重新加载并替换分发表
+        if self.mode_state.mode_count != max(1, len(self.modes)):
+            # 未连接监听器（或重新加载失败）时先用空表保证模式数量正确
+            count = max(1, len(self.modes))
+            self.mode_state.set_tables([{}] * count, [None] * count)
+        if index != self.mode_state.index:
+            self.mode_state.set_index(index)
+
+    def _resources(self) -> list:
+        """所有模式使用的动作资源（通常只有一份共享资源）"""
+        unique = {}
+        for mode in self.modes:
+            resources = mode.action_executor.resources
+            unique[id(resources)] = resources
+        return list(unique.values())
+
+    def set_scroll_window(self, window_ms: float):
+        """设置所有模式的滚轮合并窗口（毫秒）"""
+        for resources in self._resources():
+            resources.set_scroll_window(window_ms)
+
+    def set_window_filter(self, rules: dict):
+        """设置窗口切换的过滤规则"""
+        for resources in self._resources():
+            resources.set_window_filter(rules)
+
+    def set_action_dispatch(self, dispatch: Callable):
+        """设置把窗口切换和宏的后续步骤交给执行线程的函数 dispatch(func, *args)"""
+        for resources in self._resources():
+            resources.dispatch = dispatch
+
+    def set_cycle_window(self, window_ms: float):
+        """设置所有模式的窗口切换合并窗口（毫秒）"""
+        for resources in self._resources():
+            resources.set_cycle_window(window_ms)
+
+    def get_scroll_stats(self) -> dict:
+        """汇总所有模式的滚轮合并统计"""
+        totals = {"events_in": 0, "events_merged": 0, "injections": 0}
+        for resources in self._resources():
+            for key, value in resources.scroll_coalescer.stats().items():
+                totals[key] += value
+        return totals
+
     def get_mode_names(self) -> List[str]:
         """获取所有模式名称"""
         return [mode.name for mode in self.modes]
\ No newline at end of file
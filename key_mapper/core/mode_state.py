@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+共享模式状态
+当前模式以不可变快照（索引 + 该模式的分发表）发布，切换时整体替换一次引用，
+钩子线程读取时无需加锁，切换后的下一个按键即按新模式分发
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+
+class ModeSnapshot:
+    """模式快照 - 发布后不再修改"""
+
+    __slots__ = ('index', 'table', 'trie')
+
+    def __init__(self, index: int, table: dict, trie):
+        self.index = index  # 模式索引
+        self.table = table  # 该模式的按键分发表
+        self.trie = trie  # 该模式的序列前缀树
+
+
+class ModeState:
+    """权威模式状态
+
+    读取方（钩子线程、界面）只读 snapshot 属性；
+    写入方（模式切换、重新加载）在锁内构建新快照后一次赋值发布。
+    观察者通过 dispatch 调用，默认在发布线程中直接调用，
+    可替换为投递到其他线程的函数，避免在钩子线程中操作界面。
+    """
+
+    def __init__(self, mode_count: int):
+        self.mode_count = max(1, mode_count)
+        self._tables: List[dict] = [{}] * self.mode_count
+        self._tries: List[object] = [None] * self.mode_count
+        self._lock = threading.Lock()
+        self._observers: List[Callable] = []
+        self.dispatch: Callable = self.call_direct
+        self.snapshot = ModeSnapshot(0, self._tables[0], self._tries[0])
+
+    @staticmethod
+    def call_direct(func: Callable, *args):
+        """默认的观察者调用方式：在发布线程中直接调用"""
+        func(*args)
+
+    @property
+    def index(self) -> int:
+        """当前模式索引"""
+        return self.snapshot.index
+
+    def add_observer(self, callback: Callable):
+        """注册观察者 callback(snapshot, direction)，direction 为 1 / -1，直接设置时为 0"""
+        self._observers.append(callback)
+
+    def set_tables(self, tables: List[dict], tries: List[object]):
+        """替换所有模式的分发表（重新加载映射时），当前索引不变"""
+        with self._lock:
+            self._tables, self._tries = tables, tries
+            self.mode_count = max(1, len(tables))
+            self._publish(self.snapshot.index % self.mode_count)
+
+    def step(self, delta: int) -> ModeSnapshot:
+        """按偏移切换模式并通知观察者"""
+        with self._lock:
+            snapshot = self._publish((self.snapshot.index + delta) % self.mode_count)
+        self._notify(snapshot, 1 if delta > 0 else -1)
+        return snapshot
+
+    def set_index(self, index: int) -> Optional[ModeSnapshot]:
+        """切换到指定模式并通知观察者，索引无效时返回 None"""
+        if not 0 <= index < self.mode_count:
+            return None
+        with self._lock:
+            snapshot = self._publish(index)
+        self._notify(snapshot, 0)
+        return snapshot
+
+    def _publish(self, index: int) -> ModeSnapshot:
+        """构建并发布快照（调用方持有锁）"""
+        snapshot = ModeSnapshot(index, self._tables[index], self._tries[index])
+        self.snapshot = snapshot
+        return snapshot
+
+    def _notify(self, snapshot: ModeSnapshot, direction: int):
+        for callback in self._observers:
+            try:
+                self.dispatch(callback, snapshot, direction)
+            except Exception as e:
+                print(f"[模式状态] 通知观察者失败: {e}")
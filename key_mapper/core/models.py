@@ -5,8 +5,8 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Callable
-from pynput.keyboard import Key, KeyCode, Controller as KeyboardController
+from typing import Dict, List, Optional, Callable
+from .actions import ActionCompileError, CompiledAction, parse_key_combo
 from .executors import ActionExecutor
 
 
@@ -14,11 +14,17 @@ class KeyMapping:
     """单个按键映射"""
 
     def __init__(self, source_key: str, target_key: str, block: bool = True, hint: str = "", action_type: str = "keyboard"):
-        self.source_key = source_key  # 源按键
+        self.source_key = source_key  # 源按键，可带修饰键（"ctrl+f16"）或为空格分隔的序列（"f13 j"）
         self.target_key = target_key  # 目标按键
         self.block = block  # 是否屏蔽源按键，默认True
         self.hint = hint  # 触发提示文本
-        self.action_type = action_type  # 动作类型：keyboard, mouse_scroll, mouse_click, command
+        self.action_type = action_type  # 动作类型：keyboard, mouse_scroll, mouse_click, command, window_cycle, window_jump, macro, python
+        self.action: Optional[CompiledAction] = None  # 预编译动作，由 BaseMode.compile 生成
+
+    @property
+    def is_sequence(self) -> bool:
+        """源键是否为按键序列（以空格分隔，如 "f13 j"）"""
+        return len(self.source_key.split()) > 1
 
     def to_dict(self) -> dict:
         result = {
@@ -71,9 +77,9 @@ class BaseMode(ABC):
         self.color = color
         self.mappings: Dict[str, KeyMapping] = {}  # source_key -> KeyMapping
         self.enabled = True
-        self.keyboard_ctrl = KeyboardController()
-        self.action_executor = ActionExecutor()  # 动作执行器
+        self.action_executor = ActionExecutor(mode=self)  # 动作执行器
         self.on_hint: Optional[Callable[[str], None]] = None  # 提示回调
+        self.compile_errors: List[str] = []  # 最近一次编译的错误信息
 
     @abstractmethod
     def get_default_mappings(self) -> list:
@@ -82,7 +88,28 @@ class BaseMode(ABC):
 
     def add_mapping(self, source: str, target: str, block: bool = True, hint: str = ""):
         """添加映射"""
-        self.mappings[source] = KeyMapping(source, target, block, hint)
+        self.set_mapping(KeyMapping(source, target, block, hint))
+
+    def set_mapping(self, mapping: KeyMapping):
+        """
+        添加或替换映射并立即编译
+
+        Raises:
+            ActionCompileError: 目标动作无法解析
+        """
+        mapping.action = self.action_executor.compile(mapping.action_type, mapping.target_key, mapping)
+        self.mappings[mapping.source_key] = mapping
+
+    def compile(self) -> List[str]:
+        """将所有映射编译为动作对象，返回错误信息列表"""
+        self.compile_errors = []
+        for mapping in self.mappings.values():
+            try:
+                mapping.action = self.action_executor.compile(mapping.action_type, mapping.target_key, mapping)
+            except ActionCompileError as e:
+                mapping.action = None
+                self.compile_errors.append(f"{mapping.source_key}: {e}")
+        return self.compile_errors
 
     def remove_mapping(self, source: str):
         """移除映射"""
@@ -103,7 +130,8 @@ class BaseMode(ABC):
         """加载默认映射"""
         self.clear_mappings()
         for src, tgt in self.get_default_mappings():
-            self.add_mapping(src, tgt)
+            self.mappings[src] = KeyMapping(src, tgt)
+        self.compile()
 
     def to_dict(self) -> dict:
         """序列化"""
@@ -119,63 +147,33 @@ class BaseMode(ABC):
         for m in data.get("mappings", []):
             mapping = KeyMapping.from_dict(m)
             self.mappings[mapping.source_key] = mapping
+        self.compile()
 
     def execute_mapping(self, source_key: str) -> bool:
         """执行按键映射，返回是否屏蔽源按键"""
-        if source_key in self.mappings and self.enabled:
-            mapping = self.mappings[source_key]
-
-            # 使用动作执行器执行动作
-            success = self.action_executor.execute(mapping.action_type, mapping.target_key)
+        mapping = self.mappings.get(source_key)
+        if mapping is not None and self.enabled:
+            return self.run_mapping(mapping)
+        return False
 
+    def run_mapping(self, mapping: KeyMapping) -> bool:
+        """执行已编译的映射，返回是否屏蔽源按键"""
+        action = mapping.action
+        if action is not None and action() and mapping.hint and self.on_hint:
             # 显示提示
-            if success and mapping.hint and self.on_hint:
-                self.on_hint(mapping.hint)
-
-            return mapping.block  # 返回是否屏蔽
-        return False
+            self.on_hint(mapping.hint)
+        return mapping.block  # 返回是否屏蔽
 
     def _press_key(self, key_str: str):
         """模拟按键，支持组合键如 alt+tab"""
         keys = self._parse_key_combo(key_str)
         if not keys:
             return
-        # 按下所有键
-        for key in keys:
-            self.keyboard_ctrl.press(key)
-        # 反向释放所有键
-        for key in reversed(keys):
-            self.keyboard_ctrl.release(key)
+        self.action_executor._send_keys(tuple(keys))
 
     def _parse_key_combo(self, key_str: str) -> list:
         """解析按键字符串，支持组合键"""
-        special_keys = {
-            "space": Key.space, "enter": Key.enter, "tab": Key.tab,
-            "backspace": Key.backspace, "delete": Key.delete,
-            "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right,
-            "home": Key.home, "end": Key.end, "page_up": Key.page_up, "page_down": Key.page_down,
-            "esc": Key.esc, "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
-            "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
-            "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
-            "f13": Key.f13, "f14": Key.f14, "f15": Key.f15, "f16": Key.f16,
-            "f17": Key.f17, "f18": Key.f18, "f19": Key.f19, "f20": Key.f20,
-            "alt": Key.alt, "alt_l": Key.alt_l, "alt_r": Key.alt_r,
-            "ctrl": Key.ctrl, "ctrl_l": Key.ctrl_l, "ctrl_r": Key.ctrl_r,
-            "shift": Key.shift, "shift_l": Key.shift_l, "shift_r": Key.shift_r,
-            "win": Key.cmd, "cmd": Key.cmd,
-        }
-
-        parts = key_str.lower().split("+")
-        result = []
-        for part in parts:
-            part = part.strip()
-            if part in special_keys:
-                result.append(special_keys[part])
-            elif len(part) == 1:
-                result.append(KeyCode.from_char(part))
-            else:
-                return []  # 无法解析
-        return result
+        return parse_key_combo(key_str, self.action_executor.backend)
 
     def _parse_key(self, key_str: str):
         """解析单个按键字符串"""
@@ -81,6 +81,8 @@ class WindowMode(BaseMode):
             action_type="window_cycle"
         )
 
+        self.compile()
+
 
 class CustomMode(BaseMode):
     """自定义模式 - 用户可以自由配置"""
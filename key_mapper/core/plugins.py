@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Python 动作插件
+python 动作的目标为插件名或 "模块:函数"，函数在进程内直接调用，
+第一次执行时才导入并缓存，之后每次按键只是一次函数调用
+"""
+
+import importlib
+import re
+import sys
+import threading
+from importlib import metadata
+from typing import Callable, Dict, List, Optional
+
+from .actions import ActionCompileError
+
+ENTRY_POINT_GROUP = "flowkey.actions"  # 第三方包通过该入口点组注册插件
+
+# 插件名（如 toggle_mute）或 模块:属性（如 mypkg.actions:toggle_mute）
+_TARGET_PATTERN = re.compile(r'^[A-Za-z_][\w.]*(:[A-Za-z_][\w.]*)?$')
+
+
+class ActionContext:
+    """python 动作的调用上下文"""
+
+    __slots__ = ('mode', 'mapping', 'backend', 'executor')
+
+    def __init__(self, mode, mapping, backend, executor):
+        self.mode = mode  # 映射所属模式（BaseMode）
+        self.mapping = mapping  # 触发的 KeyMapping，宏内调用时为所属宏的映射
+        self.backend = backend  # 输入输出后端，可直接注入按键
+        self.executor = executor  # 动作执行器，可调用 execute 执行其他动作
+
+    def __repr__(self):
+        mode = getattr(self.mode, 'name', None)
+        source = getattr(self.mapping, 'source_key', None)
+        return f"ActionContext({mode}, {source})"
+
+
+class PluginRegistry:
+    """插件注册表
+
+    解析顺序：显式注册的插件 -> 入口点插件 -> "模块:属性" 导入。
+    入口点在第一次查找插件名时扫描一次，函数在第一次执行时导入，结果都会缓存。
+    """
+
+    def __init__(self, group: str = ENTRY_POINT_GROUP):
+        self.group = group
+        self._lock = threading.Lock()
+        self._registered: Dict[str, Callable] = {}  # 插件名 -> 函数
+        self._entry_points: Optional[Dict[str, object]] = None  # 插件名 -> EntryPoint
+        self._resolved: Dict[str, Callable] = {}  # 目标 -> 已导入的函数
+
+    def register(self, name: str, func: Optional[Callable] = None):
+        """注册插件，可作为装饰器使用：@registry.register("toggle_mute")"""
+        if func is None:
+            return lambda f: self.register(name, f)
+        with self._lock:
+            self._registered[name] = func
+            self._resolved.pop(name, None)
+        return func
+
+    @staticmethod
+    def validate(target: str):
+        """检查目标格式（编译动作时调用，不导入）
+
+        Raises:
+            ActionCompileError: 格式无效
+        """
+        if not _TARGET_PATTERN.match(target):
+            raise ActionCompileError(f"无效的 Python 动作: {target}（应为插件名或 模块:函数）")
+
+    def resolve(self, target: str) -> Callable:
+        """目标 -> 可调用对象（首次调用时导入）
+
+        Raises:
+            ActionCompileError: 找不到插件或目标不可调用
+        """
+        func = self._resolved.get(target)
+        if func is not None:
+            return func
+
+        with self._lock:
+            func = self._registered.get(target)
+            if func is None and ':' not in target:
+                entry_point = self._load_entry_points().get(target)
+                if entry_point is None:
+                    raise ActionCompileError(f"未找到 Python 动作插件: {target}")
+                func = entry_point.load()
+            elif func is None:
+                func = self._import(target)
+            if not callable(func):
+                raise ActionCompileError(f"Python 动作不可调用: {target}")
+            self._resolved[target] = func
+        return func
+
+    def names(self) -> List[str]:
+        """已知的插件名（显式注册和入口点）"""
+        with self._lock:
+            return sorted(set(self._registered) | set(self._load_entry_points()))
+
+    def _load_entry_points(self) -> Dict[str, object]:
+        """扫描入口点（持有锁时调用）"""
+        if self._entry_points is None:
+            if sys.version_info >= (3, 10):
+                found = metadata.entry_points(group=self.group)
+            else:
+                found = metadata.entry_points().get(self.group, [])
+            self._entry_points = {ep.name: ep for ep in found}
+        return self._entry_points
+
+    @staticmethod
+    def _import(target: str) -> Callable:
+        module_name, _, attr_path = target.partition(':')
+        try:
+            obj = importlib.import_module(module_name)
+        except ImportError as e:
+            raise ActionCompileError(f"无法导入模块 {module_name}: {e}")
+        for attr in attr_path.split('.'):
+            try:
+                obj = getattr(obj, attr)
+            except AttributeError:
+                raise ActionCompileError(f"模块 {module_name} 中没有 {attr_path}")
+        return obj
+
+
+_plugin_registry: Optional[PluginRegistry] = None
+_plugin_registry_lock = threading.Lock()
+
+
+def get_plugin_registry() -> PluginRegistry:
+    """获取进程内共享的插件注册表"""
+    global _plugin_registry
+    if _plugin_registry is None:
+        with _plugin_registry_lock:
+            if _plugin_registry is None:
+                _plugin_registry = PluginRegistry()
+    return _plugin_registry
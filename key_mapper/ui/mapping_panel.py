@@ -9,6 +9,8 @@ from tkinter import ttk, messagebox
 from typing import Optional, Dict, Any
 from ..core.manager import ModeManager
 from .components import BasePanel, UIHelper
+from ..utils.helpers import MODIFIER_BITS, join_modifiers
+from ..utils.timer_wheel import get_ui_timers
 
 
 class MappingPanel(BasePanel):
@@ -43,7 +45,10 @@ class MappingPanel(BasePanel):
             ("mouse_scroll", "🖱 鼠标滚轮"),
             ("mouse_click", "🖱 鼠标点击"),
             ("window_cycle", "🪟 窗口切换"),
-            ("command", "⚙ 系统命令")
+            ("window_jump", "🔎 跳转窗口"),
+            ("command", "⚙ 系统命令"),
+            ("macro", "🎬 宏"),
+            ("python", "🐍 Python 函数")
         ]
         self.action_type_display_map = {label: code for code, label in action_types}
         self.action_type_code_map = {code: label for code, label in action_types}
@@ -69,6 +74,15 @@ class MappingPanel(BasePanel):
         self.target_command_frame = None  # command: 文本框
         self.target_command_entry = None
 
+        self.target_macro_frame = None  # macro: 文本框
+        self.target_macro_entry = None
+
+        self.target_python_frame = None  # python: 文本框
+        self.target_python_entry = None
+
+        self.target_jump_frame = None  # window_jump: 文本框
+        self.target_jump_entry = None
+
         # 标签页相关
         self.current_tab = "mappings"  # 当前激活的标签页
         self.tab_frames = {}  # 存储各个标签页的框架
@@ -147,6 +161,12 @@ class MappingPanel(BasePanel):
             self.target_window_cycle_frame.pack_forget()
         if self.target_command_frame:
             self.target_command_frame.pack_forget()
+        if self.target_macro_frame:
+            self.target_macro_frame.pack_forget()
+        if self.target_python_frame:
+            self.target_python_frame.pack_forget()
+        if self.target_jump_frame:
+            self.target_jump_frame.pack_forget()
 
         # 根据类型显示对应的控件
         if selected == "⌨ 键盘按键":
@@ -164,6 +184,15 @@ class MappingPanel(BasePanel):
         elif selected == "⚙ 系统命令":
             if self.target_command_frame:
                 self.target_command_frame.pack(fill="x", pady=(8, 5))
+        elif selected == "🎬 宏":
+            if self.target_macro_frame:
+                self.target_macro_frame.pack(fill="x", pady=(8, 5))
+        elif selected == "🐍 Python 函数":
+            if self.target_python_frame:
+                self.target_python_frame.pack(fill="x", pady=(8, 5))
+        elif selected == "🔎 跳转窗口":
+            if self.target_jump_frame:
+                self.target_jump_frame.pack(fill="x", pady=(8, 5))
 
     def _toggle_maximize(self):
         """切换最大化状态"""
@@ -630,6 +659,93 @@ class MappingPanel(BasePanel):
         )
         hint_text.pack(side="left", padx=(70, 0))
 
+        # === macro: 文本框 ===
+        self.target_macro_frame = tk.Frame(row2_container, bg=self.colors["bg_secondary"])
+
+        macro_left = tk.Frame(self.target_macro_frame, bg=self.colors["bg_secondary"])
+        macro_left.pack(fill="x")
+
+        self.create_label(macro_left, "宏步骤:", 9, "text_dim").pack(side="left")
+        self.target_macro_entry = tk.Entry(
+            macro_left,
+            font=("Microsoft YaHei UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            insertbackground=self.colors["accent"],
+            bd=0,
+            highlightbackground=self.colors["border"],
+            highlightthickness=1,
+            highlightcolor=self.colors["accent"]
+        )
+        self.target_macro_entry.pack(side="left", fill="x", expand=True, padx=(5, 0), ipady=4)
+
+        macro_hint = tk.Frame(self.target_macro_frame, bg=self.colors["bg_secondary"])
+        macro_hint.pack(fill="x", pady=(3, 0))
+        self.create_label(
+            macro_hint,
+            "💡 分号分隔，例如: keyboard:ctrl+c; delay:50; keyboard:alt+tab; delay:100; keyboard:ctrl+v",
+            7,
+            "text_dim"
+        ).pack(side="left", padx=(60, 0))
+
+        # === python: 文本框 ===
+        self.target_python_frame = tk.Frame(row2_container, bg=self.colors["bg_secondary"])
+
+        python_left = tk.Frame(self.target_python_frame, bg=self.colors["bg_secondary"])
+        python_left.pack(fill="x")
+
+        self.create_label(python_left, "函数:", 9, "text_dim").pack(side="left")
+        self.target_python_entry = tk.Entry(
+            python_left,
+            font=("Microsoft YaHei UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            insertbackground=self.colors["accent"],
+            bd=0,
+            highlightbackground=self.colors["border"],
+            highlightthickness=1,
+            highlightcolor=self.colors["accent"]
+        )
+        self.target_python_entry.pack(side="left", fill="x", expand=True, padx=(5, 0), ipady=4)
+
+        python_hint = tk.Frame(self.target_python_frame, bg=self.colors["bg_secondary"])
+        python_hint.pack(fill="x", pady=(3, 0))
+        self.create_label(
+            python_hint,
+            "💡 插件名或 模块:函数，例如: mypkg.actions:toggle_mute，函数接收一个上下文参数 (mode, mapping, backend)",
+            7,
+            "text_dim"
+        ).pack(side="left", padx=(40, 0))
+
+        # === window_jump: 文本框 ===
+        self.target_jump_frame = tk.Frame(row2_container, bg=self.colors["bg_secondary"])
+
+        jump_left = tk.Frame(self.target_jump_frame, bg=self.colors["bg_secondary"])
+        jump_left.pack(fill="x")
+
+        self.create_label(jump_left, "窗口:", 9, "text_dim").pack(side="left")
+        self.target_jump_entry = tk.Entry(
+            jump_left,
+            font=("Microsoft YaHei UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            insertbackground=self.colors["accent"],
+            bd=0,
+            highlightbackground=self.colors["border"],
+            highlightthickness=1,
+            highlightcolor=self.colors["accent"]
+        )
+        self.target_jump_entry.pack(side="left", fill="x", expand=True, padx=(5, 0), ipady=4)
+
+        jump_hint = tk.Frame(self.target_jump_frame, bg=self.colors["bg_secondary"])
+        jump_hint.pack(fill="x", pady=(3, 0))
+        self.create_label(
+            jump_hint,
+            "💡 标题或进程名的一部分，多个用 | 分隔，例如: code|vscode，重复触发时在同名窗口间轮换",
+            7,
+            "text_dim"
+        ).pack(side="left", padx=(40, 0))
+
         # 默认显示 keyboard 控件
         self.target_keyboard_frame.pack(fill="x", pady=(8, 5))
 
@@ -699,7 +815,12 @@ class MappingPanel(BasePanel):
             self.mode_menu.post(x, y)
             # 短暂改变按钮样式表示展开状态
             self.mode_menu_btn.configure(bg=self.colors["accent_hover"])
-            self.window.after(150, lambda: self.mode_menu_btn.configure(bg=self.colors["accent"]))
+            restore = lambda: self.mode_menu_btn.configure(bg=self.colors["accent"])
+            timers = get_ui_timers()
+            if timers:
+                timers.call_later(0.15, restore)
+            else:
+                self.window.after(150, restore)
         except:
             pass
 
@@ -844,6 +965,15 @@ class MappingPanel(BasePanel):
         elif action_type == "command":
             self.target_command_entry.delete(0, "end")
             self.target_command_entry.insert(0, target)
+        elif action_type == "macro":
+            self.target_macro_entry.delete(0, "end")
+            self.target_macro_entry.insert(0, target)
+        elif action_type == "python":
+            self.target_python_entry.delete(0, "end")
+            self.target_python_entry.insert(0, target)
+        elif action_type == "window_jump":
+            self.target_jump_entry.delete(0, "end")
+            self.target_jump_entry.insert(0, target)
 
         # 显示取消按钮
         self.cancel_btn.pack(side="left", padx=(0, 8))
@@ -884,6 +1014,15 @@ class MappingPanel(BasePanel):
         if self.target_command_entry:
             self.target_command_entry.delete(0, "end")
 
+        if self.target_macro_entry:
+            self.target_macro_entry.delete(0, "end")
+
+        if self.target_python_entry:
+            self.target_python_entry.delete(0, "end")
+
+        if self.target_jump_entry:
+            self.target_jump_entry.delete(0, "end")
+
         # 重置动作类型为默认值(keyboard)
         if self.action_type_menu:
             self.action_type_menu.current(0)  # 选择第一项（keyboard）
@@ -919,6 +1058,12 @@ class MappingPanel(BasePanel):
             target = self.target_window_cycle_var.get()
         elif action_type == "command":
             target = self.target_command_entry.get().strip()
+        elif action_type == "macro":
+            target = self.target_macro_entry.get().strip()
+        elif action_type == "python":
+            target = self.target_python_entry.get().strip()
+        elif action_type == "window_jump":
+            target = self.target_jump_entry.get().strip()
 
         if not target:
             messagebox.showwarning("提示", "目标动作不能为空")
@@ -926,14 +1071,19 @@ class MappingPanel(BasePanel):
 
         mode = self._get_selected_mode()
 
-        # 如果是编辑模式，先删除旧映射
-        if self.editing_source and self.editing_source != source:
-            mode.remove_mapping(self.editing_source)
-
-        # 创建新的 KeyMapping 对象（包含 action_type）
+        # 创建新的 KeyMapping 对象（包含 action_type）并立即编译
         from ..core.models import KeyMapping
+        from ..core.actions import ActionCompileError
         mapping = KeyMapping(source, target, self.block_var.get(), hint, action_type)
-        mode.mappings[source] = mapping
+        try:
+            mode.set_mapping(mapping)
+        except ActionCompileError as e:
+            messagebox.showwarning("提示", f"目标动作无法解析: {e}")
+            return
+
+        # 如果是编辑模式且源键改变，删除旧映射
+        if self.editing_source and self.editing_source != source:
+            mode.remove_mapping(self.editing_source)
 
         self._refresh_list()
         self._cancel_edit()
@@ -962,8 +1112,8 @@ class MappingPanel(BasePanel):
 
     def _save(self):
         """保存配置"""
-        # 保存按键映射配置
-        self.manager.save_config()
+        # 保存按键映射配置（高级设置保存后再统一热重载）
+        self.manager.save_config(notify=False)
 
         # 保存高级设置
         try:
@@ -1017,6 +1167,7 @@ class MappingPanel(BasePanel):
             GlobalConfig.set('hotkeys.prev_mode', self.hotkey_prev_var.get().strip())
             GlobalConfig.set('hotkeys.open_settings', self.hotkey_settings_var.get().strip())
             GlobalConfig.set('hotkeys.hide_disk', self.hotkey_hide_var.get().strip())
+            GlobalConfig.set('hotkeys.toggle_pause', self.hotkey_pause_var.get().strip())
 
             # 保存开机启动设置
             startup_enabled = self.startup_enabled_var.get()
@@ -1033,8 +1184,12 @@ class MappingPanel(BasePanel):
             # 保存到文件
             GlobalConfig.save()
 
-            messagebox.showinfo("保存成功", "配置已保存到文件！\n\n修改热键需要重启程序才能生效。")
+            # 立即应用新的映射和热键
+            self.manager.notify_config_changed()
+
+            messagebox.showinfo("保存成功", "配置已保存到文件，并已立即生效！")
         except Exception as e:
+            self.manager.notify_config_changed()
             messagebox.showerror("保存失败", f"保存高级设置失败: {e}")
 
     def _show_command_examples(self):
@@ -1085,6 +1240,17 @@ class MappingPanel(BasePanel):
         entry.configure(bg=self.colors["accent"])
         entry.focus_set()
 
+        # Tkinter键名到系统键名的映射表
+        key_map = {
+            'control_l': 'ctrl', 'control_r': 'ctrl',
+            'shift_l': 'shift', 'shift_r': 'shift',
+            'alt_l': 'alt', 'alt_r': 'alt',
+            'win_l': 'win', 'win_r': 'win',
+            'prior': 'page_up', 'next': 'page_down',
+            'return': 'enter',
+        }
+        held_modifiers = set()
+
         def on_key(event):
             # 调试输出
             print(f"[录制] keysym={event.keysym}, state={hex(event.state)}, char={repr(event.char)}")
@@ -1092,43 +1258,29 @@ class MappingPanel(BasePanel):
             # 获取原始键名
             raw_key = event.keysym.lower()
 
-            # Tkinter键名到系统键名的映射表
-            key_map = {
-                'control_l': 'ctrl', 'control_r': 'ctrl',
-                'shift_l': 'shift', 'shift_r': 'shift',
-                'alt_l': 'alt', 'alt_r': 'alt',
-                'win_l': 'win', 'win_r': 'win',
-                'prior': 'page_up', 'next': 'page_down',
-                'return': 'enter',
-            }
-
             # 标准化键名
             main_key = key_map.get(raw_key, raw_key)
 
-            # 如果按下的是纯修饰键，跳过（等待主键）
-            if main_key in ['ctrl', 'shift', 'alt', 'win']:
+            # 如果按下的是纯修饰键，记录后跳过（等待主键）
+            if main_key in MODIFIER_BITS:
+                held_modifiers.add(main_key)
                 print(f"[录制] 跳过修饰键: {main_key}")
                 return "break"  # 阻止事件传播
 
-            # 检测修饰键状态
-            modifiers = []
+            # 检测修饰键状态（Win 键不在 state 中，依靠按下记录）
+            mask = 0
+            for name in held_modifiers:
+                mask |= MODIFIER_BITS[name]
             # Shift=0x1, Ctrl=0x4, Alt=0x20000 (或 0x80)
             if event.state & 0x4:  # Ctrl
-                modifiers.append('ctrl')
-            if event.state & 0x20000:  # Alt (Windows)
-                if 'alt' not in modifiers:
-                    modifiers.append('alt')
-            if event.state & 0x80:  # Alt (某些系统)
-                if 'alt' not in modifiers:
-                    modifiers.append('alt')
+                mask |= MODIFIER_BITS['ctrl']
+            if event.state & (0x20000 | 0x80):  # Alt (Windows / 某些系统)
+                mask |= MODIFIER_BITS['alt']
             if event.state & 0x1:  # Shift
-                modifiers.append('shift')
+                mask |= MODIFIER_BITS['shift']
 
-            # 组合完整按键字符串
-            if modifiers:
-                result = '+'.join(modifiers + [main_key])
-            else:
-                result = main_key
+            # 组合为带修饰键的源键字符串（固定顺序，与分发表解析一致）
+            result = join_modifiers(mask, main_key)
 
             print(f"[录制] 结果: {result}")
 
@@ -1137,11 +1289,17 @@ class MappingPanel(BasePanel):
             entry.insert(0, result)
             entry.configure(bg=self.colors["bg"])
             entry.unbind("<KeyPress>")
+            entry.unbind("<KeyRelease>")
             self.recording_entry = None
 
             return "break"  # 阻止事件传播到Entry的默认处理
 
+        def on_key_release(event):
+            main_key = key_map.get(event.keysym.lower(), event.keysym.lower())
+            held_modifiers.discard(main_key)
+
         entry.bind("<KeyPress>", on_key)
+        entry.bind("<KeyRelease>", on_key_release)
 
     def _preview_hint(self):
         """测试预览提示显示效果"""
@@ -1313,11 +1471,23 @@ class MappingPanel(BasePanel):
         self.create_btn(hotkey_row2, "录", lambda: self._start_record(hotkey_hide_entry),
                        bg=self.colors["border"], width=3).pack(side="left")
 
+        # 第三行：暂停/恢复
+        hotkey_row3 = tk.Frame(hotkey_section, bg=self.colors["bg_secondary"])
+        hotkey_row3.pack(fill="x", pady=3)
+
+        self.create_label(hotkey_row3, "暂停恢复:", 9, "text_dim").pack(side="left", padx=(0, 5))
+        self.hotkey_pause_var = tk.StringVar(value=config.get('hotkeys', {}).get('toggle_pause', 'ctrl+alt+shift+p'))
+        hotkey_pause_entry = self.create_entry(hotkey_row3, width=20, textvariable=self.hotkey_pause_var)
+        hotkey_pause_entry.pack(side="left", padx=(0, 3), ipady=2)
+
+        self.create_btn(hotkey_row3, "录", lambda: self._start_record(hotkey_pause_entry),
+                       bg=self.colors["border"], width=3).pack(side="left")
+
         # 提示信息
         tip_frame = tk.Frame(advanced_inner, bg=self.colors["bg_secondary"])
         tip_frame.pack(fill="x", pady=(10, 0))
 
-        self.create_label(tip_frame, "💡 提示: 修改热键后需要重启程序才能生效",
+        self.create_label(tip_frame, "💡 提示: 保存后热键修改立即生效",
                          8, "warning").pack(anchor="w")
 
         # === 开机启动设置 ===
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+命令执行器
+command 动作的执行端：不需要 shell 语法的命令按参数列表直接启动进程，
+其余命令写入预先启动的常驻 shell；执行线程只做一次入队，进程创建、超时和回收都在后台线程完成
+"""
+
+import locale
+import os
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set, Union
+
+from .scheduler import get_scheduler
+
+if sys.platform == 'win32':
+    SHELL_ARGV = [os.environ.get('COMSPEC', 'cmd.exe'), '/Q', '/D']
+    SHELL_CHARS = frozenset('|&<>()^%\r\n')  # 需要 cmd 解释的字符
+    CREATE_NO_WINDOW = 0x08000000
+    # 会改变 cmd 环境变量、目录栈或代码页的语句，执行后换用新的 shell
+    SHELL_STATE_RE = re.compile(r'(?:^|[&|(])\s*@?(?:set|setlocal|path|pushd|popd|prompt|chcp)\b', re.I)
+else:
+    SHELL_ARGV = ['/bin/sh']
+    SHELL_CHARS = frozenset('|&;<>()$`\\*?[]{}~#\r\n')
+    SHELL_STATE_RE = None  # 命令在子 shell 中执行，状态不会保留
+
+DONE_MARK = "__FLOWKEY_DONE__"  # 常驻 shell 执行完一条命令后输出的标记行
+
+
+class PreparedCommand:
+    """预处理的命令 - 编译动作时解析一次"""
+
+    __slots__ = ('text', 'argv')
+
+    def __init__(self, text: str, argv: Union[List[str], str, None]):
+        self.text = text  # 原始命令
+        self.argv = argv  # 直接启动的参数（Windows 上为命令行字符串），None 表示需要 shell
+
+    def __repr__(self):
+        return f"PreparedCommand({'argv' if self.argv is not None else 'shell'}, '{self.text}')"
+
+
+def _kill_tree(proc: subprocess.Popen):
+    """结束进程及其子进程"""
+    if proc.poll() is not None:
+        return
+    try:
+        if sys.platform == 'win32':
+            subprocess.Popen(['taskkill', '/T', '/F', '/PID', str(proc.pid)],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             creationflags=CREATE_NO_WINDOW)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+
+
+class _ShellWorker:
+    """常驻 shell 进程，逐条执行从管道写入的命令，命令之间不保留 cd / set 等状态"""
+
+    def __init__(self, runner: "CommandRunner"):
+        self.runner = runner
+        self.cwd = os.getcwd()  # shell 的初始目录，每条命令执行后回到这里
+        self.command: Optional[str] = None  # 正在执行的命令，空闲时为 None
+        self.token = 0  # 已写入的命令序号，用于判断超时的是不是同一条命令
+        kwargs = {'creationflags': CREATE_NO_WINDOW} if sys.platform == 'win32' else {'start_new_session': True}
+        self.proc = subprocess.Popen(SHELL_ARGV, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT, **kwargs)
+        threading.Thread(target=self._read, name="CommandShell", daemon=True).start()
+
+    def run(self, text: str) -> int:
+        """写入一条命令（命令的标准输入重定向为空，不会读走后续命令）"""
+        self.token += 1
+        self.command = text
+        if sys.platform == 'win32':
+            script = f"{text} <nul\r\ncd /d \"{self.cwd}\"\r\necho {DONE_MARK}\r\n"
+        else:
+            script = f"( {text}\n) </dev/null\necho {DONE_MARK}\n"
+        self.proc.stdin.write(script.encode(self.runner.encoding, errors='replace'))
+        self.proc.stdin.flush()
+        return self.token
+
+    def close(self):
+        """关闭输入，shell 执行完当前命令后退出"""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+
+    def _read(self):
+        """读取 shell 输出：转发命令输出，遇到完成标记时归还到空闲队列"""
+        for raw in self.proc.stdout:
+            line = raw.decode(self.runner.encoding, errors='replace').rstrip()
+            if line.startswith(DONE_MARK):
+                self.command = None
+                self.runner._worker_idle(self)
+            elif line:
+                print(f"[命令] {line}")
+        self.proc.wait()
+        self.runner._worker_exited(self)
+
+
+class CommandRunner:
+    """命令执行器
+
+    submit 只把命令放入队列并唤醒分发线程。两类命令分开排队，各自按提交顺序执行，互不阻塞：
+    - 可以直接启动的命令用 Popen(argv) 启动；子进程启动后的 HANDOFF 秒内计入并发上限 max_children
+      （限制突发启动），之后视为已交给用户的程序，不再占用上限，只由共享调度器定期回收；
+    - 需要 shell 的命令写入空闲的常驻 shell，shell 数量（包括执行完当前命令后退出的 shell）
+      即 shell 命令的并发上限。
+    shell_timeout 大于 0 时，执行超时的 shell 及其子进程被结束，由新启动的 shell 接替，
+    卡住的命令不会一直占满 shell；timeout 大于 0 时，直接启动的子进程超时后被结束。
+    常驻 shell 没有控制台窗口，输出转发到日志。
+    """
+
+    REAP_INTERVAL = 1.0  # 有子进程在运行时的回收间隔（秒）
+    HANDOFF = 1.0  # 子进程启动后计入并发上限的时长（秒）
+
+    def __init__(self, workers: int = 2, max_children: int = 16, timeout: float = 0.0, shell_timeout: float = 30.0):
+        self.workers = max(1, workers)  # 常驻 shell 数
+        self.max_children = max(1, max_children)  # 同时处于启动阶段的子进程上限
+        self.timeout = max(0.0, timeout)  # 直接启动的子进程的超时（秒），0 表示不限制
+        self.shell_timeout = max(0.0, shell_timeout)  # shell 命令的超时（秒），0 表示不限制
+        self.encoding = locale.getpreferredencoding(False)
+
+        self._cond = threading.Condition()
+        self._argv_pending: deque = deque()  # 等待直接启动的 PreparedCommand
+        self._shell_pending: deque = deque()  # 等待空闲 shell 的 PreparedCommand
+        self._pool: Set[_ShellWorker] = set()
+        self._retiring: Set[_ShellWorker] = set()  # 移出池、执行完当前命令后退出的 shell（仍计入上限）
+        self._shell_deferred = False  # shell 命令是否因 shell 全部占用在等待（只提示一次）
+        self._idle: List[_ShellWorker] = []
+        self._children: Dict[subprocess.Popen, float] = {}  # 运行中的子进程 -> 启动时间 (time.monotonic)
+        self._argv_deferred = False  # 直接启动的命令是否因达到上限在等待（只提示一次）
+        self._shell_used = False  # 是否有需要 shell 的命令（决定是否预先启动 shell）
+        self._reap_timer = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # 统计
+        self.launched = 0  # 直接启动的进程数
+        self.shell_runs = 0  # 交给常驻 shell 的命令数
+        self.reaped = 0  # 已回收的子进程数
+        self.timed_out = 0  # 因超时被结束的命令数
+        self.recycled = 0  # 因改变了 shell 状态而替换的 shell 数
+
+    def configure(self, workers: int, max_children: int, timeout: float, shell_timeout: float = 30.0):
+        """更新配置（已启动的 shell 数量只增不减）"""
+        with self._cond:
+            self.workers = max(1, workers)
+            self.max_children = max(1, max_children)
+            self.timeout = max(0.0, timeout)
+            self.shell_timeout = max(0.0, shell_timeout)
+            self._cond.notify()
+
+    def prepare(self, command: str) -> PreparedCommand:
+        """解析命令：程序能在 PATH 中找到且不含 shell 语法时直接启动"""
+        text = command.strip()
+        argv = None
+        if not SHELL_CHARS.intersection(text):
+            try:
+                parts = shlex.split(text, posix=sys.platform != 'win32')
+            except ValueError:
+                parts = []
+            program = shutil.which(parts[0].strip('"')) if parts else None
+            if program and sys.platform == 'win32':
+                # cmd 内部命令和批处理找不到或不是可执行文件，仍交给 shell
+                if program.lower().endswith(('.exe', '.com')):
+                    argv = subprocess.list2cmdline([program]) + text[len(parts[0]):]
+            elif program:
+                argv = [program] + parts[1:]
+        if argv is None:
+            self._shell_used = True
+        return PreparedCommand(text, argv)
+
+    def start(self):
+        """启动分发线程；有 shell 命令时预先启动常驻 shell"""
+        with self._cond:
+            self._ensure_thread()
+
+    def submit(self, command: PreparedCommand) -> bool:
+        """提交命令（不阻塞）"""
+        with self._cond:
+            self._ensure_thread()
+            (self._argv_pending if command.argv is not None else self._shell_pending).append(command)
+            self._cond.notify()
+        return True
+
+    def shutdown(self):
+        """停止分发线程并关闭常驻 shell（已启动的子进程不受影响）"""
+        with self._cond:
+            self._closed = True
+            self._argv_pending.clear()
+            self._shell_pending.clear()
+            workers, self._idle = list(self._pool), []
+            self._pool.clear()
+            self._retiring.clear()
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread:
+            thread.join(timeout=1.0)
+        for worker in workers:
+            worker.close()
+
+    def _ensure_thread(self):
+        """启动分发线程（持有锁时调用）"""
+        self._closed = False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CommandRunner", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def stats(self) -> dict:
+        """获取执行统计"""
+        with self._cond:
+            return {
+                "launched": self.launched,
+                "shell_runs": self.shell_runs,
+                "reaped": self.reaped,
+                "timed_out": self.timed_out,
+                "recycled_shells": self.recycled,
+                "running_children": len(self._children),
+                "launching_children": self._launching(),
+                "busy_shells": len(self._pool) - len(self._idle) + len(self._retiring),
+            }
+
+    # ---- 分发线程 ----
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    spawn = self._shell_used and len(self._pool) + len(self._retiring) < self.workers
+                    command = None if spawn else self._next_command()
+                    if spawn or command is not None:
+                        break
+                    self._cond.wait()
+                worker = self._idle.pop() if command is not None and command.argv is None else None
+
+            if spawn:
+                self._spawn_worker()
+            elif worker is not None:
+                self._run_in_shell(worker, command)
+            else:
+                self._launch(command)
+
+    def _next_command(self) -> Optional[PreparedCommand]:
+        """取出一条能立即执行的命令（持有锁时调用），直接启动的命令不等待 shell"""
+        if self._argv_pending:
+            if self._launching() < self.max_children:
+                self._argv_deferred = False
+                return self._argv_pending.popleft()
+            if not self._argv_deferred:
+                self._argv_deferred = True
+                print(f"[命令] 刚启动的进程已达上限 {self.max_children}，"
+                      f"{len(self._argv_pending)} 条命令稍后执行")
+                get_scheduler().call_later(self.HANDOFF, self._wake)
+        if self._shell_pending:
+            self._shell_used = True
+            if self._idle:
+                self._shell_deferred = False
+                return self._shell_pending.popleft()
+            if not self._shell_deferred and len(self._pool) + len(self._retiring) >= self.workers:
+                self._shell_deferred = True
+                print(f"[命令] {self.workers} 个 shell 都在执行命令，{len(self._shell_pending)} 条命令稍后执行")
+        return None
+
+    def _spawn_worker(self):
+        try:
+            worker = _ShellWorker(self)
+        except OSError as e:
+            print(f"[命令] 启动常驻 shell 失败: {e}")
+            with self._cond:
+                self._shell_used = False  # 不再重试，等待下一条 shell 命令
+            return
+        with self._cond:
+            self._pool.add(worker)
+            self._idle.append(worker)
+
+    def _run_in_shell(self, worker: _ShellWorker, command: PreparedCommand):
+        print(f"[执行器] 执行命令: {command.text}")
+        try:
+            token = worker.run(command.text)
+        except OSError as e:
+            print(f"[命令] 写入 shell 失败: {e}")
+            return
+        with self._cond:
+            self.shell_runs += 1
+        if SHELL_STATE_RE is not None and SHELL_STATE_RE.search(command.text):
+            # cmd 不能在命令之间还原环境变量：执行完这条命令后换用新的 shell
+            self._retire_worker(worker)
+        if self.shell_timeout:
+            get_scheduler().call_later(self.shell_timeout, self._expire_worker, worker, token)
+
+    def _launch(self, command: PreparedCommand):
+        kwargs = {} if sys.platform == 'win32' else {'start_new_session': True}
+        try:
+            proc = subprocess.Popen(command.argv, **kwargs)
+        except OSError as e:
+            print(f"[命令] 启动失败: {command.text} ({e})")
+            return
+        with self._cond:
+            self.launched += 1
+            self._children[proc] = time.monotonic()
+            if self._reap_timer is None:
+                self._reap_timer = get_scheduler().call_later(self.REAP_INTERVAL, self._reap_tick)
+        print(f"[执行器] 执行命令: {command.text}")
+        if self.timeout:
+            get_scheduler().call_later(self.timeout, self._expire_child, proc)
+
+    # ---- 回收与超时（调度线程 / shell 读取线程） ----
+
+    def _launching(self) -> int:
+        """仍计入并发上限的子进程数：启动不足 HANDOFF 秒且未退出（持有锁时调用）"""
+        self._reap()
+        now = time.monotonic()
+        return sum(1 for started in self._children.values() if now - started < self.HANDOFF)
+
+    def _reap(self):
+        """回收已退出的子进程（持有锁时调用）"""
+        done = [proc for proc in self._children if proc.poll() is not None]
+        for proc in done:
+            del self._children[proc]
+        self.reaped += len(done)
+        if done:
+            self._cond.notify()
+
+    def _wake(self):
+        """启动阶段结束，唤醒分发线程继续启动等待中的命令（调度线程）"""
+        with self._cond:
+            self._argv_deferred = False
+            self._cond.notify()
+
+    def _reap_tick(self):
+        with self._cond:
+            self._reap()
+            if self._children:
+                self._reap_timer = get_scheduler().call_later(self.REAP_INTERVAL, self._reap_tick)
+            else:
+                self._reap_timer = None
+
+    def _expire_child(self, proc: subprocess.Popen):
+        if proc.poll() is None:
+            print(f"[命令] 进程 {proc.pid} 超时，已结束")
+            _kill_tree(proc)
+            with self._cond:
+                self.timed_out += 1
+
+    def _expire_worker(self, worker: _ShellWorker, token: int):
+        if worker.token == token and worker.command is not None:
+            print(f"[命令] 命令超时，结束 shell: {worker.command}")
+            _kill_tree(worker.proc)
+            with self._cond:
+                self.timed_out += 1
+
+    def _retire_worker(self, worker: _ShellWorker):
+        """把 shell 移出池，执行完当前命令后退出；退出之前仍计入 shell 数，之后由分发线程启动新的 shell"""
+        with self._cond:
+            if worker not in self._pool:
+                return
+            self._pool.discard(worker)
+            if worker in self._idle:
+                self._idle.remove(worker)
+            self._retiring.add(worker)
+            self.recycled += 1
+        worker.close()
+
+    def _worker_idle(self, worker: _ShellWorker):
+        with self._cond:
+            if worker in self._pool:
+                self._idle.append(worker)
+                self._cond.notify()
+
+    def _worker_exited(self, worker: _ShellWorker):
+        with self._cond:
+            self._pool.discard(worker)
+            self._retiring.discard(worker)
+            if worker in self._idle:
+                self._idle.remove(worker)
+            self._cond.notify()
+
+
+_command_runner: Optional[CommandRunner] = None
+_command_runner_lock = threading.Lock()
+
+
+def get_command_runner() -> CommandRunner:
+    """获取进程内共享的命令执行器"""
+    global _command_runner
+    if _command_runner is None:
+        with _command_runner_lock:
+            if _command_runner is None:
+                _command_runner = CommandRunner()
+    return _command_runner
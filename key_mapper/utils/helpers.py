@@ -5,7 +5,33 @@
 """
 
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+# 修饰键位掩码：源键 "ctrl+shift+f16" 解析为 (CTRL | SHIFT, "f16")
+MODIFIER_BITS = {'ctrl': 0x1, 'alt': 0x2, 'shift': 0x4, 'win': 0x8}
+MODIFIER_ALIASES = {'control': 'ctrl', 'windows': 'win', 'cmd': 'win', 'super': 'win'}
+MODIFIER_MASKS = 16  # 修饰键组合总数
+
+
+def split_modifiers(key_str: str) -> Tuple[int, str]:
+    """拆分修饰键与主键，返回 (修饰键掩码, 主键名)；主键本身是修饰键时掩码为 0"""
+    parts = [p.strip() for p in key_str.lower().split('+') if p.strip()]
+    if not parts:
+        return 0, ""
+    mask = 0
+    for part in parts[:-1]:
+        name = MODIFIER_ALIASES.get(part, part)
+        if name not in MODIFIER_BITS:
+            raise ValueError(f"未知的修饰键: {part}")
+        mask |= MODIFIER_BITS[name]
+    return mask, parts[-1]
+
+
+def join_modifiers(mask: int, key: str) -> str:
+    """按固定顺序拼接修饰键与主键，如 (CTRL | SHIFT, 'f16') -> 'ctrl+shift+f16'"""
+    parts = [name for name, bit in MODIFIER_BITS.items() if mask & bit]
+    parts.append(key)
+    return '+'.join(parts)
 
 
 def validate_key_string(key_str: str) -> bool:
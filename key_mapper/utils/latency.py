@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+输入延迟统计
+记录从钩子入口到动作注入、从模式切换到圆盘重绘的耗时直方图
+"""
+
+import json
+import threading
+import time
+from array import array
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """固定大小的对数分桶直方图（纳秒）
+
+    每个 2 的幂区间再细分为 4 个子桶，相对误差不超过 25%，
+    共 256 个桶覆盖全部 64 位取值，记录一次只需几次整数运算。
+    """
+
+    SUB_BITS = 2
+    SUB_COUNT = 1 << SUB_BITS
+    BUCKETS = 64 * SUB_COUNT
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls.SUB_COUNT:
+            return value
+        exp = value.bit_length() - 1
+        sub = (value >> (exp - cls.SUB_BITS)) & (cls.SUB_COUNT - 1)
+        return exp * cls.SUB_COUNT + sub
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        if index < cls.SUB_COUNT:
+            return index
+        exp, sub = divmod(index, cls.SUB_COUNT)
+        return ((cls.SUB_COUNT + sub + 1) << (exp - cls.SUB_BITS)) - 1
+
+    def record(self, value_ns: int):
+        """记录一个耗时样本"""
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[self._index(value_ns)] += 1
+        self.count += 1
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, p: float) -> int:
+        """获取百分位数（桶上界，纳秒）"""
+        if self.count == 0:
+            return 0
+        rank = max(1, int(self.count * p / 100.0 + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """统计摘要（微秒）"""
+        return {
+            "count": self.count,
+            "p50_us": self.percentile(50) / 1000.0,
+            "p95_us": self.percentile(95) / 1000.0,
+            "p99_us": self.percentile(99) / 1000.0,
+            "max_us": self.max / 1000.0,
+        }
+
+
+class LatencyStats:
+    """延迟统计 - 按阶段和动作类型分组的直方图
+
+    阶段:
+        lookup: 钩子入口 -> 映射查找完成
+        queue_wait: 钩子入口 -> 开始执行动作
+        execute: 动作执行耗时
+        total: 钩子入口 -> 动作执行完成
+        mode_switch: 模式切换热键 -> 圆盘重绘完成
+
+    未启用时各探针只做一次布尔判断。
+    """
+
+    STAGES = ("lookup", "queue_wait", "execute", "total", "mode_switch")
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {stage: {} for stage in self.STAGES}
+        self._pending_switch_ns = 0  # 尚未重绘完成的模式切换时间戳
+
+    def record(self, stage: str, action_type: str, value_ns: int):
+        """记录一个阶段耗时"""
+        group = self._histograms[stage]
+        histogram = group.get(action_type)
+        if histogram is None:
+            histogram = group.setdefault(action_type, LatencyHistogram())
+        histogram.record(value_ns)
+
+    def begin_mode_switch(self):
+        """模式切换热键触发时调用"""
+        if self.enabled:
+            self._pending_switch_ns = time.perf_counter_ns()
+
+    def end_mode_switch(self):
+        """圆盘重绘完成时调用"""
+        start = self._pending_switch_ns
+        if start:
+            self._pending_switch_ns = 0
+            self.record("mode_switch", "mode_switch", time.perf_counter_ns() - start)
+
+    def reset(self):
+        """清空所有统计"""
+        self._histograms = {stage: {} for stage in self.STAGES}
+        self._pending_switch_ns = 0
+
+    def snapshot(self) -> dict:
+        """获取所有统计摘要"""
+        return {
+            stage: {action_type: h.summary() for action_type, h in group.items()}
+            for stage, group in self._histograms.items()
+            if group
+        }
+
+    def format_summary(self) -> str:
+        """格式化为可读文本"""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "暂无延迟数据" if self.enabled else "延迟统计未启用"
+        lines = []
+        for stage, group in snapshot.items():
+            for action_type, s in group.items():
+                lines.append(f"{stage}/{action_type}: n={s['count']} "
+                             f"p50={s['p50_us']:.0f}us p95={s['p95_us']:.0f}us "
+                             f"p99={s['p99_us']:.0f}us max={s['max_us']:.0f}us")
+        return "\n".join(lines)
+
+    def dump_json(self, path: str):
+        """导出统计到 JSON 文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+_latency_stats: Optional[LatencyStats] = None
+_latency_lock = threading.Lock()
+
+
+def get_latency_stats() -> LatencyStats:
+    """获取进程内共享的延迟统计"""
+    global _latency_stats
+    if _latency_stats is None:
+        with _latency_lock:
+            if _latency_stats is None:
+                _latency_stats = LatencyStats()
+    return _latency_stats
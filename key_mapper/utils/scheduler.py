@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+共享定时调度器
+所有短延时任务共用一个调度线程，避免每个定时任务各开一个线程
+"""
+
+import sys
+import threading
+import time
+from typing import Callable, Optional, Set
+
+from .timer_wheel import TimerWheel, WheelTimer
+
+TimerHandle = WheelTimer  # 定时任务句柄
+
+
+class Scheduler:
+    """单线程定时调度器 - 基于分层时间轮
+
+    添加和取消任务为 O(1)；没有任务时调度线程在条件变量上无限期等待。
+    普通任务在条件变量上等到到期时间；用 call_precise 添加的任务在最后 SPIN_THRESHOLD 秒
+    释放锁后自旋，使到期误差在亚毫秒级（宏的延时步骤）。
+    Windows 上只在 HIGH_RES_WINDOW 秒内有任务到期时把系统计时器精度提高到 1ms，
+    队列空闲或下一个任务还很远时恢复，不长期提高整个系统的时钟中断频率。
+    """
+
+    SPIN_THRESHOLD = 0.002  # 精确任务自旋等待的时长（秒）
+    HIGH_RES_WINDOW = 0.1  # 下一个任务在多久之内到期时提高系统计时器精度（秒）
+
+    def __init__(self, name: str = "Scheduler"):
+        self.name = name
+        self._wheel = TimerWheel()
+        self._cond = threading.Condition(self._wheel.lock)
+        self._wakeup = float('inf')  # 调度线程当前预定的唤醒时间
+        self._thread: Optional[threading.Thread] = None
+        self._precise: Set[TimerHandle] = set()  # 待执行的精确任务
+        self._high_res = False  # 是否已提高系统计时器精度
+
+    def call_later(self, delay: float, func: Callable, *args) -> TimerHandle:
+        """
+        在 delay 秒后于调度线程中执行 func(*args)，到期误差约 1ms
+
+        Returns:
+            TimerHandle: 可用于取消的任务句柄
+        """
+        return self._schedule(delay, func, args, False)
+
+    def call_precise(self, delay: float, func: Callable, *args) -> TimerHandle:
+        """
+        在 delay 秒后于调度线程中执行 func(*args)，临近到期时自旋等待，误差在亚毫秒级
+
+        Returns:
+            TimerHandle: 可用于取消的任务句柄
+        """
+        return self._schedule(delay, func, args, True)
+
+    def _schedule(self, delay: float, func: Callable, args: tuple, precise: bool) -> TimerHandle:
+        with self._cond:
+            handle = self._wheel.schedule(delay, func, *args)
+            if precise:
+                handle.precise = True
+                self._precise.add(handle)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif handle.when < self._wakeup:
+                # 新任务早于调度线程预定的唤醒时间，唤醒它重新计算
+                self._cond.notify()
+        return handle
+
+    def _next_precise(self) -> Optional[float]:
+        """最早的待执行精确任务的到期时间（持有锁时调用），顺便清理已取消的任务"""
+        cancelled = [handle for handle in self._precise if handle.cancelled]
+        self._precise.difference_update(cancelled)
+        return min((handle.when for handle in self._precise), default=None)
+
+    def _set_high_resolution(self, enabled: bool):
+        """提高或恢复系统计时器精度（仅 Windows），否则条件变量等待的粒度约为 15ms"""
+        if enabled == self._high_res or sys.platform != 'win32':
+            return
+        import ctypes
+        if enabled:
+            ctypes.windll.winmm.timeBeginPeriod(1)
+        else:
+            ctypes.windll.winmm.timeEndPeriod(1)
+        self._high_res = enabled
+
+    def _run(self):
+        """调度线程主循环"""
+        wheel = self._wheel
+        while True:
+            with self._cond:
+                while True:
+                    now = time.perf_counter()
+                    due = wheel.advance(now)
+                    if due:
+                        break
+                    expiry = wheel.next_expiry()
+                    if expiry is None:
+                        self._wakeup = float('inf')
+                        self._set_high_resolution(False)
+                        self._cond.wait()
+                        continue
+                    self._wakeup = expiry
+                    remaining = expiry - now
+                    if remaining > self.HIGH_RES_WINDOW:
+                        # 下一个任务还很远：恢复系统计时器精度，临近时再提高
+                        self._set_high_resolution(False)
+                        self._cond.wait(remaining - self.HIGH_RES_WINDOW)
+                        continue
+                    self._set_high_resolution(True)
+                    precise_at = self._next_precise()
+                    if precise_at is None or precise_at > expiry:
+                        self._cond.wait(remaining)  # 下一个到期的是普通任务，不自旋
+                        continue
+                    if remaining <= self.SPIN_THRESHOLD:
+                        break  # 精确任务临近到期，释放锁后自旋
+                    self._cond.wait(remaining - self.SPIN_THRESHOLD)
+                self._wakeup = now
+
+            if not due:
+                while time.perf_counter() < expiry:
+                    time.sleep(0)
+                continue
+
+            # 时间轮按刻度取出任务（可能提前不足一个刻度），等到到期时间再执行
+            for handle in due:
+                if handle.precise:
+                    with self._cond:
+                        self._precise.discard(handle)
+                    while time.perf_counter() < handle.when:
+                        time.sleep(0)
+                else:
+                    delay = handle.when - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                if handle.cancelled:
+                    continue
+                try:
+                    handle.func(*handle.args)
+                except Exception as e:
+                    print(f"[调度器] 定时任务执行失败: {e}")
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """获取进程内共享的调度器"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+    return _scheduler
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+分层时间轮
+所有界面和输入超时共用的定时器结构：添加、取消、重新设置均为 O(1)，
+没有待执行的定时器时驱动方不需要任何唤醒
+"""
+
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+
+WHEEL_BITS = 6  # 每层 64 个槽
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4  # 1ms 刻度下可覆盖约 4.6 小时，更远的定时器在顶层循环
+
+
+class WheelTimer:
+    """时间轮定时器句柄"""
+
+    __slots__ = ('when', 'func', 'args', 'cancelled', 'precise', 'tick', '_wheel', '_slot', '_level')
+
+    def __init__(self, when: float, func: Callable, args: tuple):
+        self.when = when  # 到期时间 (time.perf_counter)
+        self.func = func
+        self.args = args
+        self.cancelled = False
+        self.precise = False  # 是否需要亚毫秒级的到期精度（驱动方自旋等待）
+        self.tick = 0  # 到期刻度
+        self._wheel: Optional["TimerWheel"] = None
+        self._slot: Optional[dict] = None  # 所在槽，已取出时为 None
+        self._level = -1  # 所在层，-1 表示添加时已到期
+
+    def cancel(self):
+        """取消定时器（已到期的定时器取消无效果）"""
+        self.cancelled = True
+        if self._wheel is not None:
+            self._wheel.discard(self)
+
+
+class TimerWheel:
+    """分层时间轮
+
+    不自带线程，由驱动方（调度线程或 Tk 适配器）调用 advance 取出到期的定时器，
+    并按 next_expiry 决定下一次唤醒时间。到期按刻度判断，定时器可能提前不足一个刻度取出，
+    需要精确时间的驱动方自行等到 WheelTimer.when。
+    """
+
+    def __init__(self, tick: float = 0.001):
+        self.tick = tick  # 刻度（秒）
+        self.lock = threading.RLock()
+        self._origin = time.perf_counter()
+        self._tick = 0  # 已处理到的刻度
+        self._levels = [[{} for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)]
+        self._counts = [0] * WHEEL_LEVELS  # 每层的定时器数
+        self._due: dict = {}  # 添加时已经到期的定时器
+        self.pending = 0  # 待执行的定时器总数
+
+    def schedule(self, delay: float, func: Callable, *args) -> WheelTimer:
+        """添加定时器，delay 秒后到期"""
+        timer = WheelTimer(time.perf_counter() + max(0.0, delay), func, args)
+        with self.lock:
+            timer._wheel = self
+            self._insert(timer)
+        return timer
+
+    def reschedule(self, timer: WheelTimer, delay: float) -> WheelTimer:
+        """重新设置定时器的到期时间（已到期或已取消的定时器会重新加入）"""
+        with self.lock:
+            self.discard(timer)
+            timer.when = time.perf_counter() + max(0.0, delay)
+            timer.cancelled = False
+            timer._wheel = self
+            self._insert(timer)
+        return timer
+
+    def discard(self, timer: WheelTimer):
+        """从时间轮中移除定时器"""
+        with self.lock:
+            slot = timer._slot
+            if slot is not None and timer in slot:
+                del slot[timer]
+                timer._slot = None
+                self.pending -= 1
+                if timer._level >= 0:
+                    self._counts[timer._level] -= 1
+
+    @staticmethod
+    def _slot_index(tick: int, level: int) -> int:
+        return (tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+
+    def _insert(self, timer: WheelTimer):
+        """按剩余刻度放入对应层的槽"""
+        timer.tick = int((timer.when - self._origin) / self.tick)
+        delta = timer.tick - self._tick
+        self.pending += 1
+        if delta <= 0:
+            slot = self._due
+            level = -1
+        else:
+            level = 0
+            while level < WHEEL_LEVELS - 1 and delta >= 1 << (WHEEL_BITS * (level + 1)):
+                level += 1
+            tick = min(timer.tick, self._tick + (1 << (WHEEL_BITS * WHEEL_LEVELS)) - 1)
+            slot = self._levels[level][self._slot_index(tick, level)]
+            self._counts[level] += 1
+        slot[timer] = None
+        timer._slot = slot
+        timer._level = level
+
+    def _take(self, slot: dict, level: int) -> List[WheelTimer]:
+        """取出一个槽中的所有定时器"""
+        timers = list(slot)
+        slot.clear()
+        self._counts[level] -= len(timers)
+        self.pending -= len(timers)
+        for timer in timers:
+            timer._slot = None
+        return timers
+
+    def advance(self, now: Optional[float] = None) -> List[WheelTimer]:
+        """推进到 now，返回到期的定时器（按到期时间排序）"""
+        if now is None:
+            now = time.perf_counter()
+        target = int((now - self._origin) / self.tick + 1e-6)  # 容忍浮点误差，next_expiry 返回的时间必须能推进到该刻度
+        expired: List[WheelTimer] = []
+        with self.lock:
+            if self._due:
+                expired.extend(self._due)
+                for timer in self._due:
+                    timer._slot = None
+                self.pending -= len(self._due)
+                self._due.clear()
+
+            while self._tick < target:
+                if not self.pending:
+                    self._tick = target
+                    break
+                # 低层为空时直接跳到下一个需要降级的刻度
+                empty = 0
+                while empty < WHEEL_LEVELS - 1 and not self._counts[empty]:
+                    empty += 1
+                if empty:
+                    span = WHEEL_BITS * empty
+                    next_tick = ((self._tick >> span) + 1) << span
+                    if next_tick > target:
+                        self._tick = target
+                        break
+                    self._tick = next_tick
+                else:
+                    self._tick += 1
+
+                # 高层槽在对应的块开始时降级
+                for level in range(1, WHEEL_LEVELS):
+                    if self._tick & ((1 << (WHEEL_BITS * level)) - 1):
+                        break
+                    slot = self._levels[level][self._slot_index(self._tick, level)]
+                    for timer in self._take(slot, level):
+                        self._insert(timer)
+
+                slot = self._levels[0][self._tick & WHEEL_MASK]
+                if slot:
+                    expired.extend(self._take(slot, 0))
+                if self._due:
+                    # 降级时已到期的定时器（顶层循环的定时器）
+                    expired.extend(self._due)
+                    for timer in self._due:
+                        timer._slot = None
+                    self.pending -= len(self._due)
+                    self._due.clear()
+
+        expired.sort(key=lambda t: t.when)
+        return expired
+
+    def next_expiry(self) -> Optional[float]:
+        """下一次需要调用 advance 的时间 (time.perf_counter)，没有定时器时返回 None"""
+        with self.lock:
+            if not self.pending:
+                return None
+            if self._due:
+                return self._origin + self._tick * self.tick
+
+            best = None
+            if self._counts[0]:
+                for offset in range(1, WHEEL_SLOTS + 1):
+                    if self._levels[0][(self._tick + offset) & WHEEL_MASK]:
+                        best = self._tick + offset
+                        break
+            for level in range(1, WHEEL_LEVELS):
+                if not self._counts[level]:
+                    continue
+                span = WHEEL_BITS * level
+                block = self._tick >> span
+                for offset in range(1, WHEEL_SLOTS + 1):
+                    if self._levels[level][(block + offset) & WHEEL_MASK]:
+                        tick = (block + offset) << span
+                        if best is None or tick < best:
+                            best = tick
+                        break
+            return None if best is None else self._origin + best * self.tick
+
+
+class TkTimerService:
+    """时间轮的 Tk 适配器 - 所有界面定时器共用一个 after 回调
+
+    只在有待执行的定时器时预约一次 after，最近的定时器变化时重新预约，
+    定时器回调在 Tk 线程中执行；所有方法也只应在 Tk 线程中调用。
+    """
+
+    def __init__(self, root, tick: float = 0.001):
+        self.root = root
+        self.wheel = TimerWheel(tick)
+        self._after_id = None
+        self._armed_at: Optional[float] = None  # 已预约的唤醒时间
+
+    def call_later(self, delay: float, func: Callable, *args) -> WheelTimer:
+        """delay 秒后在 Tk 线程中执行 func(*args)"""
+        timer = self.wheel.schedule(delay, func, *args)
+        self._arm()
+        return timer
+
+    def reschedule(self, timer: Optional[WheelTimer], delay: float, func: Callable, *args) -> WheelTimer:
+        """重新设置定时器；timer 为 None 时新建"""
+        if timer is None:
+            return self.call_later(delay, func, *args)
+        timer.func, timer.args = func, args
+        self.wheel.reschedule(timer, delay)
+        self._arm()
+        return timer
+
+    def _arm(self):
+        """按最近的到期时间预约 after"""
+        expiry = self.wheel.next_expiry()
+        if expiry is None or (self._armed_at is not None and self._armed_at <= expiry):
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        delay_ms = max(0, math.ceil((expiry - time.perf_counter()) * 1000))
+        self._armed_at = expiry
+        self._after_id = self.root.after(delay_ms, self._on_tick)
+
+    def _on_tick(self):
+        self._after_id = None
+        self._armed_at = None
+        for timer in self.wheel.advance():
+            if timer.cancelled:
+                continue
+            try:
+                timer.func(*timer.args)
+            except Exception as e:
+                print(f"[定时器] 界面定时任务执行失败: {e}")
+        self._arm()
+
+
+_ui_timers: Optional[TkTimerService] = None
+
+
+def install_ui_timers(root) -> TkTimerService:
+    """为主 Tk 根窗口创建界面定时器服务"""
+    global _ui_timers
+    _ui_timers = TkTimerService(root)
+    return _ui_timers
+
+
+def get_ui_timers() -> Optional[TkTimerService]:
+    """获取界面定时器服务（主窗口创建之前为 None）"""
+    return _ui_timers
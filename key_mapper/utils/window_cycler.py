@@ -1,35 +1,41 @@
 # -*- coding: utf-8 -*-
 """
 窗口循环切换器
-使用 Windows API 实现真正的窗口遍历功能
+使用 Windows API 实现真正的窗口遍历功能，窗口列表来自事件驱动的增量窗口索引
 """
 
 import ctypes
 import ctypes.wintypes as wintypes
-from typing import List, Dict, Optional
+import threading
+from typing import Callable, List, Dict, Optional
 from comtypes import GUID, COMMETHOD
 from ctypes import POINTER, c_int, HRESULT
 import comtypes.client
 
-
-class WindowInfo:
-    """窗口信息"""
-    def __init__(self, hwnd: int, title: str):
-        self.hwnd = hwnd
-        self.title = title
-
-    def __repr__(self):
-        return f"Window(hwnd={self.hwnd}, title='{self.title}')"
+from .scheduler import get_scheduler
+from .window_filter import WindowFilter
+from .window_index import Win32WindowEventSource, WindowIndex, WindowInfo, WindowQuery
 
 
 class WindowCycler:
     """窗口循环切换器 - 实现真正的窗口遍历而非 Alt+Tab 来回切换"""
 
-    def __init__(self):
+    CONFIRM_AFTER = 0.15  # 激活后多久确认窗口已到前台（秒）
+
+    def __init__(self, window_filter: Optional[WindowFilter] = None, dispatch: Optional[Callable] = None):
         self.windows: List[WindowInfo] = []
+        # 延时确认前台时用 dispatch 交回执行线程（默认在调度线程中直接调用）
+        self.dispatch: Callable = dispatch or (lambda func, *args: func(*args))
         self.current_index = 0
         self._init_windows_api()
-        self._init_virtual_desktop_manager()
+        # COM 对象只能在创建它的线程中使用：每个调用线程各自初始化 COM 和虚拟桌面管理器
+        self._com = threading.local()
+        # 增量窗口索引：虚拟桌面查询在调用切换的线程中进行
+        self.index = WindowIndex(
+            Win32WindowEventSource(self._is_window_on_current_desktop),
+            window_filter or WindowFilter()
+        )
+        self.index.start()
 
     def _init_windows_api(self):
         """初始化 Windows API 函数"""
@@ -52,8 +58,15 @@ class WindowCycler:
         self.SW_RESTORE = 9  # 恢复窗口
         self.SW_SHOW = 5  # 显示窗口
 
+    @property
+    def vd_manager(self):
+        """当前线程的虚拟桌面管理器（首次在该线程使用时创建），不可用时为 None"""
+        if not hasattr(self._com, "vd_manager"):
+            self._com.vd_manager = self._init_virtual_desktop_manager()
+        return self._com.vd_manager
+
     def _init_virtual_desktop_manager(self):
-        """初始化虚拟桌面管理器"""
+        """在当前线程初始化 COM 并创建虚拟桌面管理器"""
         try:
             # IVirtualDesktopManager 的 CLSID 和 IID
             CLSID_VirtualDesktopManager = GUID("{AA509086-5CA9-4C25-8F95-589D3C07B48A}")
@@ -82,23 +95,25 @@ class WindowCycler:
                               (['in'], POINTER(GUID), 'desktopId')),
                 ]
 
-            self.vd_manager = CoCreateInstance(
+            vd_manager = CoCreateInstance(
                 CLSID_VirtualDesktopManager,
                 interface=IVirtualDesktopManager
             )
-            print("[窗口切换器] 虚拟桌面管理器已初始化")
+            print(f"[窗口切换器] 虚拟桌面管理器已初始化 ({threading.current_thread().name})")
+            return vd_manager
         except Exception as e:
             print(f"[窗口切换器] 无法初始化虚拟桌面管理器: {e}")
-            self.vd_manager = None
+            return None
 
     def _is_window_on_current_desktop(self, hwnd: int) -> bool:
         """检查窗口是否在当前虚拟桌面上"""
-        if not self.vd_manager:
+        vd_manager = self.vd_manager
+        if not vd_manager:
             return True  # 如果无法初始化，就不过滤
 
         try:
             on_current = c_int()
-            hr = self.vd_manager.IsWindowOnCurrentVirtualDesktop(hwnd, ctypes.byref(on_current))
+            hr = vd_manager.IsWindowOnCurrentVirtualDesktop(hwnd, ctypes.byref(on_current))
             if hr == 0:  # S_OK
                 return bool(on_current.value)
             else:
@@ -108,35 +123,8 @@ class WindowCycler:
             return True  # 出错时保留窗口
 
     def refresh_windows(self):
-        """刷新可见窗口列表"""
-        self.windows = []
-
-        def enum_handler(hwnd, ctx):
-            # 只处理可见且有标题的窗口
-            if self.IsWindowVisible(hwnd):
-                length = self.GetWindowTextLengthW(hwnd)
-                if length > 0:
-                    # 获取窗口标题
-                    title = ctypes.create_unicode_buffer(length + 1)
-                    self.GetWindowTextW(hwnd, title, length + 1)
-
-                    # 过滤掉某些系统窗口
-                    title_str = title.value
-                    if self._should_include_window(hwnd, title_str):
-                        # 检查窗口是否在当前虚拟桌面
-                        if self._is_window_on_current_desktop(hwnd):
-                            self.windows.append(WindowInfo(hwnd, title_str))
-            return True
-
-        # 定义回调函数类型
-        EnumWindowsProc = ctypes.WINFUNCTYPE(
-            wintypes.BOOL,
-            wintypes.HWND,
-            wintypes.LPARAM
-        )
-
-        # 枚举所有顶层窗口
-        self.EnumWindows(EnumWindowsProc(enum_handler), 0)
+        """刷新可见窗口列表（从窗口索引读取，不枚举窗口）"""
+        self.windows = self.index.windows()
 
         # 更新当前窗口索引
         fg_hwnd = self.GetForegroundWindow()
@@ -145,98 +133,58 @@ class WindowCycler:
                 self.current_index = i
                 break
 
-        print(f"[窗口切换器] 发现 {len(self.windows)} 个窗口")
-
-    def _should_include_window(self, hwnd: int, title: str) -> bool:
-        """判断是否应该包含此窗口"""
-        # 过滤掉空标题或特定系统窗口
-        exclude_titles = [
-            "Program Manager",  # Windows 桌面
-            "Windows Input Experience",  # 输入法面板
-            "Microsoft Text Input Application",  # 微软输入法
-        ]
+    def set_filter(self, window_filter: Optional[WindowFilter]):
+        """更换窗口过滤规则"""
+        self.index.set_filter(window_filter or WindowFilter())
 
-        # 过滤掉包含特定关键词的窗口标题
-        exclude_keywords = [
-            "Overlay",  # 各种覆盖层窗口
-            "ToastWindow",  # 通知窗口
-        ]
-
-        # 排除特定标题
-        if title in exclude_titles:
-            return False
+    def switch_next(self) -> Optional[WindowInfo]:
+        """
+        切换到下一个窗口（最近使用顺序）
 
-        # 排除包含关键词的标题
-        for keyword in exclude_keywords:
-            if keyword in title:
-                return False
+        Returns:
+            切换到的窗口信息，如果失败返回 None
+        """
+        return self.jump(1)
 
-        # 可以添加更多过滤规则，比如：
-        # - 过滤掉不可见的窗口
-        # - 过滤掉没有图标的窗口
-        # - 过滤掉特定类名的窗口
+    def switch_prev(self) -> Optional[WindowInfo]:
+        """
+        切换到上一个窗口（最近使用顺序）
 
-        return True
+        Returns:
+            切换到的窗口信息，如果失败返回 None
+        """
+        return self.jump(-1)
 
-    def switch_next(self) -> Optional[WindowInfo]:
+    def jump(self, steps: int) -> Optional[WindowInfo]:
         """
-        切换到下一个窗口
-        使用模拟 Alt+Tab 的方式，更可靠
+        沿最近使用顺序移动 steps 步并只激活一次目标窗口（负数向后）
+        激活后不等待，由调度器稍后把确认交给执行线程
 
         Returns:
             切换到的窗口信息，如果失败返回 None
         """
-        # 使用 keyboard 模拟 Alt+Tab
-        try:
-            import keyboard
-            # 按下 Alt+Tab 切换到下一个窗口
-            keyboard.press('alt')
-            keyboard.press_and_release('tab')
-            keyboard.release('alt')
-
-            # 短暂等待切换完成
-            import time
-            time.sleep(0.1)
-
-            # 获取切换后的窗口信息
-            result = self.get_current_window()
-            if result:
-                print(f"[窗口切换器] 切换到: {result.title}")
-            return result
-        except Exception as e:
-            print(f"[窗口切换器] 切换失败: {e}")
+        win = self.index.jump(steps)
+        if win is None:
+            print("[窗口切换器] 当前桌面没有可切换的窗口")
             return None
+        return self._activate(win)
 
-    def switch_prev(self) -> Optional[WindowInfo]:
+    def jump_to(self, query: WindowQuery) -> Optional[WindowInfo]:
         """
-        切换到上一个窗口
-        使用模拟 Alt+Shift+Tab 的方式，更可靠
+        激活标题或进程名最匹配的窗口（查找索引，不枚举窗口）
 
         Returns:
             切换到的窗口信息，如果失败返回 None
         """
-        # 使用 keyboard 模拟 Alt+Shift+Tab
-        try:
-            import keyboard
-            # 按下 Alt+Shift+Tab 切换到上一个窗口
-            keyboard.press('alt')
-            keyboard.press('shift')
-            keyboard.press_and_release('tab')
-            keyboard.release('shift')
-            keyboard.release('alt')
-
-            # 短暂等待切换完成
-            import time
-            time.sleep(0.1)
-
-            # 获取切换后的窗口信息
-            result = self.get_current_window()
-            if result:
-                print(f"[窗口切换器] 切换到: {result.title}")
-            return result
-        except Exception as e:
-            print(f"[窗口切换器] 切换失败: {e}")
+        win = self.index.find(query)
+        if win is None:
+            print(f"[窗口切换器] 没有匹配的窗口: {query.pattern}")
             return None
+        return self._activate(win)
+
+    def close(self):
+        """停止接收窗口事件"""
+        self.index.stop()
 
     def _activate_current(self) -> Optional[WindowInfo]:
         """
@@ -246,78 +194,85 @@ class WindowCycler:
             激活的窗口信息，如果失败返回 None
         """
         if 0 <= self.current_index < len(self.windows):
-            win = self.windows[self.current_index]
-
-            try:
-                # 如果窗口最小化，先恢复
-                if self.IsIconic(win.hwnd):
-                    self.ShowWindow(win.hwnd, self.SW_RESTORE)
-                else:
-                    self.ShowWindow(win.hwnd, self.SW_SHOW)
-
-                # 使用多种方法尝试激活窗口，提高成功率
-                success = False
-
-                # 方法1: 使用 SwitchToThisWindow (最强制的方法)
-                try:
-                    self.SwitchToThisWindow(win.hwnd, True)
-                    success = True
-                except:
-                    pass
-
-                # 方法2: 线程输入附加技巧 + SetForegroundWindow
-                if not success:
-                    try:
-                        # 获取前台窗口的线程ID
-                        fg_hwnd = self.GetForegroundWindow()
-                        fg_thread = self.GetWindowThreadProcessId(fg_hwnd, None)
-                        # 获取目标窗口的线程ID
-                        target_thread = self.GetWindowThreadProcessId(win.hwnd, None)
-                        # 获取当前线程ID
-                        current_thread = self.GetCurrentThreadId()
-
-                        # 附加线程输入
-                        if fg_thread != target_thread:
-                            self.AttachThreadInput(current_thread, fg_thread, True)
-                            self.AttachThreadInput(current_thread, target_thread, True)
-
-                        # 尝试激活
-                        self.BringWindowToTop(win.hwnd)
-                        result = self.SetForegroundWindow(win.hwnd)
-
-                        # 分离线程输入
-                        if fg_thread != target_thread:
-                            self.AttachThreadInput(current_thread, fg_thread, False)
-                            self.AttachThreadInput(current_thread, target_thread, False)
-
-                        if result:
-                            success = True
-                    except Exception as e:
-                        print(f"[窗口切换器] 线程附加方法失败: {e}")
-
-                # 方法3: 简单的 SetForegroundWindow (兜底)
-                if not success:
-                    self.BringWindowToTop(win.hwnd)
-                    result = self.SetForegroundWindow(win.hwnd)
-                    if result:
-                        success = True
-
-                if success:
-                    print(f"[窗口切换器] 切换到: {win.title}")
-                    return win
-                else:
-                    print(f"[窗口切换器] 切换失败: {win.title}")
-                    return None
-
-            except Exception as e:
-                print(f"[窗口切换器] 激活窗口异常: {e}")
-                return None
-
+            return self._activate(self.windows[self.current_index])
         return None
 
+    def _activate(self, win: WindowInfo) -> Optional[WindowInfo]:
+        """
+        请求激活窗口（SwitchToThisWindow，不等待结果）
+
+        Returns:
+            激活的窗口信息，如果失败返回 None
+        """
+        try:
+            # 如果窗口最小化，先恢复
+            if self.IsIconic(win.hwnd):
+                self.ShowWindow(win.hwnd, self.SW_RESTORE)
+            else:
+                self.ShowWindow(win.hwnd, self.SW_SHOW)
+            self.SwitchToThisWindow(win.hwnd, True)
+        except Exception as e:
+            print(f"[窗口切换器] 激活窗口异常: {e}")
+            return None
+
+        # 不等待前台事件，连续切换时从新窗口继续
+        self.index.set_foreground(win.hwnd)
+        get_scheduler().call_later(self.CONFIRM_AFTER, self.dispatch, self._confirm, win)
+        print(f"[窗口切换器] 切换到: {win.title}")
+        return win
+
+    def _confirm(self, win: WindowInfo):
+        """确认窗口已到前台（执行线程），否则用线程输入附加的方式再试一次"""
+        current = self.index.foreground()
+        if current is None or current.hwnd != win.hwnd:
+            return  # 窗口已关闭或之后又切换到了其他窗口
+        if self.GetForegroundWindow() == win.hwnd:
+            return
+        if self._force_foreground(win):
+            print(f"[窗口切换器] 已强制切换到: {win.title}")
+        else:
+            print(f"[窗口切换器] 切换失败: {win.title}")
+
+    def _force_foreground(self, win: WindowInfo) -> bool:
+        """线程输入附加技巧 + SetForegroundWindow，失败时直接 SetForegroundWindow"""
+        try:
+            # 获取前台窗口的线程ID
+            fg_hwnd = self.GetForegroundWindow()
+            fg_thread = self.GetWindowThreadProcessId(fg_hwnd, None)
+            # 获取目标窗口的线程ID
+            target_thread = self.GetWindowThreadProcessId(win.hwnd, None)
+            # 获取当前线程ID
+            current_thread = self.GetCurrentThreadId()
+
+            # 附加线程输入
+            if fg_thread != target_thread:
+                self.AttachThreadInput(current_thread, fg_thread, True)
+                self.AttachThreadInput(current_thread, target_thread, True)
+
+            # 尝试激活
+            self.BringWindowToTop(win.hwnd)
+            result = self.SetForegroundWindow(win.hwnd)
+
+            # 分离线程输入
+            if fg_thread != target_thread:
+                self.AttachThreadInput(current_thread, fg_thread, False)
+                self.AttachThreadInput(current_thread, target_thread, False)
+
+            if result:
+                return True
+        except Exception as e:
+            print(f"[窗口切换器] 线程附加方法失败: {e}")
+
+        # 简单的 SetForegroundWindow (兜底)
+        self.BringWindowToTop(win.hwnd)
+        return bool(self.SetForegroundWindow(win.hwnd))
+
     def get_current_window(self) -> Optional[WindowInfo]:
         """获取当前活动窗口信息"""
         fg_hwnd = self.GetForegroundWindow()
+        win = self.index.get(fg_hwnd)
+        if win is not None:
+            return win
         if fg_hwnd:
             length = self.GetWindowTextLengthW(fg_hwnd)
             if length > 0:
@@ -328,5 +283,4 @@ class WindowCycler:
 
     def get_window_list(self) -> List[WindowInfo]:
         """获取所有窗口列表"""
-        self.refresh_windows()
-        return self.windows.copy()
+        return self.index.windows()
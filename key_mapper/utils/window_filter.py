@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+窗口过滤规则
+按标题（完整匹配 / 关键词 / 正则）、窗口类名和进程名决定窗口切换时包含哪些窗口。
+规则只编译一次：完整标题、类名、进程名为集合查找，关键词编译为一个 Aho-Corasick 自动机，
+标题正则（不含分组和全局标志时）合并为一个正则表达式，关键词增加到数百条时过滤耗时基本不变
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# 默认规则（原先写死在窗口切换器中）
+DEFAULT_RULES = {
+    "include": {},  # 非空时只包含匹配的窗口
+    "exclude": {
+        "titles": [
+            "Program Manager",  # Windows 桌面
+            "Windows Input Experience",  # 输入法面板
+            "Microsoft Text Input Application",  # 微软输入法
+        ],
+        "keywords": [
+            "Overlay",  # 各种覆盖层窗口
+            "ToastWindow",  # 通知窗口
+        ],
+        "patterns": [],
+        "classes": [],
+        "processes": [],
+    },
+}
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 自动机：一次扫描标题即可判断是否包含任意关键词，耗时与关键词数量无关"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]  # 状态 -> {字符: 下一状态}
+        self._fail: List[int] = [0]  # 失配时回退的状态
+        self._match: List[bool] = [False]  # 到达该状态时是否已包含某个关键词
+        for word in keywords:
+            self._add(word)
+        self._build_fail()
+
+    def _add(self, word: str):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._match.append(False)
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._match[state] = True
+
+    def _build_fail(self):
+        """按广度优先计算失配指针"""
+        goto, fail, match = self._goto, self._fail, self._match
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                back = fail[state]
+                while back and ch not in goto[back]:
+                    back = fail[back]
+                target = goto[back].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                match[nxt] = match[nxt] or match[fail[nxt]]
+
+    def search(self, text: str) -> bool:
+        goto, fail, match = self._goto, self._fail, self._match
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if match[state]:
+                return True
+        return False
+
+
+class RuleSet:
+    """一组编译后的规则，任意一条匹配即为匹配"""
+
+    def __init__(self, rules: Optional[dict] = None):
+        rules = rules or {}
+        self.titles = frozenset(rules.get("titles") or ())  # 完整标题
+        self.classes = frozenset(rules.get("classes") or ())  # 窗口类名
+        self.processes = frozenset(p.lower() for p in rules.get("processes") or ())  # 进程名（不区分大小写）
+        self.errors: List[str] = []
+
+        keywords = [k for k in rules.get("keywords") or () if k]
+        self.keywords = KeywordAutomaton(keywords) if keywords else None  # 标题关键词
+
+        # 不含分组和全局内联标志的正则合并为一个表达式；含 (?i) 等全局标志或分组
+        # （合并后编号的反向引用会错位）的正则单独编译，按顺序逐个匹配
+        parts, self.patterns = [], []
+        for pattern in rules.get("patterns") or ():
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                self.errors.append(f"无效的标题正则 {pattern}: {e}")
+                continue
+            if compiled.groups or compiled.flags != re.UNICODE:
+                self.patterns.append(compiled)
+            else:
+                parts.append(f'(?:{pattern})')
+        self.regex = None  # 可合并的标题正则合并后的表达式
+        if parts:
+            try:
+                self.regex = re.compile('|'.join(parts))
+            except re.error:
+                self.patterns.extend(re.compile(part) for part in parts)
+
+    def __bool__(self):
+        return bool(self.titles or self.keywords or self.regex or self.patterns or self.classes or self.processes)
+
+    def matches(self, source, hwnd: int, title: str) -> bool:
+        """窗口是否匹配；类名和进程名只在有对应规则时才查询"""
+        if title in self.titles:
+            return True
+        if self.keywords is not None and self.keywords.search(title):
+            return True
+        if self.regex is not None and self.regex.search(title):
+            return True
+        for regex in self.patterns:
+            if regex.search(title):
+                return True
+        if self.classes and source.get_class_name(hwnd) in self.classes:
+            return True
+        if self.processes and source.get_process_name(hwnd).lower() in self.processes:
+            return True
+        return False
+
+
+class WindowFilter:
+    """窗口过滤器
+
+    rules 格式同 DEFAULT_RULES："include" 非空时只包含匹配的窗口，之后排除匹配 "exclude" 的窗口。
+    每组规则可包含 titles（完整标题）、keywords（标题关键词）、patterns（标题正则）、
+    classes（窗口类名）、processes（进程名，如 explorer.exe）。
+    """
+
+    def __init__(self, rules: Optional[dict] = None):
+        rules = DEFAULT_RULES if rules is None else rules
+        self.include = RuleSet(rules.get("include"))
+        self.exclude = RuleSet(rules.get("exclude"))
+        self.errors = self.include.errors + self.exclude.errors
+        for error in self.errors:
+            print(f"[窗口过滤] {error}")
+
+    def accepts(self, source, hwnd: int, title: str) -> bool:
+        """窗口是否参与切换"""
+        if self.include and not self.include.matches(source, hwnd, title):
+            return False
+        return not self.exclude.matches(source, hwnd, title)
@@ -0,0 +1,667 @@
+# -*- coding: utf-8 -*-
+"""
+增量窗口索引
+启动时枚举一次顶层窗口，之后只根据窗口创建、销毁、显示隐藏、标题变化和前台切换事件更新索引；
+窗口按最近使用排序，列出窗口和循环切换只查索引，不再每次调用都枚举全部窗口；
+标题和进程名另有三元组索引，按名称跳转窗口只需查找索引
+"""
+
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .window_filter import WindowFilter
+
+# 窗口事件类型
+WINDOW_CREATED = 'created'
+WINDOW_DESTROYED = 'destroyed'
+WINDOW_SHOWN = 'shown'
+WINDOW_HIDDEN = 'hidden'
+TITLE_CHANGED = 'title'
+FOREGROUND = 'foreground'
+DESKTOP_CHANGED = 'desktop'  # 窗口所在的虚拟桌面可能变化（Windows 上为隐藏 / 取消隐藏）
+
+
+class WindowInfo:
+    """窗口信息"""
+    def __init__(self, hwnd: int, title: str, process: str = ""):
+        self.hwnd = hwnd
+        self.title = title
+        self.process = process  # 所属进程的可执行文件名
+
+    def __repr__(self):
+        return f"Window(hwnd={self.hwnd}, title='{self.title}')"
+
+
+class WindowEventSource(ABC):
+    """窗口事件源接口
+
+    start 之后在任意线程调用 callback(事件类型, hwnd)；
+    其余方法为索引按需查询单个窗口的状态。
+    """
+
+    @abstractmethod
+    def start(self, callback: Callable[[str, int], None]):
+        """开始接收窗口事件"""
+
+    def stop(self):
+        pass
+
+    @abstractmethod
+    def enumerate(self) -> Iterable[int]:
+        """当前所有顶层窗口（按 Z 序）"""
+
+    @abstractmethod
+    def is_visible(self, hwnd: int) -> bool:
+        """窗口是否可见"""
+
+    @abstractmethod
+    def get_title(self, hwnd: int) -> str:
+        """窗口标题"""
+
+    def get_class_name(self, hwnd: int) -> str:
+        return ""
+
+    def get_process_name(self, hwnd: int) -> str:
+        """窗口所属进程的可执行文件名（如 explorer.exe）"""
+        return ""
+
+    @abstractmethod
+    def foreground(self) -> int:
+        """前台窗口，没有时为 0"""
+
+    def is_on_current_desktop(self, hwnd: int) -> bool:
+        """窗口是否在当前虚拟桌面上"""
+        return True
+
+
+class Win32WindowEventSource(WindowEventSource):
+    """Windows 窗口事件源：SetWinEventHook（进程外回调）在独立的消息循环线程中接收事件"""
+
+    WM_QUIT = 0x0012
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    GA_ROOT = 2
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    # WinEvent 事件常量 -> 事件类型
+    EVENTS = {
+        0x0003: FOREGROUND,  # EVENT_SYSTEM_FOREGROUND
+        0x8000: WINDOW_CREATED,  # EVENT_OBJECT_CREATE
+        0x8001: WINDOW_DESTROYED,  # EVENT_OBJECT_DESTROY
+        0x8002: WINDOW_SHOWN,  # EVENT_OBJECT_SHOW
+        0x8003: WINDOW_HIDDEN,  # EVENT_OBJECT_HIDE
+        0x800C: TITLE_CHANGED,  # EVENT_OBJECT_NAMECHANGE
+        0x8017: DESKTOP_CHANGED,  # EVENT_OBJECT_CLOAKED
+        0x8018: DESKTOP_CHANGED,  # EVENT_OBJECT_UNCLOAKED
+    }
+    HOOK_RANGES = ((0x0003, 0x0003), (0x8000, 0x8003), (0x800C, 0x800C), (0x8017, 0x8018))
+
+    def __init__(self, desktop_check: Optional[Callable[[int], bool]] = None):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        # 独立的 DLL 实例，设置参数类型不影响其他库
+        self.user32 = ctypes.WinDLL('user32')
+        self.kernel32 = ctypes.WinDLL('kernel32')
+        self.WINEVENTPROC = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        self.ENUMWINDOWSPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+        self.user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, self.WINEVENTPROC,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+        self.user32.GetAncestor.restype = wintypes.HWND
+        self.user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+        self.user32.GetForegroundWindow.restype = wintypes.HWND
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.QueryFullProcessImageNameW.argtypes = [
+            wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+        ]
+        self.kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        self.desktop_check = desktop_check
+        self._callback: Optional[Callable[[str, int], None]] = None
+        self._proc = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        # 窗口的类名和进程不会变化，查询一次后缓存到窗口销毁
+        self._class_names: Dict[int, str] = {}
+        self._process_names: Dict[int, str] = {}
+
+    def start(self, callback: Callable[[str, int], None]):
+        self._callback = callback
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="WindowEvents", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=1.0)
+
+    def stop(self):
+        if self._thread_id:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self, ready: threading.Event):
+        """事件线程：安装事件钩子并运行消息循环（进程外回调在此线程中分发）"""
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        self._proc = self.WINEVENTPROC(self._on_win_event)
+        hooks = [
+            self.user32.SetWinEventHook(low, high, None, self._proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+            for low, high in self.HOOK_RANGES
+        ]
+        ready.set()
+        msg = self._wintypes.MSG()
+        while self.user32.GetMessageW(self._ctypes.byref(msg), None, 0, 0) > 0:
+            self.user32.TranslateMessage(self._ctypes.byref(msg))
+            self.user32.DispatchMessageW(self._ctypes.byref(msg))
+        for hook in hooks:
+            if hook:
+                self.user32.UnhookWinEvent(hook)
+        self._thread_id = 0
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread, time):
+        # 只关心窗口本身（OBJID_WINDOW, CHILDID_SELF）
+        if not hwnd or id_object != 0 or id_child != 0:
+            return
+        kind = self.EVENTS.get(event)
+        if kind is None:
+            return
+        if kind == WINDOW_DESTROYED:
+            self._class_names.pop(hwnd, None)
+            self._process_names.pop(hwnd, None)
+        elif self.user32.GetAncestor(hwnd, self.GA_ROOT) != hwnd:
+            return
+        try:
+            self._callback(kind, hwnd)
+        except Exception as e:
+            print(f"[窗口索引] 处理窗口事件失败: {e}")
+
+    def enumerate(self) -> Iterable[int]:
+        found: List[int] = []
+
+        def enum_handler(hwnd, ctx):
+            found.append(hwnd)
+            return True
+
+        self.user32.EnumWindows(self.ENUMWINDOWSPROC(enum_handler), 0)
+        return found
+
+    def is_visible(self, hwnd: int) -> bool:
+        return bool(self.user32.IsWindowVisible(hwnd))
+
+    def get_title(self, hwnd: int) -> str:
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        if length <= 0:
+            return ""
+        title = self._ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, title, length + 1)
+        return title.value
+
+    def get_class_name(self, hwnd: int) -> str:
+        name = self._class_names.get(hwnd)
+        if name is None:
+            buffer = self._ctypes.create_unicode_buffer(256)
+            self.user32.GetClassNameW(hwnd, buffer, 256)
+            name = self._class_names[hwnd] = buffer.value
+        return name
+
+    def get_process_name(self, hwnd: int) -> str:
+        name = self._process_names.get(hwnd)
+        if name is None:
+            name = self._query_process_name(hwnd)
+            self._process_names[hwnd] = name
+        return name
+
+    def _query_process_name(self, hwnd: int) -> str:
+        pid = self._wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, self._ctypes.byref(pid))
+        handle = self.kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not handle:
+            return ""
+        try:
+            size = self._wintypes.DWORD(260)
+            path = self._ctypes.create_unicode_buffer(size.value)
+            if not self.kernel32.QueryFullProcessImageNameW(handle, 0, path, self._ctypes.byref(size)):
+                return ""
+            return os.path.basename(path.value)
+        finally:
+            self.kernel32.CloseHandle(handle)
+
+    def foreground(self) -> int:
+        return self.user32.GetForegroundWindow() or 0
+
+    def is_on_current_desktop(self, hwnd: int) -> bool:
+        return self.desktop_check(hwnd) if self.desktop_check else True
+
+
+class FakeWindowSource(WindowEventSource):
+    """内存窗口事件源：模拟窗口和虚拟桌面，修改时同步产生与 Windows 相同的事件"""
+
+    def __init__(self):
+        self.windows: Dict[int, dict] = {}  # hwnd -> {title, visible, desktop, class_name, process}
+        self.z_order: List[int] = []
+        self.current_desktop = 0
+        self.foreground_hwnd = 0
+        self.queries = 0  # 被索引查询的次数
+        self._callback: Optional[Callable[[str, int], None]] = None
+        self._next_hwnd = 0x1000
+
+    def start(self, callback: Callable[[str, int], None]):
+        self._callback = callback
+
+    def stop(self):
+        self._callback = None
+
+    def _emit(self, kind: str, hwnd: int):
+        if self._callback:
+            self._callback(kind, hwnd)
+
+    # ---- 模拟操作 ----
+
+    def create(self, title: str, desktop: Optional[int] = None, visible: bool = True,
+               class_name: str = "", process: str = "") -> int:
+        """创建窗口，返回 hwnd"""
+        self._next_hwnd += 4
+        hwnd = self._next_hwnd
+        self.windows[hwnd] = {
+            "title": title,
+            "visible": False,
+            "desktop": self.current_desktop if desktop is None else desktop,
+            "class_name": class_name,
+            "process": process,
+        }
+        self.z_order.insert(0, hwnd)
+        self._emit(WINDOW_CREATED, hwnd)
+        if visible:
+            self.show(hwnd)
+        return hwnd
+
+    def destroy(self, hwnd: int):
+        self.windows.pop(hwnd, None)
+        if hwnd in self.z_order:
+            self.z_order.remove(hwnd)
+        if self.foreground_hwnd == hwnd:
+            self.foreground_hwnd = 0
+        self._emit(WINDOW_DESTROYED, hwnd)
+
+    def show(self, hwnd: int):
+        self.windows[hwnd]["visible"] = True
+        self._emit(WINDOW_SHOWN, hwnd)
+
+    def hide(self, hwnd: int):
+        self.windows[hwnd]["visible"] = False
+        self._emit(WINDOW_HIDDEN, hwnd)
+
+    def set_title(self, hwnd: int, title: str):
+        self.windows[hwnd]["title"] = title
+        self._emit(TITLE_CHANGED, hwnd)
+
+    def activate(self, hwnd: int):
+        self.foreground_hwnd = hwnd
+        self._emit(FOREGROUND, hwnd)
+
+    def move_to_desktop(self, hwnd: int, desktop: int):
+        self.windows[hwnd]["desktop"] = desktop
+        self._emit(DESKTOP_CHANGED, hwnd)
+
+    def switch_desktop(self, desktop: int):
+        """切换虚拟桌面：两个桌面上的窗口各产生一次隐藏 / 取消隐藏事件"""
+        old, self.current_desktop = self.current_desktop, desktop
+        for hwnd, win in list(self.windows.items()):
+            if win["desktop"] in (old, desktop) and old != desktop:
+                self._emit(DESKTOP_CHANGED, hwnd)
+
+    # ---- 查询 ----
+
+    def enumerate(self) -> Iterable[int]:
+        self.queries += 1
+        return list(self.z_order)
+
+    def is_visible(self, hwnd: int) -> bool:
+        self.queries += 1
+        win = self.windows.get(hwnd)
+        return bool(win and win["visible"])
+
+    def get_title(self, hwnd: int) -> str:
+        self.queries += 1
+        win = self.windows.get(hwnd)
+        return win["title"] if win else ""
+
+    def get_class_name(self, hwnd: int) -> str:
+        self.queries += 1
+        win = self.windows.get(hwnd)
+        return win["class_name"] if win else ""
+
+    def get_process_name(self, hwnd: int) -> str:
+        self.queries += 1
+        win = self.windows.get(hwnd)
+        return win["process"] if win else ""
+
+    def foreground(self) -> int:
+        return self.foreground_hwnd
+
+    def is_on_current_desktop(self, hwnd: int) -> bool:
+        self.queries += 1
+        win = self.windows.get(hwnd)
+        return bool(win and win["desktop"] == self.current_desktop)
+
+
+class WindowQuery:
+    """按名称跳转窗口的查询，如 "code|vscode"：多个词用 | 分隔，匹配标题或进程名（不区分大小写）"""
+
+    __slots__ = ('pattern', 'terms', '_boundaries')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.terms = tuple(dict.fromkeys(t.strip().lower() for t in pattern.split('|') if t.strip()))
+        if not self.terms:
+            raise ValueError("窗口名称不能为空")
+        # 词出现在单词开头（如 "code" 匹配 "Visual Studio Code"）
+        self._boundaries = {t: re.compile(r'(?:^|\W)' + re.escape(t)) for t in self.terms}
+
+    def score(self, term: str, win: WindowInfo) -> int:
+        """匹配程度：完整标题 > 进程名 > 标题开头 > 单词开头 > 包含"""
+        title = win.title.lower()
+        process = win.process.lower()
+        if title == term:
+            return 5
+        if process == term or os.path.splitext(process)[0] == term:
+            return 4
+        if title.startswith(term):
+            return 3
+        if self._boundaries[term].search(title) or process.startswith(term):
+            return 2
+        return 1
+
+    def __repr__(self):
+        return f"WindowQuery({self.pattern!r})"
+
+
+class TitleIndex:
+    """标题和进程名的三元组索引：窗口 -> 小写文本，三元组 -> 包含它的窗口"""
+
+    N = 3
+
+    def __init__(self):
+        self._texts: Dict[int, str] = {}  # hwnd -> "标题\n进程名"（小写）
+        self._grams: Dict[str, Set[int]] = {}  # 三元组 -> hwnd 集合
+
+    @classmethod
+    def _ngrams(cls, text: str) -> Set[str]:
+        return {text[i:i + cls.N] for i in range(len(text) - cls.N + 1)}
+
+    def add(self, hwnd: int, title: str, process: str):
+        text = f"{title}\n{process}".lower()
+        old = self._texts.get(hwnd)
+        if old == text:
+            return
+        if old is not None:
+            self.remove(hwnd)
+        self._texts[hwnd] = text
+        for gram in self._ngrams(text):
+            self._grams.setdefault(gram, set()).add(hwnd)
+
+    def remove(self, hwnd: int):
+        text = self._texts.pop(hwnd, None)
+        if text is None:
+            return
+        for gram in self._ngrams(text):
+            hwnds = self._grams.get(gram)
+            if hwnds is not None:
+                hwnds.discard(hwnd)
+                if not hwnds:
+                    del self._grams[gram]
+
+    def candidates(self, term: str) -> List[int]:
+        """标题或进程名包含 term 的窗口"""
+        if len(term) < self.N:
+            # 太短的词没有三元组，直接比较（窗口数量很少）
+            return [hwnd for hwnd, text in self._texts.items() if term in text]
+        postings = []
+        for gram in self._ngrams(term):
+            hwnds = self._grams.get(gram)
+            if not hwnds:
+                return []
+            postings.append(hwnds)
+        postings.sort(key=len)
+        found = set(postings[0]).intersection(*postings[1:])
+        return [hwnd for hwnd in found if term in self._texts[hwnd]]
+
+
+class WindowIndex:
+    """增量窗口索引
+
+    索引保存可见、有标题且通过过滤的顶层窗口，按最近使用（MRU）排序：
+    启动时按 Z 序，之后新出现的窗口和成为前台的窗口排到最前。
+    窗口是否在当前虚拟桌面按窗口缓存，在窗口隐藏 / 取消隐藏时失效；
+    前台切换到缓存中不在当前桌面的窗口时，说明桌面已切换，全部失效。
+
+    循环切换（jump）在一次切换过程中使用开始时的顺序，类似按住 Alt 连续按 Tab；
+    距上次切换超过 CYCLE_SESSION 秒或前台窗口不是上次切换的目标时，按新的 MRU 顺序重新开始。
+    """
+
+    CYCLE_SESSION = 1.0  # 一次切换过程的最长间隔（秒）
+
+    def __init__(self, source: WindowEventSource, window_filter: Optional[WindowFilter] = None):
+        self.source = source
+        self.filter = window_filter  # 窗口过滤规则，None 表示包含所有窗口
+        self._lock = threading.RLock()
+        self._windows: "OrderedDict[int, WindowInfo]" = OrderedDict()  # hwnd -> WindowInfo，最近使用的在末尾
+        self._on_desktop: Dict[int, bool] = {}  # hwnd -> 是否在当前虚拟桌面（缓存）
+        self._snapshot: Optional[List[WindowInfo]] = None  # 当前桌面的窗口，最近使用的在前（缓存）
+        self._foreground = 0
+        self._cycle: List[WindowInfo] = []  # 当前切换过程的窗口顺序
+        self._cycle_pos = -1  # 上次切换的目标在 _cycle 中的位置
+        self._cycle_target = 0
+        self._cycle_at = 0.0
+        self._titles = TitleIndex()  # 按名称跳转用的标题和进程名索引
+        self._used: Dict[int, int] = {}  # hwnd -> 最近一次成为前台的序号
+        self._use_count = 0
+        self._started = False
+
+        # 统计
+        self.events = 0  # 处理的窗口事件数
+        self.desktop_checks = 0  # 实际查询虚拟桌面的次数
+
+    def start(self):
+        """先开始接收事件再枚举一次现有窗口，两者之间创建的窗口不会遗漏"""
+        if self._started:
+            return
+        self._started = True
+        self.source.start(self._on_event)
+        with self._lock:
+            # 枚举结果按 Z 序从上到下，反向加入使最上层的窗口成为最近使用
+            for hwnd in reversed(list(self.source.enumerate())):
+                self._update(hwnd)
+            self.set_foreground(self.source.foreground())
+        print(f"[窗口索引] 已索引 {len(self._windows)} 个窗口")
+
+    def stop(self):
+        if self._started:
+            self._started = False
+            self.source.stop()
+
+    def set_filter(self, window_filter: Optional[WindowFilter]):
+        """更换过滤规则，重新枚举一次窗口（已有窗口保持最近使用顺序，新包含的窗口排在最后）"""
+        with self._lock:
+            self.filter = window_filter
+            if not self._started:
+                return
+            known = list(self._windows)
+            for hwnd in known:
+                self._update(hwnd)
+            for hwnd in self.source.enumerate():
+                if hwnd not in self._windows:
+                    self._update(hwnd)
+                    if hwnd in self._windows:
+                        self._windows.move_to_end(hwnd, last=False)
+                        self._used[hwnd] = 0
+            self._snapshot = None
+
+    # ---- 事件 ----
+
+    def _on_event(self, kind: str, hwnd: int):
+        with self._lock:
+            self.events += 1
+            if kind == WINDOW_DESTROYED:
+                self._remove(hwnd)
+                self._on_desktop.pop(hwnd, None)
+            elif kind == DESKTOP_CHANGED:
+                self._invalidate_desktop(hwnd)
+            elif kind == FOREGROUND:
+                self._update(hwnd)
+                self.set_foreground(hwnd)
+            else:
+                self._update(hwnd)
+
+    def set_foreground(self, hwnd: int):
+        """记录前台窗口并移到最近使用（激活窗口后立即调用，不必等待前台事件）"""
+        with self._lock:
+            self._foreground = hwnd
+            if self._on_desktop.get(hwnd) is False:
+                # 激活了缓存中不在当前桌面的窗口：虚拟桌面已切换
+                self._on_desktop.clear()
+                self._snapshot = None
+            if hwnd in self._windows:
+                self._windows.move_to_end(hwnd)
+                self._mark_used(hwnd)
+                self._snapshot = None
+
+    def _invalidate_desktop(self, hwnd: int):
+        if self._on_desktop.pop(hwnd, None) is not None and hwnd in self._windows:
+            self._snapshot = None
+
+    def _update(self, hwnd: int):
+        """重新读取单个窗口的可见性和标题"""
+        title = self.source.get_title(hwnd) if self.source.is_visible(hwnd) else ""
+        if title and (self.filter is None or self.filter.accepts(self.source, hwnd, title)):
+            win = self._windows.get(hwnd)
+            if win is None:
+                win = self._windows[hwnd] = WindowInfo(hwnd, title, self.source.get_process_name(hwnd))
+                self._titles.add(hwnd, title, win.process)
+                self._mark_used(hwnd)
+                self._snapshot = None
+            elif win.title != title:
+                win.title = title
+                self._titles.add(hwnd, title, win.process)
+        else:
+            self._remove(hwnd)
+
+    def _remove(self, hwnd: int):
+        if self._windows.pop(hwnd, None) is not None:
+            self._titles.remove(hwnd)
+            self._used.pop(hwnd, None)
+            self._snapshot = None
+
+    def _mark_used(self, hwnd: int):
+        self._use_count += 1
+        self._used[hwnd] = self._use_count
+
+    def _is_on_current_desktop(self, hwnd: int) -> bool:
+        on_desktop = self._on_desktop.get(hwnd)
+        if on_desktop is None:
+            self.desktop_checks += 1
+            on_desktop = self.source.is_on_current_desktop(hwnd)
+            self._on_desktop[hwnd] = on_desktop
+        return on_desktop
+
+    def _current(self) -> List[WindowInfo]:
+        """当前桌面的窗口（持有锁时调用）"""
+        if self._snapshot is None:
+            self._snapshot = [
+                win for hwnd, win in reversed(self._windows.items())
+                if self._is_on_current_desktop(hwnd)
+            ]
+        return self._snapshot
+
+    # ---- 查询 ----
+
+    def windows(self) -> List[WindowInfo]:
+        """当前虚拟桌面上的窗口（最近使用的在前）"""
+        with self._lock:
+            return list(self._current())
+
+    def get(self, hwnd: int) -> Optional[WindowInfo]:
+        return self._windows.get(hwnd)
+
+    def foreground(self) -> Optional[WindowInfo]:
+        """当前前台窗口（不在索引中时为 None）"""
+        return self._windows.get(self._foreground)
+
+    def jump(self, steps: int) -> Optional[WindowInfo]:
+        """从前台窗口沿切换顺序移动 steps 步（负数向后），返回目标窗口，没有其他窗口时为 None"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._cycle_at > self.CYCLE_SESSION or self._foreground != self._cycle_target:
+                # 新的切换过程：前台窗口通常是最近使用的第一个
+                self._cycle = list(self._current())
+                self._cycle_pos = self._position(self._foreground)
+            elif any(win.hwnd not in self._windows for win in self._cycle):
+                # 切换过程中有窗口被关闭
+                self._cycle = [win for win in self._cycle if win.hwnd in self._windows]
+                self._cycle_pos = self._position(self._cycle_target)
+
+            count = len(self._cycle)
+            if count == 0:
+                return None
+            if self._cycle_pos >= 0:
+                pos = (self._cycle_pos + steps) % count
+            else:
+                # 前台窗口不在列表中：向前从第一个开始，向后从最后一个开始
+                pos = (steps - 1 if steps > 0 else steps) % count
+            target = self._cycle[pos]
+            if target.hwnd == self._foreground:
+                return None
+            self._cycle_pos = pos
+            self._cycle_target = target.hwnd
+            self._cycle_at = now
+            return target
+
+    def find(self, query: WindowQuery) -> Optional[WindowInfo]:
+        """按名称查找最匹配的窗口
+
+        匹配程度相同时依次优先：非前台窗口（重复跳转时在同名窗口间轮换）、
+        当前虚拟桌面上的窗口、最近使用的窗口。
+        """
+        with self._lock:
+            best = None
+            best_key = None
+            for term in query.terms:
+                for hwnd in self._titles.candidates(term):
+                    win = self._windows[hwnd]
+                    key = (
+                        query.score(term, win),
+                        hwnd != self._foreground,
+                        self._is_on_current_desktop(hwnd),
+                        self._used.get(hwnd, 0),
+                    )
+                    if best_key is None or key > best_key:
+                        best, best_key = win, key
+            return best
+
+    def _position(self, hwnd: int) -> int:
+        """窗口在当前切换顺序中的位置，不在其中时为 -1"""
+        for i, win in enumerate(self._cycle):
+            if win.hwnd == hwnd:
+                return i
+        return -1
+
+    def stats(self) -> dict:
+        """索引统计"""
+        with self._lock:
+            return {
+                "windows": len(self._windows),
+                "events": self.events,
+                "desktop_checks": self.desktop_checks,
+            }
@@ -33,6 +33,7 @@ from wheel_tool import WheelDisk, WheelToolApp
 from wheel_tool.input.controller import ModeController
 from wheel_tool.input.hotkey_listener import HotkeyListener
 from wheel_tool.config.settings import GlobalConfig
+from key_mapper.backends import use_backend
 
 
 def setup_logging():
@@ -57,13 +58,18 @@ def initialize_components():
     logger = logging.getLogger(__name__)
 
     try:
+        # 0. 选择输入后端（需在创建执行器之前）
+        backend_name = GlobalConfig.get('input.backend', 'native')
+        logger.info(f"使用输入后端: {backend_name}")
+        use_backend(backend_name)
+
         # 1. 初始化模式管理器
         logger.info("初始化模式管理器...")
         mode_manager = ModeManager()
 
         # 2. 初始化圆盘界面
         logger.info("初始化圆盘界面...")
-        disk = WheelDisk()
+        disk = WheelDisk(mode_manager.mode_state, lambda: [mode.name for mode in mode_manager.modes])
 
         # 3. 初始化模式控制器
         logger.info("初始化模式控制器...")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按键轨迹回放工具
+把录制的轨迹（或合成的编码器旋转）喂给真实的分发代码，注入端使用内存后端，
+输出吞吐和尾延迟，可在没有真实键盘钩子的机器上复现突发输入
+
+运行方式:
+    python replay_trace.py trace.fktr              # 最快速度回放
+    python replay_trace.py trace.fktr --realtime   # 按原速回放
+    python replay_trace.py --spin f20 --detents 200 --interval 2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加当前目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from key_mapper import ModeManager
+from key_mapper.backends import use_backend
+from wheel_tool.config.settings import GlobalConfig
+from wheel_tool.input.replay import TraceReplayer
+from wheel_tool.input.trace import read_trace, synthesize_spin, write_trace
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="按键轨迹回放工具")
+    parser.add_argument("trace", nargs="?", help="轨迹文件路径")
+    parser.add_argument("--realtime", action="store_true", help="按原始时间间隔回放")
+    parser.add_argument("--spin", metavar="KEY", help="合成编码器旋转轨迹，如 f20")
+    parser.add_argument("--scan-code", type=int, default=0x6B, help="合成轨迹使用的扫描码")
+    parser.add_argument("--detents", type=int, default=200, help="合成轨迹的刻度数")
+    parser.add_argument("--interval", type=float, default=2.0, help="合成轨迹的刻度间隔（毫秒）")
+    parser.add_argument("--mode", type=int, default=0, help="回放时的初始模式索引")
+    parser.add_argument("--save", metavar="PATH", help="保存合成的轨迹")
+    parser.add_argument("--json", metavar="PATH", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    if args.spin:
+        events = synthesize_spin(args.spin, args.scan_code, args.detents, args.interval)
+        if args.save:
+            write_trace(args.save, events)
+    elif args.trace:
+        events = read_trace(args.trace)
+    else:
+        parser.error("需要指定轨迹文件或 --spin")
+
+    GlobalConfig.load()
+    use_backend("memory")
+    replayer = TraceReplayer(ModeManager())
+    replayer.disk.current_mode = args.mode
+    result = replayer.replay(events, realtime=args.realtime)
+
+    hook = result["hook_latency"]
+    print("=" * 60)
+    print(f"事件数: {result['events']}  屏蔽: {result['suppressed']}  放行: {result['passed']}")
+    print(f"总耗时: {result['elapsed_s'] * 1000:.1f} ms  吞吐: {result['throughput_eps']:.0f} 事件/秒")
+    print(f"钩子回调: p50={hook['p50_us']:.1f}us p99={hook['p99_us']:.1f}us max={hook['max_us']:.1f}us")
+    for stage, group in result["latency"].items():
+        for action_type, s in group.items():
+            print(f"{stage}/{action_type}: p50={s['p50_us']:.1f}us p99={s['p99_us']:.1f}us max={s['max_us']:.1f}us")
+    print(f"注入: {result['injected']}")
+    print(f"滚轮合并: {result['scroll']}")
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
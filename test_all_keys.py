@@ -3,20 +3,36 @@
 """
 全局按键监听工具
 监听并显示所有按键的输入情况，包括按键名称和扫描码
+
+录制模式:
+    python test_all_keys.py --record trace.fktr
+    按键事件（名称、扫描码、按下/抬起、时间戳）写入二进制轨迹文件，
+    可用 replay_trace.py 回放
 """
 
+import argparse
+import time
 import keyboard
 from datetime import datetime
 from collections import defaultdict
+from wheel_tool.input.trace import TraceWriter
 
 
 class KeyMonitor:
     """按键监听器"""
 
-    def __init__(self):
+    def __init__(self, trace_writer: TraceWriter = None):
         self.key_counts = defaultdict(int)  # 统计每个按键的按下次数
         self.last_keys = []  # 记录最近按下的按键
         self.max_history = 10  # 最多显示最近10个按键
+        self.trace_writer = trace_writer  # 轨迹录制（可选）
+
+    def on_event(self, event):
+        """所有按键事件（按下和抬起），录制到轨迹文件"""
+        if self.trace_writer:
+            self.trace_writer.write(event.name, event.scan_code,
+                                    event.event_type == keyboard.KEY_DOWN,
+                                    time.perf_counter_ns())
 
     def on_key_down(self, event):
         """按键按下事件"""
@@ -58,11 +74,18 @@ class KeyMonitor:
 
         print("\n最近按键序列：")
         print("  " + " → ".join(self.last_keys[-10:]) if self.last_keys else "  (无)")
+
+        if self.trace_writer:
+            print(f"\n已录制 {self.trace_writer.count} 个事件到: {self.trace_writer.path}")
         print("=" * 60)
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="全局按键监听工具")
+    parser.add_argument("--record", metavar="PATH", help="录制按键轨迹到指定文件")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  全局按键监听工具")
     print("=" * 60)
@@ -75,10 +98,15 @@ def main():
     print("-" * 60)
     print()
 
-    monitor = KeyMonitor()
+    trace_writer = TraceWriter(args.record) if args.record else None
+    if trace_writer:
+        print(f"正在录制按键轨迹到: {args.record}\n")
+    monitor = KeyMonitor(trace_writer)
 
     # 注册按键监听
     keyboard.on_press(monitor.on_key_down)
+    if trace_writer:
+        keyboard.hook(monitor.on_event)
 
     try:
         # 等待 ESC 键退出
@@ -90,6 +118,11 @@ def main():
         print("\n\n检测到 Ctrl+C，准备退出...\n")
         monitor.show_summary()
 
+    finally:
+        if trace_writer:
+            keyboard.unhook_all()
+            trace_writer.close()
+
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+异步动作队列测试
+运行方式:
+    python -m pytest tests
+"""
+
+import threading
+import time
+import unittest
+
+from key_mapper.core.action_queue import ActionQueue
+
+
+class OverflowTest(unittest.TestCase):
+    """执行线程未启动时检查各溢出策略下的队列内容"""
+
+    def lane(self, queue: ActionQueue) -> list:
+        return [args for _, args, _ in queue._normal]
+
+    def test_drop_oldest(self):
+        queue = ActionQueue(maxsize=2)
+        for i in range(4):
+            self.assertTrue(queue.put(print, i))
+        self.assertEqual(self.lane(queue), [(2,), (3,)])
+        self.assertEqual(queue.dropped, 2)
+
+    def test_merge(self):
+        queue = ActionQueue(maxsize=2, overflow="merge")
+        queue.put(print, "a")
+        queue.put(print, "b")
+        self.assertFalse(queue.put(print, "a"))
+        self.assertEqual(queue.merged, 1)
+        # 没有可合并的项时丢弃最早的
+        self.assertTrue(queue.put(print, "c"))
+        self.assertEqual(self.lane(queue), [("b",), ("c",)])
+        self.assertEqual(queue.dropped, 1)
+
+    def test_merge_key(self):
+        queue = ActionQueue(maxsize=1, overflow="merge")
+        queue.put(print, "up", 1.0, key="scroll")
+        self.assertFalse(queue.put(print, "up", 2.0, key="scroll"))
+        self.assertEqual(self.lane(queue), [("up", 1.0)])
+
+    def test_priority_lane_has_own_capacity(self):
+        queue = ActionQueue(maxsize=1)
+        queue.put(print, "normal")
+        queue.put(print, "mode", priority=True)
+        self.assertEqual(queue.pending(), 2)
+        self.assertEqual(queue.dropped, 0)
+
+    def test_unknown_policy(self):
+        self.assertEqual(ActionQueue(overflow="spill").overflow, "drop_oldest")
+
+
+class BlockPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = ActionQueue(maxsize=1, overflow="block")
+        self.done = []
+        self.gate = threading.Event()
+        self.queue.start()
+        # 第一个动作占住执行线程，第二个动作占满队列
+        self.queue.put(self.gate.wait)
+        self.queue.put(self.done.append, 1)
+
+    def tearDown(self):
+        self.gate.set()
+        self.queue.stop()
+
+    def test_put_blocks_until_space(self):
+        producer = threading.Thread(target=self.queue.put, args=(self.done.append, 2))
+        producer.start()
+        time.sleep(0.05)
+        self.assertTrue(producer.is_alive())
+
+        self.gate.set()
+        producer.join(1.0)
+        self.assertFalse(producer.is_alive())
+        self.assertTrue(self.queue.wait_idle(1.0))
+        self.assertEqual(self.done, [1, 2])
+        self.assertEqual(self.queue.deferred, 0)
+
+    def test_non_blocking_put_is_deferred(self):
+        self.assertTrue(self.queue.put(self.done.append, 2, block=False))
+        self.assertEqual(self.queue.deferred, 1)
+        self.assertEqual(self.queue.pending(), 2)
+        self.gate.set()
+        self.assertTrue(self.queue.wait_idle(1.0))
+        self.assertEqual(self.done, [1, 2])
+
+    def test_executor_thread_never_waits_on_itself(self):
+        def chain():
+            self.queue.put(self.done.append, 2)
+            self.queue.put(self.done.append, 3)
+
+        self.queue.put(chain, block=False)
+        self.gate.set()
+        self.assertTrue(self.queue.wait_idle(1.0))
+        self.assertEqual(self.done, [1, 2, 3])
+        self.assertGreaterEqual(self.queue.deferred, 1)
+
+
+class ExecutionOrderTest(unittest.TestCase):
+
+    def test_priority_runs_first(self):
+        queue = ActionQueue()
+        done = []
+        queue.put(done.append, "action")
+        queue.put(done.append, "mode", priority=True)
+        queue.start()
+        try:
+            self.assertTrue(queue.wait_idle(1.0))
+        finally:
+            queue.stop()
+        self.assertEqual(done, ["mode", "action"])
+
+
+if __name__ == "__main__":
+    unittest.main()
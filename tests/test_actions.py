@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+映射预编译测试（内存后端）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper.backends import MemoryBackend, use_backend
+from key_mapper.core.actions import ActionCompileError, CompiledAction, parse_key_combo
+from key_mapper.core.executors import ActionExecutor, ActionResources
+from key_mapper.core.models import KeyMapping
+from key_mapper.core.modes import CustomMode
+
+
+class CompileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = MemoryBackend()
+        self.resources = ActionResources(backend=self.backend, scroll_window_ms=0)
+        self.executor = ActionExecutor(resources=self.resources)
+
+    def injected(self) -> list:
+        return [(op, arg) for _, op, arg in self.backend.injected]
+
+
+class KeyboardTest(CompileTestCase):
+
+    def test_parse_key_combo(self):
+        self.assertEqual(parse_key_combo("Ctrl+Shift+T", self.backend), ["ctrl", "shift", "t"])
+        self.assertEqual(parse_key_combo("ctrl+nosuchkey", self.backend), [])
+
+    def test_combo_compiled_to_single_batch(self):
+        action = self.executor.compile("keyboard", "ctrl+w")
+        self.assertIsInstance(action, CompiledAction)
+        self.assertTrue(action())
+        self.assertEqual(self.injected(), [
+            ("batch", (("ctrl", True), ("w", True), ("w", False), ("ctrl", False))),
+        ])
+
+    def test_unknown_key(self):
+        with self.assertRaises(ActionCompileError):
+            self.executor.compile("keyboard", "ctrl+nosuchkey")
+
+
+class TargetParsingTest(CompileTestCase):
+
+    def test_mouse_scroll(self):
+        self.executor.compile("mouse_scroll", "down:3")()
+        self.executor.compile("mouse_scroll", " UP ")()
+        self.assertEqual(self.injected(), [("scroll", -3), ("scroll", 1)])
+
+    def test_mouse_click(self):
+        self.executor.compile("mouse_click", "Left")()
+        self.assertEqual(self.injected(), [("click", "left")])
+
+    def test_invalid_targets(self):
+        invalid = [
+            ("mouse_scroll", "down:many"),
+            ("mouse_scroll", "sideways"),
+            ("mouse_click", "fourth"),
+            ("command", "   "),
+            ("window_cycle", "back"),
+            ("window_jump", " | "),
+            ("macro", "keyboard:ctrl+c; delay:soon"),
+            ("macro", "keyboard:ctrl+c; delay:-5"),
+            ("macro", "macro:keyboard:a"),
+            ("macro", " ; "),
+            ("teleport", "home"),
+        ]
+        for action_type, target in invalid:
+            with self.assertRaises(ActionCompileError, msg=f"{action_type}: {target}"):
+                self.executor.compile(action_type, target)
+
+    def test_macro_steps(self):
+        action = self.executor.compile("macro", "keyboard:ctrl+c; delay:50; mouse_scroll:up:2")
+        steps = action.args[0]
+        self.assertEqual([getattr(step, "action_type", step) for step in steps], ["keyboard", 0.05, "mouse_scroll"])
+
+    def test_execute_reports_compile_errors(self):
+        self.assertFalse(self.executor.execute("keyboard", "ctrl+nosuchkey"))
+        self.assertTrue(self.executor.execute("keyboard", "a"))
+
+
+class ModeCompileTest(CompileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        use_backend("memory")
+        self.mode = CustomMode("测试模式")
+        self.mode.action_executor = ActionExecutor(self.mode, self.resources)
+
+    def test_set_mapping_compiles_immediately(self):
+        mapping = KeyMapping("f13", "ctrl+c")
+        self.mode.set_mapping(mapping)
+        self.assertEqual(mapping.action.action_type, "keyboard")
+        with self.assertRaises(ActionCompileError):
+            self.mode.set_mapping(KeyMapping("f14", "ctrl+nosuchkey"))
+        self.assertNotIn("f14", self.mode.mappings)
+
+    def test_compile_collects_errors(self):
+        self.mode.mappings["f13"] = KeyMapping("f13", "ctrl+c")
+        self.mode.mappings["f14"] = KeyMapping("f14", "ctrl+nosuchkey")
+        errors = self.mode.compile()
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("f14"))
+        self.assertIsNotNone(self.mode.mappings["f13"].action)
+        self.assertIsNone(self.mode.mappings["f14"].action)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+命令执行器测试
+运行方式:
+    python -m pytest tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from key_mapper.utils.command_runner import CommandRunner
+
+PYTHON = shutil.which(os.path.basename(sys.executable)) or sys.executable
+
+
+class PrepareTest(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = CommandRunner()
+
+    @unittest.skipIf(sys.platform == 'win32', "Windows 上 argv 为命令行字符串")
+    def test_program_on_path_starts_directly(self):
+        prepared = self.runner.prepare(f'  {os.path.basename(PYTHON)} -V "a b"  ')
+        self.assertEqual(prepared.text, f'{os.path.basename(PYTHON)} -V "a b"')
+        self.assertEqual(prepared.argv, [PYTHON, "-V", "a b"])
+
+    @unittest.skipUnless(sys.platform == 'win32', "仅 Windows")
+    def test_program_on_path_keeps_command_line(self):
+        prepared = self.runner.prepare(f'{os.path.basename(PYTHON)} -V')
+        self.assertIsInstance(prepared.argv, str)
+        self.assertTrue(prepared.argv.endswith(' -V'))
+
+    def test_shell_syntax_needs_shell(self):
+        for command in ("echo hi > out.txt", "dir | more", "a && b"):
+            self.assertIsNone(self.runner.prepare(command).argv, command)
+        self.assertTrue(self.runner._shell_used)
+
+    def test_unknown_program_needs_shell(self):
+        self.assertIsNone(self.runner.prepare("flowkey-no-such-program --flag").argv)
+
+    def test_unbalanced_quotes_need_shell(self):
+        self.assertIsNone(self.runner.prepare(f'{os.path.basename(PYTHON)} "unterminated').argv)
+
+    def test_argv_only_does_not_mark_shell_used(self):
+        self.runner.prepare(os.path.basename(PYTHON))
+        self.assertFalse(self.runner._shell_used)
+
+
+class SubmitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = CommandRunner(workers=1)
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.addCleanup(self.runner.shutdown)
+
+    def wait_for(self, path: str, timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(path):
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_direct_and_shell_commands_run(self):
+        script = os.path.join(self.dir, "touch.py")
+        marker = os.path.join(self.dir, "direct.txt")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(f"open({marker!r}, 'w').close()\n")
+        direct = self.runner.prepare(f'{os.path.basename(PYTHON)} "{script}"')
+        self.assertIsNotNone(direct.argv)
+        self.runner.submit(direct)
+
+        output = os.path.join(self.dir, "shell.txt")
+        shell = self.runner.prepare(f'echo hi > "{output}"')
+        self.assertIsNone(shell.argv)
+        self.runner.submit(shell)
+
+        self.assertTrue(self.wait_for(marker))
+        self.assertTrue(self.wait_for(output))
+        stats = self.runner.stats()
+        self.assertEqual(stats["launched"], 1)
+        self.assertEqual(stats["shell_runs"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
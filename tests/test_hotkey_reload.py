@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+映射热重载测试（内存后端）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper import ModeManager
+from key_mapper.backends import use_backend
+from key_mapper.core.models import KeyMapping
+from wheel_tool.input.replay import TraceReplayer
+
+
+class ReloadTest(unittest.TestCase):
+
+    def setUp(self):
+        use_backend("memory")
+        self.manager = ModeManager()
+        self.replayer = TraceReplayer(self.manager)
+        self.listener = self.replayer.listener
+        self.listener.reload()
+        self.backend = self.replayer.backend
+        # 选一个当前配置中没有使用的按键
+        used = {source for mode in self.manager.modes for source in mode.mappings}
+        self.key = next(key for key in ("f22", "f19", "f18", "pause", "scroll lock") if key not in used)
+
+    def entry(self, key_name: str):
+        scan_code = self.backend.resolve_scan_codes(key_name)[0]
+        return self.listener.entry_for(scan_code)
+
+    def test_unchanged_modes_keep_their_tables(self):
+        tables = list(self.listener._mode_tables)
+        tries = list(self.listener._mode_tries)
+        self.manager.modes[1].set_mapping(KeyMapping(self.key, "ctrl+c"))
+        self.listener.reload()
+
+        for i in (0, 2, 3):
+            self.assertIs(self.listener._mode_tables[i], tables[i])
+            self.assertIs(self.listener._mode_tries[i], tries[i])
+        self.assertIsNot(self.listener._mode_tables[1], tables[1])
+        self.assertIn(self.key, {m.source_key for m in self.listener._mode_tables[1].values()})
+
+    def test_reload_without_changes_rebuilds_nothing(self):
+        tables = list(self.listener._mode_tables)
+        self.listener.reload()
+        self.assertEqual([id(t) for t in self.listener._mode_tables], [id(t) for t in tables])
+
+    def test_new_mapping_dispatches_after_reload(self):
+        mode = self.manager.modes[self.manager.current_index]
+        self.assertIsNone(self.entry(self.key))
+        mode.set_mapping(KeyMapping(self.key, "ctrl+c"))
+        # 重新加载之前仍按旧表分发
+        self.assertIsNone(self.entry(self.key))
+        self.listener.reload()
+        self.assertEqual(self.entry(self.key).mapping.target_key, "ctrl+c")
+
+    def test_removed_and_disabled_mappings(self):
+        mode = self.manager.modes[self.manager.current_index]
+        mode.set_mapping(KeyMapping(self.key, "ctrl+c"))
+        mode.set_mapping(KeyMapping("f21", "ctrl+v"))
+        self.listener.reload()
+
+        mode.remove_mapping(self.key)
+        self.listener.reload()
+        self.assertIsNone(self.entry(self.key))
+        self.assertIsNotNone(self.entry("f21"))
+
+        mode.enabled = False
+        self.listener.reload()
+        entry = self.entry("f21")
+        self.assertTrue(entry is None or entry.mapping is None)
+
+    def test_replaced_mapping_object_is_picked_up(self):
+        mode = self.manager.modes[self.manager.current_index]
+        mode.set_mapping(KeyMapping(self.key, "ctrl+c"))
+        self.listener.reload()
+        mode.set_mapping(KeyMapping(self.key, "ctrl+x"))
+        self.listener.reload()
+        self.assertEqual(self.entry(self.key).mapping.target_key, "ctrl+x")
+
+    def test_other_modes_unaffected(self):
+        other = (self.manager.current_index + 1) % len(self.manager.modes)
+        self.manager.modes[other].set_mapping(KeyMapping(self.key, "ctrl+c"))
+        self.listener.reload()
+        self.assertIsNone(self.entry(self.key))
+        self.manager.set_current_index(other)
+        self.assertEqual(self.entry(self.key).mapping.target_key, "ctrl+c")
+
+
+if __name__ == "__main__":
+    unittest.main()
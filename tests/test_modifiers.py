@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+修饰键限定源按键测试
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper import ModeManager
+from key_mapper.backends import use_backend
+from key_mapper.core.models import KeyMapping
+from key_mapper.utils.helpers import MODIFIER_BITS, MODIFIER_MASKS, join_modifiers, split_modifiers
+from wheel_tool.input.hotkey_listener import pack_key
+from wheel_tool.input.replay import TraceReplayer
+
+CTRL, ALT, SHIFT, WIN = (MODIFIER_BITS[name] for name in ('ctrl', 'alt', 'shift', 'win'))
+
+
+class SplitJoinTest(unittest.TestCase):
+
+    def test_split(self):
+        self.assertEqual(split_modifiers("f16"), (0, "f16"))
+        self.assertEqual(split_modifiers("Ctrl+Shift+F16"), (CTRL | SHIFT, "f16"))
+        self.assertEqual(split_modifiers(" control + windows + j "), (CTRL | WIN, "j"))
+        self.assertEqual(split_modifiers(""), (0, ""))
+
+    def test_modifier_as_main_key(self):
+        self.assertEqual(split_modifiers("ctrl"), (0, "ctrl"))
+        self.assertEqual(split_modifiers("alt+shift"), (ALT, "shift"))
+
+    def test_unknown_modifier(self):
+        with self.assertRaises(ValueError):
+            split_modifiers("hyper+f16")
+
+    def test_join_uses_fixed_order(self):
+        self.assertEqual(join_modifiers(SHIFT | CTRL, "f16"), "ctrl+shift+f16")
+        self.assertEqual(join_modifiers(0, "f16"), "f16")
+        self.assertEqual(join_modifiers(WIN | ALT | SHIFT | CTRL, "j"), "ctrl+alt+shift+win+j")
+
+    def test_round_trip(self):
+        for mask in range(MODIFIER_MASKS):
+            self.assertEqual(split_modifiers(join_modifiers(mask, "f16")), (mask, "f16"))
+
+    def test_pack_key(self):
+        self.assertEqual(pack_key(0, 0x3B), 0x3B)
+        self.assertEqual(pack_key(CTRL | SHIFT, 0x3B) >> 16, CTRL | SHIFT)
+        self.assertEqual(pack_key(CTRL | SHIFT, 0x3B) & 0xFFFF, 0x3B)
+        self.assertEqual(len({pack_key(mask, 0x3B) for mask in range(MODIFIER_MASKS)}), MODIFIER_MASKS)
+
+
+class QualifiedDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        use_backend("memory")
+        self.manager = ModeManager()
+        self.replayer = TraceReplayer(self.manager)
+        self.listener = self.replayer.listener
+        self.backend = self.replayer.backend
+        used = {source for mode in self.manager.modes for source in mode.mappings}
+        self.key = next(key for key in ("f22", "f19", "f18", "pause", "scroll lock") if key not in used)
+
+        mode = self.manager.get_current_mode()
+        mode.set_mapping(KeyMapping(self.key, "a"))
+        mode.set_mapping(KeyMapping(f"ctrl+{self.key}", "b"))
+        self.listener.reload()
+        self.code = self.backend.resolve_scan_codes(self.key)[0]
+
+    def target(self, mask: int) -> str:
+        """按住 mask 修饰键时按下测试按键分发到的映射目标"""
+        return self.listener.mode_state.snapshot.table[pack_key(mask, self.code)].mapping.target_key
+
+    def test_qualified_mapping_overrides_plain_key(self):
+        self.assertEqual(self.target(0), "a")
+        self.assertEqual(self.target(CTRL), "b")
+
+    def test_plain_mapping_matches_other_modifiers(self):
+        self.assertEqual(self.target(SHIFT), "a")
+        self.assertEqual(self.target(CTRL | SHIFT), "a")
+
+    def test_hook_tracks_held_modifiers(self):
+        self.backend.hook(self.listener._on_key_event)
+        try:
+            self.backend.key_down("ctrl")
+            self.assertEqual(self.listener.entry_for(self.code).mapping.target_key, "b")
+            self.backend.key_up("ctrl")
+            self.assertEqual(self.listener.entry_for(self.code).mapping.target_key, "a")
+        finally:
+            self.backend.unhook()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+系统钩子重新安装测试
+运行方式:
+    python -m pytest tests
+"""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from key_mapper.backends.native import NativeBackend, SystemHooks
+
+
+class FakeOsKeyboard:
+    """模拟 keyboard 库的系统钩子模块：listen 注册一个钩子并运行消息循环直到收到退出消息"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_handle = 1
+        self.active = set()  # 生效中的钩子句柄
+        self.loops = {}  # 线程 ID -> 结束消息循环的事件
+        self.callbacks = []  # 每次 listen 收到的事件回调
+
+    def SetWindowsHookEx(self):
+        with self._lock:
+            handle, self._next_handle = self._next_handle, self._next_handle + 1
+            self.active.add(handle)
+        return handle
+
+    def UnhookWindowsHookEx(self, handle: int):
+        with self._lock:
+            self.active.discard(handle)
+
+    def PostQuit(self, thread_id: int):
+        with self._lock:
+            loop = self.loops.get(thread_id)
+        if loop is not None:
+            loop.set()
+
+    def listen(self, callback):
+        loop = threading.Event()
+        with self._lock:
+            self.loops[threading.get_native_id()] = loop
+            self.callbacks.append(callback)
+        self.SetWindowsHookEx()
+        loop.wait()
+        with self._lock:
+            del self.loops[threading.get_native_id()]
+
+
+class SystemHooksTest(unittest.TestCase):
+
+    def wait_for(self, condition, timeout: float = 2.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.005)
+        return condition()
+
+    def test_reinstall_leaves_one_hook(self):
+        os_keyboard = FakeOsKeyboard()
+        hooks = SystemHooks(os_keyboard, os_keyboard.UnhookWindowsHookEx, os_keyboard.PostQuit)
+
+        # keyboard 库自己的监听线程安装的第一个钩子
+        threading.Thread(target=os_keyboard.listen, args=(None,), daemon=True).start()
+        self.assertTrue(self.wait_for(lambda: len(os_keyboard.active) == 1))
+
+        for _ in range(3):
+            hooks.reinstall(None)
+            self.assertTrue(self.wait_for(lambda: len(hooks.hooks) == 1))
+            self.assertEqual(len(os_keyboard.active), 1)
+            self.assertEqual([handle for handle, _ in hooks.hooks], list(os_keyboard.active))
+
+        # 旧钩子的消息循环线程都已结束
+        self.assertTrue(self.wait_for(lambda: len(os_keyboard.loops) == 1))
+
+    def test_remove_all(self):
+        os_keyboard = FakeOsKeyboard()
+        hooks = SystemHooks(os_keyboard, os_keyboard.UnhookWindowsHookEx, os_keyboard.PostQuit)
+        hooks.reinstall(None)
+        self.assertTrue(self.wait_for(lambda: len(hooks.hooks) == 1))
+        self.assertEqual(hooks.remove_all(), 1)
+        self.assertEqual(os_keyboard.active, set())
+        self.assertTrue(self.wait_for(lambda: not os_keyboard.loops))
+
+    def test_reinstall_uses_given_callback(self):
+        os_keyboard = FakeOsKeyboard()
+        hooks = SystemHooks(os_keyboard, os_keyboard.UnhookWindowsHookEx, os_keyboard.PostQuit)
+        callback = lambda event: True
+        hooks.reinstall(callback)
+        self.assertTrue(self.wait_for(lambda: len(hooks.hooks) == 1))
+        self.assertEqual(os_keyboard.callbacks, [callback])
+        hooks.remove_all()
+
+
+class NativeDispatchTest(unittest.TestCase):
+    """重新安装后的系统钩子回调：交给后端当前注册的回调"""
+
+    def dispatch(self, callback, suppress: bool, event="event") -> bool:
+        backend = SimpleNamespace(_callback=callback, _suppress=suppress)
+        return NativeBackend._dispatch(backend, event)
+
+    def test_suppressing_hook(self):
+        self.assertFalse(self.dispatch(lambda event: False, True))
+        self.assertTrue(self.dispatch(lambda event: True, True))
+
+    def test_listen_only_hook_never_blocks(self):
+        seen = []
+        self.assertTrue(self.dispatch(lambda event: seen.append(event), False))
+        self.assertEqual(seen, ["event"])
+
+    def test_no_callback_passes(self):
+        self.assertTrue(self.dispatch(None, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Python 动作插件测试
+运行方式:
+    python -m pytest tests
+"""
+
+import os
+import unittest
+
+from key_mapper.backends import MemoryBackend
+from key_mapper.core.actions import ActionCompileError
+from key_mapper.core.executors import ActionExecutor, ActionResources
+from key_mapper.core.plugins import PluginRegistry
+
+TEST_GROUP = "flowkey.tests.none"  # 不存在的入口点组，避免受已安装包影响
+
+
+class FakeEntryPoint:
+    """记录 load 次数的入口点"""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.func
+
+
+class PluginRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = PluginRegistry(TEST_GROUP)
+
+    def test_validate(self):
+        for target in ("toggle_mute", "mypkg.actions:toggle_mute", "pkg:Class.method"):
+            self.registry.validate(target)
+        for target in ("", "1abc", "mod:", "a b", "mod:func()"):
+            with self.assertRaises(ActionCompileError, msg=target):
+                self.registry.validate(target)
+
+    def test_register_decorator(self):
+        @self.registry.register("hello")
+        def hello(context):
+            return "hi"
+
+        self.assertIs(self.registry.resolve("hello"), hello)
+        self.assertEqual(self.registry.names(), ["hello"])
+
+    def test_register_replaces_cached(self):
+        self.registry.register("hello", lambda context: 1)
+        self.registry.resolve("hello")
+        second = self.registry.register("hello", lambda context: 2)
+        self.assertIs(self.registry.resolve("hello"), second)
+
+    def test_module_attribute_import(self):
+        self.assertIs(self.registry.resolve("os.path:join"), os.path.join)
+        self.assertIs(self.registry.resolve("os:path.join"), os.path.join)
+
+    def test_import_errors(self):
+        for target in ("flowkey_no_such_module:func", "os:no_such_attr", "os:sep", "unknown_plugin"):
+            with self.assertRaises(ActionCompileError, msg=target):
+                self.registry.resolve(target)
+
+    def test_entry_point_loaded_once(self):
+        entry_point = FakeEntryPoint("beep", lambda context: None)
+        self.registry._entry_points = {"beep": entry_point}
+        self.assertEqual(self.registry.names(), ["beep"])
+        self.assertIs(self.registry.resolve("beep"), entry_point.func)
+        self.registry.resolve("beep")
+        self.assertEqual(entry_point.loads, 1)
+
+    def test_registered_takes_precedence(self):
+        self.registry._entry_points = {"beep": FakeEntryPoint("beep", lambda context: "entry point")}
+        registered = self.registry.register("beep", lambda context: "registered")
+        self.assertIs(self.registry.resolve("beep"), registered)
+
+
+class PythonActionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = MemoryBackend()
+        resources = ActionResources(backend=self.backend)
+        resources.plugins = PluginRegistry(TEST_GROUP)
+        self.registry = resources.plugins
+        self.executor = ActionExecutor(mode="mode", resources=resources)
+        self.calls = []
+
+    def test_context_and_result(self):
+        @self.registry.register("record")
+        def record(context):
+            self.calls.append(context)
+
+        action = self.executor.compile("python", " record ", mapping="mapping")
+        self.assertTrue(action())
+        context = self.calls[0]
+        self.assertEqual((context.mode, context.mapping), ("mode", "mapping"))
+        self.assertIs(context.backend, self.backend)
+        self.assertIs(context.executor, self.executor)
+
+    def test_false_result_and_errors_fail(self):
+        self.registry.register("refuse", lambda context: False)
+        self.registry.register("crash", lambda context: 1 / 0)
+        self.assertFalse(self.executor.compile("python", "refuse")())
+        self.assertFalse(self.executor.compile("python", "crash")())
+
+    def test_resolution_deferred_to_first_call(self):
+        action = self.executor.compile("python", "later")
+        self.assertFalse(action())
+        self.registry.register("later", lambda context: True)
+        self.assertTrue(action())
+
+    def test_invalid_target_rejected_at_compile(self):
+        with self.assertRaises(ActionCompileError):
+            self.executor.compile("python", "not valid")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+滚轮事件合并测试（窗口结束由测试手动触发）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+from unittest import mock
+
+from key_mapper.core.executors import ScrollCoalescer
+
+
+class FakeScheduler:
+    """记录 call_later 预约，由测试逐个触发到期"""
+
+    def __init__(self):
+        self.timers = []
+
+    def call_later(self, delay, func, *args):
+        self.timers.append((delay, func, args))
+
+    def expire(self):
+        """触发最早的一个预约，返回是否有预约"""
+        if not self.timers:
+            return False
+        _, func, args = self.timers.pop(0)
+        func(*args)
+        return True
+
+
+class ScrollCoalescerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        patcher = mock.patch("key_mapper.core.executors.get_scheduler", return_value=self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.injected = []
+
+
+class LeadingTest(ScrollCoalescerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.coalescer = ScrollCoalescer(self.injected.append, window_ms=8)
+
+    def test_first_event_injected_immediately(self):
+        self.coalescer.add(1)
+        self.assertEqual(self.injected, [1])
+        self.assertEqual(self.scheduler.timers[0][0], 0.008)
+
+    def test_window_accumulates_and_flushes_once(self):
+        for clicks in (1, 1, 1, -1, 2):
+            self.coalescer.add(clicks)
+        self.assertEqual(self.injected, [1])
+        self.scheduler.expire()
+        self.assertEqual(self.injected, [1, 3])
+        self.assertEqual(self.coalescer.stats(), {"events_in": 5, "events_merged": 4, "injections": 2})
+
+    def test_continuous_rotation_keeps_window_open(self):
+        self.coalescer.add(1)
+        self.coalescer.add(1)
+        self.scheduler.expire()  # 注入 1 并开启下一个窗口
+        self.coalescer.add(1)
+        self.assertEqual(self.injected, [1, 1])
+        self.scheduler.expire()
+        self.assertEqual(self.injected, [1, 1, 1])
+
+    def test_quiet_window_closes(self):
+        self.coalescer.add(1)
+        self.scheduler.expire()
+        self.assertEqual(self.scheduler.timers, [])
+        # 窗口关闭后的下一个事件再次立即注入
+        self.coalescer.add(-2)
+        self.assertEqual(self.injected, [1, -2])
+
+    def test_cancelled_out_window_injects_nothing(self):
+        self.coalescer.add(1)
+        self.coalescer.add(1)
+        self.coalescer.add(-1)
+        self.scheduler.expire()
+        self.assertEqual(self.injected, [1])
+        self.assertEqual(self.scheduler.timers, [])
+
+    def test_zero_window_disables_coalescing(self):
+        coalescer = ScrollCoalescer(self.injected.append, window_ms=0)
+        coalescer.add(1)
+        coalescer.add(1)
+        self.assertEqual(self.injected, [1, 1])
+        self.assertEqual(self.scheduler.timers, [])
+
+
+class TrailingTest(ScrollCoalescerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.coalescer = ScrollCoalescer(self.injected.append, window_ms=40, leading=False)
+
+    def test_single_injection_at_window_end(self):
+        self.coalescer.add(1)
+        self.coalescer.add(1)
+        self.coalescer.add(1)
+        self.assertEqual(self.injected, [])
+        self.scheduler.expire()
+        self.assertEqual(self.injected, [3])
+        # 不继续开启下一个窗口
+        self.assertEqual(self.scheduler.timers, [])
+        self.assertEqual(self.coalescer.injections, 1)
+
+    def test_next_event_starts_new_window(self):
+        self.coalescer.add(-1)
+        self.scheduler.expire()
+        self.coalescer.add(2)
+        self.assertEqual(len(self.scheduler.timers), 1)
+        self.scheduler.expire()
+        self.assertEqual(self.injected, [-1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+按键序列匹配测试（超时由测试手动触发）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+from unittest import mock
+
+from wheel_tool.input.sequence import (SEQ_CONSUMED, SEQ_FLUSHED, SEQ_MISS,
+                                       SequenceMatcher, SequenceNode)
+
+F13, F16, J, K = 13, 16, 36, 37
+
+
+class FakeTimer:
+    def __init__(self, func, args):
+        self.func, self.args = func, args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeScheduler:
+    """记录 call_later 预约，由测试触发最近一个未取消的预约"""
+
+    def __init__(self):
+        self.timers = []
+
+    def call_later(self, delay, func, *args):
+        timer = FakeTimer(func, args)
+        self.timers.append(timer)
+        return timer
+
+    def active(self) -> list:
+        return [timer for timer in self.timers if not timer.cancelled]
+
+    def expire(self):
+        timer = self.active()[-1]
+        timer.func(*timer.args)
+
+
+def add(root: SequenceNode, keys: tuple, mapping: str):
+    node = root
+    for key in keys:
+        node = node.child(key)
+    node.mode, node.mapping = "mode", mapping
+
+
+class SequenceMatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        patcher = mock.patch("wheel_tool.input.sequence.get_scheduler", return_value=self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.matches, self.flushes = [], []
+        self.matcher = SequenceMatcher(
+            lambda mode, mapping, keys: self.matches.append((mapping, [k for k, _ in keys])),
+            lambda keys: self.flushes.append([k for k, _ in keys]))
+        self.root = SequenceNode()
+        add(self.root, (F13, J), "f13 j")
+        add(self.root, (F13, K), "f13 k")
+        add(self.root, (F16,), "f16")
+        add(self.root, (F16, F16), "f16 f16")
+
+    def feed(self, key: int) -> int:
+        return self.matcher.feed(self.root, key, str(key))
+
+    def test_unrelated_key_misses(self):
+        self.assertEqual(self.feed(K), SEQ_MISS)
+        self.assertFalse(self.matcher.pending)
+
+    def test_full_sequence_matches_at_leaf(self):
+        self.assertEqual(self.feed(F13), SEQ_CONSUMED)
+        self.assertTrue(self.matcher.pending)
+        self.assertEqual(self.feed(J), SEQ_CONSUMED)
+        self.assertEqual(self.matches, [("f13 j", [F13, J])])
+        self.assertFalse(self.matcher.pending)
+        # 叶子节点立即触发，超时预约已取消
+        self.assertEqual(self.scheduler.active(), [])
+
+    def test_broken_prefix_flushes_buffered_keys(self):
+        self.feed(F13)
+        self.assertEqual(self.feed(F16 + 100), SEQ_FLUSHED)
+        self.assertEqual(self.flushes, [[F13]])
+        self.assertEqual(self.matches, [])
+
+    def test_breaking_key_can_start_new_sequence(self):
+        self.feed(F13)
+        self.assertEqual(self.feed(F16), SEQ_CONSUMED)
+        self.assertEqual(self.flushes, [[F13]])
+        self.assertTrue(self.matcher.pending)
+
+    def test_prefix_without_mapping_flushes_on_timeout(self):
+        self.feed(F13)
+        self.scheduler.expire()
+        self.assertEqual(self.flushes, [[F13]])
+        self.assertFalse(self.matcher.pending)
+
+    def test_ambiguous_prefix_fires_short_mapping_on_timeout(self):
+        self.feed(F16)
+        self.assertEqual(self.matches, [])
+        self.scheduler.expire()
+        self.assertEqual(self.matches, [("f16", [F16])])
+
+    def test_ambiguous_prefix_completes_longer_sequence(self):
+        self.feed(F16)
+        self.feed(F16)
+        self.assertEqual(self.matches, [("f16 f16", [F16, F16])])
+
+    def test_ambiguous_prefix_interrupted_fires_short_mapping(self):
+        self.feed(F16)
+        self.assertEqual(self.feed(K), SEQ_FLUSHED)
+        self.assertEqual(self.matches, [("f16", [F16])])
+        self.assertEqual(self.flushes, [])
+
+    def test_stale_timeout_ignored(self):
+        self.feed(F13)
+        stale = self.scheduler.timers[0]
+        self.feed(J)
+        stale.func(*stale.args)
+        self.assertEqual(self.matches, [("f13 j", [F13, J])])
+        self.assertEqual(self.flushes, [])
+
+    def test_reset(self):
+        self.feed(F13)
+        self.matcher.reset()
+        self.assertEqual(self.flushes, [[F13]])
+        self.matcher.reset()
+        self.assertEqual(self.flushes, [[F13]])
+
+
+if __name__ == "__main__":
+    unittest.main()
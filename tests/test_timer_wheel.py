@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+分层时间轮测试（以显式时间推进）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper.utils.timer_wheel import TimerWheel
+
+
+class TimerWheelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.wheel = TimerWheel(tick=0.001)
+
+    def run_until(self, timer, limit: int = 100) -> int:
+        """按 next_expiry 驱动时间轮直到 timer 到期，返回唤醒次数"""
+        for wakeups in range(1, limit + 1):
+            expired = self.wheel.advance(self.wheel.next_expiry())
+            if timer in expired:
+                return wakeups
+        self.fail("定时器没有到期")
+
+    def test_empty_wheel_has_no_expiry(self):
+        self.assertIsNone(self.wheel.next_expiry())
+        self.assertEqual(self.wheel.advance(), [])
+
+    def test_level0_expiry(self):
+        timer = self.wheel.schedule(0.010, print)
+        self.assertEqual(self.wheel.advance(timer.when - 0.003), [])
+        self.assertEqual(self.wheel.advance(timer.when + 0.001), [timer])
+        self.assertEqual(self.wheel.pending, 0)
+
+    def test_cascading_levels(self):
+        # 0.1s 在第 1 层，5s 在第 2 层，300s 在第 3 层
+        for delay in (0.1, 5.0, 300.0):
+            timer = self.wheel.schedule(delay, print)
+            self.assertEqual(self.wheel.advance(timer.when - 0.005), [])
+            self.assertEqual(self.wheel.advance(timer.when + 0.001), [timer])
+        self.assertEqual(self.wheel.pending, 0)
+
+    def test_next_expiry_never_late(self):
+        for delay in (0.003, 0.2, 7.0, 500.0):
+            timer = self.wheel.schedule(delay, print)
+            self.assertLessEqual(self.wheel.next_expiry(), timer.when)
+            self.assertLessEqual(self.run_until(timer), 5)
+            # 按刻度到期，最多提前一个刻度
+            self.assertGreaterEqual(self.wheel._origin + self.wheel._tick * self.wheel.tick, timer.when - 0.001)
+
+    def test_beyond_top_level(self):
+        # 超出 4 层覆盖范围（约 4.6 小时）的定时器在顶层循环直到到期
+        timer = self.wheel.schedule(6 * 3600, print)
+        self.assertEqual(self.wheel.advance(timer.when - 1.0), [])
+        self.assertEqual(self.wheel.advance(timer.when + 0.001), [timer])
+
+    def test_expired_sorted_by_due_time(self):
+        late = self.wheel.schedule(0.300, print)
+        early = self.wheel.schedule(0.005, print)
+        middle = self.wheel.schedule(0.070, print)
+        self.assertEqual(self.wheel.advance(late.when + 0.001), [early, middle, late])
+
+    def test_already_due(self):
+        timer = self.wheel.schedule(0, print)
+        self.assertEqual(self.wheel.advance(), [timer])
+
+    def test_cancel(self):
+        keep = self.wheel.schedule(0.050, print)
+        drop = self.wheel.schedule(5.0, print)
+        drop.cancel()
+        self.assertEqual(self.wheel.pending, 1)
+        self.assertEqual(self.wheel.advance(drop.when + 0.001), [keep])
+        self.assertIsNone(self.wheel.next_expiry())
+
+    def test_reschedule(self):
+        timer = self.wheel.schedule(5.0, print)
+        self.wheel.reschedule(timer, 0.020)
+        self.assertEqual(self.wheel.pending, 1)
+        self.assertEqual(self.wheel.advance(timer.when + 0.001), [timer])
+        # 已到期的定时器重新加入
+        self.wheel.reschedule(timer, 0.5)
+        self.assertEqual(self.wheel.pending, 1)
+        self.assertLessEqual(self.run_until(timer), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
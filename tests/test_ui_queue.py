@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+界面命令队列测试
+运行方式:
+    python -m pytest tests
+"""
+
+import threading
+import unittest
+
+from wheel_tool.ui.ui_queue import UiCommandQueue
+
+
+class FakeRoot:
+    """记录唤醒事件和 after 预约的假 Tk 根窗口，由测试代替主循环逐个处理"""
+
+    def __init__(self):
+        self.bindings = {}
+        self.events = []  # 待处理的虚拟事件
+        self.afters = []  # 待执行的 after 回调
+        self.threads = set()  # 调用 after 的线程
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def event_generate(self, sequence, when=None):
+        self.events.append(sequence)
+
+    def after(self, ms, func):
+        self.threads.add(threading.current_thread().name)
+        self.afters.append((ms, func))
+        return len(self.afters)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run_events(self):
+        events, self.events = self.events, []
+        for sequence in events:
+            self.bindings[sequence](None)
+
+    def run_afters(self):
+        afters, self.afters = self.afters, []
+        for _, func in afters:
+            func()
+
+
+class UiCommandQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.queue = UiCommandQueue(self.root)
+        self.queue.start()
+        self.out = []
+
+    def test_idle_has_no_wakeups(self):
+        self.assertEqual(self.root.events, [])
+        self.assertEqual(self.root.afters, [])
+
+    def test_wake_once_and_merge(self):
+        worker = threading.Thread(
+            target=lambda: [self.queue.post('hint', self.out.append, i) for i in range(5)])
+        worker.start()
+        worker.join()
+        # 其他线程只发出一次唤醒事件，不调用 after
+        self.assertEqual(len(self.root.events), 1)
+        self.assertEqual(self.root.threads, set())
+        self.root.run_events()
+        self.assertEqual(self.out, [4])
+        self.assertEqual(self.queue.merged, 4)
+
+    def test_frame_cadence_only_while_pending(self):
+        self.queue.post(None, self.out.append, 1)
+        self.root.run_events()
+        self.assertEqual(len(self.root.afters), 1)  # 执行后预约下一帧
+        self.queue.post(None, self.out.append, 2)
+        self.assertEqual(self.root.events, [])  # 已预约下一帧，不再唤醒
+        self.root.run_afters()
+        self.assertEqual(self.out, [1, 2])
+        self.root.run_afters()  # 这一帧没有命令：停止
+        self.assertEqual(self.root.afters, [])
+        self.queue.post(None, self.out.append, 3)
+        self.assertEqual(len(self.root.events), 1)
+        self.root.run_events()
+        self.assertEqual(self.out, [1, 2, 3])
+
+    def test_posts_before_start(self):
+        queue = UiCommandQueue(FakeRoot())
+        queue.post('mode', self.out.append, 1)
+        self.assertEqual(queue.root.events, [])
+        queue.start()
+        self.assertEqual(self.out, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
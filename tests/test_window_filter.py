@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+窗口过滤规则测试
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper.utils.window_filter import RuleSet, WindowFilter
+
+
+class FakeSource:
+    """只提供类名和进程名查询的窗口来源"""
+
+    def get_class_name(self, hwnd: int) -> str:
+        return ""
+
+    def get_process_name(self, hwnd: int) -> str:
+        return ""
+
+
+class RuleSetPatternTest(unittest.TestCase):
+
+    def matches(self, rules: RuleSet, title: str) -> bool:
+        return rules.matches(FakeSource(), 1, title)
+
+    def test_global_inline_flag(self):
+        rules = RuleSet({"patterns": ["(?i)chrome", "^Editor$"]})
+        self.assertEqual(rules.errors, [])
+        self.assertTrue(self.matches(rules, "Google CHROME"))
+        self.assertTrue(self.matches(rules, "Editor"))
+        self.assertFalse(self.matches(rules, "editor"))
+
+    def test_numbered_backreference(self):
+        rules = RuleSet({"patterns": ["^Editor$", r"(\w+) - \1"]})
+        self.assertEqual(rules.errors, [])
+        self.assertTrue(self.matches(rules, "foo - foo"))
+        self.assertFalse(self.matches(rules, "foo - bar"))
+        self.assertFalse(self.matches(rules, "Editor - x"))
+
+    def test_invalid_pattern_reported(self):
+        rules = RuleSet({"patterns": ["(", "ok"]})
+        self.assertEqual(len(rules.errors), 1)
+        self.assertTrue(self.matches(rules, "ok"))
+
+    def test_window_filter_with_flags(self):
+        window_filter = WindowFilter({"include": {}, "exclude": {"patterns": ["(?i)overlay"]}})
+        self.assertFalse(window_filter.accepts(FakeSource(), 1, "NVIDIA OVERLAY"))
+        self.assertTrue(window_filter.accepts(FakeSource(), 1, "Notepad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
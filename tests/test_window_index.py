@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+增量窗口索引测试（使用内存窗口事件源）
+运行方式:
+    python -m pytest tests
+"""
+
+import unittest
+
+from key_mapper.utils.window_filter import WindowFilter
+from key_mapper.utils.window_index import FakeWindowSource, TitleIndex, WindowIndex, WindowInfo, WindowQuery
+
+
+class WindowIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = FakeWindowSource()
+        self.editor = self.source.create("Editor", process="code.exe")
+        self.browser = self.source.create("Browser", process="chrome.exe")
+        self.terminal = self.source.create("Terminal", process="wt.exe")
+        self.source.activate(self.terminal)
+        self.index = WindowIndex(self.source, WindowFilter({"exclude": {"titles": ["Program Manager"]}}))
+        self.index.start()
+
+    def titles(self):
+        return [win.title for win in self.index.windows()]
+
+
+class MruOrderTest(WindowIndexTestCase):
+
+    def test_initial_order_follows_z_order(self):
+        self.assertEqual(self.titles(), ["Terminal", "Browser", "Editor"])
+
+    def test_foreground_moves_to_front(self):
+        self.source.activate(self.editor)
+        self.assertEqual(self.titles(), ["Editor", "Terminal", "Browser"])
+        self.assertEqual(self.index.foreground().hwnd, self.editor)
+
+    def test_new_window_is_most_recent(self):
+        self.source.create("Notes")
+        self.assertEqual(self.titles()[0], "Notes")
+
+    def test_destroy_and_hide(self):
+        self.source.destroy(self.browser)
+        self.source.hide(self.editor)
+        self.assertEqual(self.titles(), ["Terminal"])
+        self.source.show(self.editor)
+        self.assertIn("Editor", self.titles())
+
+    def test_title_change(self):
+        self.source.set_title(self.browser, "Docs - Browser")
+        self.assertEqual(self.index.get(self.browser).title, "Docs - Browser")
+        self.assertEqual(self.index.find(WindowQuery("docs")).hwnd, self.browser)
+
+    def test_filter(self):
+        self.source.create("Program Manager")
+        self.assertNotIn("Program Manager", self.titles())
+        self.index.set_filter(WindowFilter({"include": {"processes": ["chrome.exe"]}}))
+        self.assertEqual(self.titles(), ["Browser"])
+
+    def test_virtual_desktops(self):
+        self.source.move_to_desktop(self.editor, 1)
+        self.assertEqual(self.titles(), ["Terminal", "Browser"])
+        self.source.switch_desktop(1)
+        self.assertEqual(self.titles(), ["Editor"])
+
+
+class CycleSessionTest(WindowIndexTestCase):
+
+    def jump(self, steps: int) -> str:
+        """模拟窗口切换器：跳转后立即记录前台窗口"""
+        win = self.index.jump(steps)
+        self.index.set_foreground(win.hwnd)
+        return win.title
+
+    def test_session_keeps_starting_order(self):
+        self.assertEqual(self.jump(1), "Browser")
+        # MRU 顺序已变为 Browser, Terminal, Editor，但同一次切换过程继续沿开始时的顺序
+        self.assertEqual(self.jump(1), "Editor")
+        self.assertEqual(self.jump(-1), "Browser")
+
+    def test_coalesced_steps(self):
+        self.assertEqual(self.jump(2), "Editor")
+        self.assertEqual(self.jump(1), "Terminal")  # 回绕
+
+    def test_new_session_after_timeout(self):
+        self.assertEqual(self.jump(1), "Browser")
+        self.index._cycle_at -= WindowIndex.CYCLE_SESSION + 1
+        # 新的切换过程从新的 MRU 顺序开始：Browser, Terminal, Editor
+        self.assertEqual(self.jump(1), "Terminal")
+
+    def test_new_session_when_foreground_changes(self):
+        self.assertEqual(self.jump(1), "Browser")
+        self.source.activate(self.editor)  # 用户自己切换了窗口
+        self.assertEqual(self.jump(1), "Browser")
+
+    def test_closed_window_skipped(self):
+        self.assertEqual(self.jump(1), "Browser")
+        self.source.destroy(self.editor)
+        self.assertEqual(self.jump(1), "Terminal")
+
+    def test_single_window(self):
+        self.source.destroy(self.editor)
+        self.source.destroy(self.browser)
+        self.assertIsNone(self.index.jump(1))
+
+
+class TitleIndexTest(unittest.TestCase):
+
+    def test_candidates(self):
+        titles = TitleIndex()
+        titles.add(1, "Visual Studio Code", "Code.exe")
+        titles.add(2, "Google Chrome", "chrome.exe")
+        self.assertEqual(titles.candidates("studio"), [1])
+        self.assertEqual(titles.candidates("chrome"), [2])
+        self.assertEqual(sorted(titles.candidates(".exe")), [1, 2])
+        self.assertEqual(titles.candidates("firefox"), [])
+
+    def test_short_term_and_update(self):
+        titles = TitleIndex()
+        titles.add(1, "vi", "")
+        self.assertEqual(titles.candidates("vi"), [1])
+        titles.add(1, "Notes", "")
+        self.assertEqual(titles.candidates("vi"), [])
+        self.assertEqual(titles.candidates("note"), [1])
+        titles.remove(1)
+        self.assertEqual(titles.candidates("note"), [])
+
+
+class WindowQueryTest(unittest.TestCase):
+
+    def test_terms(self):
+        self.assertEqual(WindowQuery(" Code | vscode |code").terms, ("code", "vscode"))
+        with self.assertRaises(ValueError):
+            WindowQuery(" | ")
+
+    def test_score_order(self):
+        query = WindowQuery("code")
+        scores = [
+            query.score("code", WindowInfo(1, "Code")),  # 完整标题
+            query.score("code", WindowInfo(2, "x", "Code.exe")),  # 进程名
+            query.score("code", WindowInfo(3, "Code - main.py")),  # 标题开头
+            query.score("code", WindowInfo(4, "Visual Studio Code")),  # 单词开头
+            query.score("code", WindowInfo(5, "Unicode table")),  # 包含
+        ]
+        self.assertEqual(scores, [5, 4, 3, 2, 1])
+
+
+class FindTest(WindowIndexTestCase):
+
+    def test_best_match(self):
+        self.source.create("Code - notes.md", process="notepad.exe")
+        # 进程名匹配优先于标题开头匹配
+        self.assertEqual(self.index.find(WindowQuery("code")).hwnd, self.editor)
+        self.assertEqual(self.index.find(WindowQuery("vscode|code - notes")).title, "Code - notes.md")
+        self.assertIsNone(self.index.find(WindowQuery("firefox")))
+
+    def test_rotates_between_same_name(self):
+        second = self.source.create("Browser")
+        self.source.activate(second)
+        self.assertEqual(self.index.find(WindowQuery("browser")).hwnd, self.browser)
+        self.source.activate(self.browser)
+        self.assertEqual(self.index.find(WindowQuery("browser")).hwnd, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
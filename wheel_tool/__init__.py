@@ -2,22 +2,36 @@
 """
 Wheel Tool Module
 圆盘模式切换工具模块
+
+包级名称按需导入：应用、托盘图标依赖 winreg / pystray（仅 Windows 桌面环境可用），
+只导入 wheel_tool.input 等子模块的脚本（回放、基准测试）在其他平台上也能运行
 """
 
-from .ui.disk import WheelDisk
-from .ui.renderer import RenderEngine, Antialiasing, Graphics
-from .config.settings import GlobalConfig, AppSettings
-from .system.app import WheelToolApp
-from .input.controller import ModeController
-from .input.hotkey_listener import HotkeyListener
-from .system.tray_icon import TrayIcon
-
-__all__ = [
-    'WheelDisk',
-    'RenderEngine', 'Antialiasing', 'Graphics',
-    'GlobalConfig', 'AppSettings',
-    'WheelToolApp',
-    'ModeController',
-    'HotkeyListener',
-    'TrayIcon'
-]
\ No newline at end of file
+import importlib
+
+# 名称 -> 所在子模块
+_EXPORTS = {
+    'WheelDisk': '.ui.disk',
+    'RenderEngine': '.ui.renderer', 'Antialiasing': '.ui.renderer', 'Graphics': '.ui.renderer',
+    'GlobalConfig': '.config.settings', 'AppSettings': '.config.settings',
+    'WheelToolApp': '.system.app',
+    'ModeController': '.input.controller',
+    'HotkeyListener': '.input.hotkey_listener',
+    'TrayIcon': '.system.tray_icon',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """首次访问时导入对应子模块"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -46,7 +46,46 @@ class AppSettings:
                 "next_mode": "ctrl+alt+shift+-",
                 "prev_mode": "ctrl+alt+shift+=",
                 "open_settings": "ctrl+alt+shift+s",
-                "hide_disk": "esc"
+                "hide_disk": "esc",
+                "toggle_pause": "ctrl+alt+shift+p"
+            },
+            "input": {
+                "backend": "native",  # native: 真实键盘鼠标 / memory: 内存假后端（测试用）
+                "sequence_timeout_ms": 500  # 按键序列等待下一个按键的超时
+            },
+            "executor": {
+                "queue_size": 64,
+                "overflow": "drop_oldest",  # drop_oldest / merge / block
+                "scroll_coalesce_ms": 8,  # 滚轮合并窗口，0 表示不合并
+                "window_cycle_coalesce_ms": 40  # 连续窗口切换合并成一次跳转的窗口，0 表示不合并
+            },
+            "commands": {
+                "shell_workers": 2,  # 常驻 shell 数，即需要 shell 的命令的并发上限
+                "max_children": 16,  # 同时处于启动阶段（启动后 1 秒内）的子进程上限，已启动的程序不占用
+                "timeout_s": 0,  # 直接启动的进程超时后结束，0 表示不限制（启动的程序通常需要一直运行）
+                "shell_timeout_s": 30  # shell 命令超时后结束该 shell 并换用新的 shell，0 表示不限制
+            },
+            "window_filter": {
+                # 窗口切换包含哪些窗口：include 非空时只包含匹配的窗口，再排除匹配 exclude 的窗口
+                # 每组可包含 titles（完整标题）、keywords（标题关键词）、patterns（标题正则）、
+                # classes（窗口类名）、processes（进程名，如 explorer.exe）
+                "include": {},
+                "exclude": {
+                    "titles": ["Program Manager", "Windows Input Experience", "Microsoft Text Input Application"],
+                    "keywords": ["Overlay", "ToastWindow"],
+                    "patterns": [],
+                    "classes": [],
+                    "processes": []
+                }
+            },
+            "watchdog": {
+                "enabled": True,
+                "budget_ms": 50,  # 单次钩子回调的时间预算，超出时记录调用栈
+                "dead_hook_s": 5  # 有按键按下却收不到事件多久判定钩子失效并重装，0 表示不检测
+            },
+            "diagnostics": {
+                "latency_enabled": False,
+                "latency_dump_path": "latency_stats.json"
             },
             "tray": {
                 "enable": True,
@@ -25,7 +25,7 @@ class ModeController:
 
     def switch_to_mode(self, mode_index: int):
         """切换到指定模式"""
-        if hasattr(self.disk, 'current_mode') and 0 <= mode_index < len(self.disk.MODES):
+        if hasattr(self.disk, 'current_mode') and 0 <= mode_index < self.get_mode_count():
             self.disk.current_mode = mode_index
             if hasattr(self.disk, 'update_display'):
                 self.disk.update_display()
@@ -36,7 +36,8 @@ class ModeController:
 
     def get_mode_count(self) -> int:
         """获取模式总数"""
-        return len(getattr(self.disk, 'MODES', []))
+        mode_state = getattr(self.disk, 'mode_state', None)
+        return mode_state.mode_count if mode_state else len(getattr(self.disk, 'MODES', []))
 
     def is_mode_valid(self, mode_index: int) -> bool:
         """检查模式索引是否有效"""
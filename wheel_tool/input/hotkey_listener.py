@@ -4,30 +4,155 @@
 提供跨平台热键监听功能
 """
 
-import keyboard as kb
-from typing import Optional, Callable, Any
+import time
+from typing import Optional, Callable, Any, Dict, List, Tuple
+from key_mapper.backends import InputBackend, KEY_UP, get_backend
+from key_mapper.core.action_queue import ActionQueue
+from key_mapper.core.mode_state import ModeState
+from key_mapper.utils.command_runner import get_command_runner
+from key_mapper.utils.helpers import MODIFIER_BITS, MODIFIER_MASKS, split_modifiers
+from key_mapper.utils.latency import get_latency_stats
+from key_mapper.utils.scheduler import get_scheduler
 from ..ui.hint_overlay import HintOverlay
 from ..config.settings import GlobalConfig
+from .sequence import SequenceMatcher, SequenceNode, SEQ_CONSUMED, SEQ_FLUSHED
+from .watchdog import HookWatchdog
+
+
+class KeyEntry:
+    """分发表条目 - 同一物理按键上的热键与映射"""
+
+    __slots__ = ('hotkeys', 'mode', 'mapping')
+
+    def __init__(self):
+        self.hotkeys: List[Callable] = []  # 热键回调
+        self.mode = None  # 映射所属模式
+        self.mapping = None  # KeyMapping
+
+
+def pack_key(mask: int, code: int) -> int:
+    """(修饰键掩码, 扫描码) 打包为分发表的整数键"""
+    return (mask << 16) | code
 
 
 class HotkeyListener:
-    """全局热键监听器 - 使用keyboard库(跨平台)"""
+    """全局热键监听器 - 钩子与注入通过可替换的输入后端完成
+
+    只安装一个全局低级钩子，钩子自行维护修饰键位掩码，按键事件通过预先计算的
+    {(修饰键掩码 << 16) | scan_code: KeyEntry} 分发表做一次整数键查找即可决定屏蔽或放行，
+    每次按键的开销与映射数量、模式数量无关。
+    不带修饰键的源键展开到所有修饰键组合，带修饰键的源键（如 "ctrl+f16"）只匹配完全相同的组合并优先。
+    按键序列映射（如 "f13 j"）另有每个模式一棵前缀树，由 SequenceMatcher 逐键匹配。
+    当前模式的分发表通过 ModeState 快照读取，模式切换在钩子线程中直接发布新快照，
+    下一个按键即按新模式分发，圆盘界面只是观察者。
+    钩子回调只做屏蔽决定，动作交给 ActionQueue 的执行线程异步执行。
+    """
+
+    # 热键名 -> (默认组合键)
+    DEFAULT_HOTKEYS = {
+        'prev_mode': 'ctrl+alt+shift+=',
+        'next_mode': 'ctrl+alt+shift+-',
+        'open_settings': 'ctrl+alt+shift+s',
+        'hide_disk': 'esc',
+        'toggle_pause': 'ctrl+alt+shift+p',
+    }
+    HOTKEY_LABELS = {
+        'prev_mode': '上一模式',
+        'next_mode': '下一模式',
+        'open_settings': '打开设置面板',
+        'hide_disk': '隐藏圆盘',
+        'toggle_pause': '暂停/恢复',
+    }
 
-    def __init__(self, disk, controller, mode_manager=None, settings_panel=None):
+    # 修饰键名 -> 用于解析扫描码的按键名（左右两侧）
+    MODIFIER_KEYS = {
+        'ctrl': ('ctrl', 'right ctrl'),
+        'alt': ('alt', 'right alt'),
+        'shift': ('shift', 'right shift'),
+        'win': ('left windows', 'right windows'),
+    }
+
+    REPLAY_GRACE = 0.05  # 补发按键后，其按下事件在钩子中直接放行的时长（秒）
+
+    def __init__(self, disk, controller, mode_manager=None, settings_panel=None,
+                 backend: InputBackend = None):
         self.disk = disk
         self.controller = controller
         self.mode_manager = mode_manager
         self.settings_panel = settings_panel
         self.running = False
         self.is_paused = False  # 暂停状态
+        self.on_pause_toggle: Optional[Callable] = None  # 暂停热键回调（由托盘接管以同步图标），未设置时直接切换
         self.hint_overlay = None  # 提示悬浮窗
+        self.backend = backend or get_backend()  # 输入输出后端
+
+        # 当前模式状态，与圆盘共享
+        self.mode_state: ModeState = mode_manager.mode_state if mode_manager else disk.mode_state
+        self._suppressed: set = set()  # 已屏蔽按下事件的扫描码，对应的抬起事件也要屏蔽
+        self._modifier_codes: Dict[int, int] = {}  # 修饰键扫描码 -> 位
+        self._modifiers_down: Dict[int, int] = {}  # 按住的修饰键扫描码 -> 位
+        self._modifiers = 0  # 当前修饰键位掩码
+        self._replaying: set = set()  # 正在补发的扫描码，补发产生的按下事件不再参与匹配
+        self._sequence = SequenceMatcher(self._on_sequence_match, self._on_sequence_flush)
+        self.action_queue: Optional[ActionQueue] = None  # 异步动作队列
+        self.latency = get_latency_stats()  # 延迟统计
+        self.watchdog: Optional[HookWatchdog] = None  # 钩子看门狗
+
+        # 增量重建用的缓存
+        self._hotkey_config: Dict[str, str] = {}  # 热键名 -> 组合键字符串
+        self._hotkey_entries: Dict[int, List[Callable]] = {}
+        self._resume_keys: frozenset = frozenset()  # 暂停/恢复热键的打包键，暂停时只检测这些键
+        self._mode_tables: List[Dict[int, Any]] = []  # 每个模式的 {打包键: KeyMapping}
+        self._mode_tries: List[SequenceNode] = []  # 每个模式的序列前缀树
+        self._mode_signatures: List[tuple] = []  # 每个模式映射的快照，用于比较变化
 
     def set_pause_state(self, paused: bool):
-        """设置暂停状态"""
+        """设置暂停状态
+
+        暂停时把拦截钩子换成只监听的钩子，只检测暂停/恢复热键，其他按键没有任何屏蔽或补发；
+        恢复时重新安装拦截钩子，分发表仍是缓存的快照，无需重建。
+        """
+        if paused == self.is_paused:
+            return
         self.is_paused = paused
+        if self.running:
+            if paused:
+                # 等待中的序列按原顺序补发
+                self._sequence.reset()
+            else:
+                # 暂停期间抬起的按键不会再经过拦截钩子
+                self._suppressed.clear()
+            self._install_hook()
         status = "已暂停" if paused else "已恢复"
         print(f"热键监听器{status}")
 
+    def _install_hook(self):
+        """按暂停状态安装拦截钩子或只监听的钩子"""
+        callback = self._on_paused_event if self.is_paused else self._on_key_event
+        if self.watchdog:
+            callback = self.watchdog.wrap(callback)
+        self.backend.hook(callback, suppress=not self.is_paused)
+
+    def reinstall_hook(self):
+        """钩子被系统移除后重新安装（看门狗线程）"""
+        if self.running:
+            self.backend.reinstall()
+            self._install_hook()
+
+    def entry_for(self, scan_code: int) -> Optional[KeyEntry]:
+        """当前模式和修饰键状态下某个按键的分发表条目"""
+        return self.mode_state.snapshot.table.get(pack_key(self._modifiers, scan_code))
+
+    def _on_pause_hotkey(self):
+        """暂停/恢复热键 - 更换钩子不能在钩子回调中进行，交给执行线程"""
+        self.action_queue.put(self._toggle_pause, priority=True)
+
+    def _toggle_pause(self):
+        if self.on_pause_toggle:
+            self.on_pause_toggle()
+        else:
+            self.set_pause_state(not self.is_paused)
+
     def start(self):
         """开始监听"""
         self.running = True
@@ -36,26 +161,51 @@ class HotkeyListener:
         self.hint_overlay = HintOverlay(parent=self.disk.root)
         self.hint_overlay.create_window()
 
-        # 从配置文件读取热键设置
-        prev_mode_key = GlobalConfig.get('hotkeys.prev_mode', 'ctrl+alt+shift+=')
-        next_mode_key = GlobalConfig.get('hotkeys.next_mode', 'ctrl+alt+shift+-')
-        open_settings_key = GlobalConfig.get('hotkeys.open_settings', 'ctrl+alt+shift+s')
-        hide_disk_key = GlobalConfig.get('hotkeys.hide_disk', 'esc')
+        self.latency.enabled = GlobalConfig.get('diagnostics.latency_enabled', False)
+
+        # 启动动作执行线程
+        self.action_queue = ActionQueue(
+            GlobalConfig.get('executor.queue_size', 64),
+            GlobalConfig.get('executor.overflow', 'drop_oldest'),
+        )
+        self.action_queue.start()
+        # 模式状态的观察者（圆盘界面）在执行线程中通知，不占用钩子线程
+        self.mode_state.dispatch = lambda func, *args: self.action_queue.put(func, *args, priority=True)
+        if self.mode_manager:
+            # 窗口切换（合并后的跳转、前台确认）和宏延时之后的步骤在执行线程中进行，不占用调度线程
+            self.mode_manager.set_action_dispatch(
+                lambda func, *args: self.action_queue.put(func, *args, block=False))
+            self.mode_manager.set_scroll_window(GlobalConfig.get('executor.scroll_coalesce_ms', 8))
+            self.mode_manager.set_cycle_window(GlobalConfig.get('executor.window_cycle_coalesce_ms', 40))
+            self.mode_manager.set_window_filter(GlobalConfig.get('window_filter', None))
+        self._sequence.timeout = GlobalConfig.get('input.sequence_timeout_ms', 500) / 1000.0
+
+        # 命令执行器：预先启动常驻 shell
+        runner = get_command_runner()
+        runner.configure(
+            GlobalConfig.get('commands.shell_workers', 2),
+            GlobalConfig.get('commands.max_children', 16),
+            GlobalConfig.get('commands.timeout_s', 0),
+            GlobalConfig.get('commands.shell_timeout_s', 30),
+        )
+        runner.start()
 
-        # 注册热键组合
-        kb.add_hotkey(prev_mode_key, lambda: self._handle_mode_switch('prev'))
-        kb.add_hotkey(next_mode_key, lambda: self._handle_mode_switch('next'))
-        kb.add_hotkey(open_settings_key, lambda: self.disk.root.after(0, self._open_settings))
-        kb.add_hotkey(hide_disk_key, lambda: self.disk.root.after(0, self.disk.hide))
+        # 看门狗：回调超时诊断与失效钩子自动重装
+        if GlobalConfig.get('watchdog.enabled', True):
+            self.watchdog = HookWatchdog(
+                self,
+                GlobalConfig.get('watchdog.budget_ms', 50),
+                GlobalConfig.get('watchdog.dead_hook_s', 5),
+            )
+            self.watchdog.start()
 
-        # 注册需要屏蔽的映射按键
-        self._register_mapped_keys()
+        # 构建分发表并安装唯一的全局钩子
+        self.reload()
+        self._install_hook()
 
         print("热键监听已启动:")
-        print(f"  {prev_mode_key.upper():<25}: 上一模式")
-        print(f"  {next_mode_key.upper():<25}: 下一模式")
-        print(f"  {open_settings_key.upper():<25}: 打开设置面板")
-        print(f"  {hide_disk_key.upper():<25}: 隐藏圆盘")
+        for name, label in self.HOTKEY_LABELS.items():
+            print(f"  {self._hotkey_config[name].upper():<25}: {label}")
 
     def _handle_mode_switch(self, direction):
         """处理模式切换"""
@@ -63,61 +213,305 @@ class HotkeyListener:
             print(f"暂停状态中，无法切换{direction}模式")
             return
         
-        if direction == 'prev':
-            self.disk.root.after(0, self.disk.prev_mode)
-        else:
-            self.disk.root.after(0, self.disk.next_mode)
+        self.latency.begin_mode_switch()
 
-    def _register_mapped_keys(self):
-        """为所有可能的映射按键注册钩子"""
-        # 收集所有模式中的源按键
-        all_keys = set()
-        if self.mode_manager:
-            for mode in self.mode_manager.modes:
-                for key in mode.mappings.keys():
-                    all_keys.add(key)
+        # 直接发布新的模式快照，圆盘动画经优先通道通知，先于已排队的普通动作执行
+        self.mode_state.step(1 if direction == 'prev' else -1)
 
-        # 为每个按键注册带suppress的钩子
-        for key in all_keys:
-            kb.on_press_key(key, lambda e, k=key: self._handle_mapped_key(k), suppress=True)
+    def _resolve_scan_codes(self, key_name: str) -> tuple:
+        """将按键名解析为扫描码，无法识别时返回空元组"""
+        return self.backend.resolve_scan_codes(key_name)
 
-    def _handle_mapped_key(self, key_name):
-        """处理映射按键"""
-        # 如果暂停状态，直接发送原按键
-        if self.is_paused:
-            kb.send(key_name)
-            return
+    def _hotkey_callbacks(self) -> Dict[str, Callable]:
+        """热键名 -> 回调"""
+        return {
+            'prev_mode': lambda: self._handle_mode_switch('prev'),
+            'next_mode': lambda: self._handle_mode_switch('next'),
+            'open_settings': lambda: self.disk.ui_queue.post('settings', self._open_settings),
+            'hide_disk': lambda: self.disk.ui_queue.post('hide', self.disk.hide),
+            'toggle_pause': self._on_pause_hotkey,
+        }
 
-        if not self.mode_manager:
-            kb.send(key_name)
-            return
+    def _build_modifier_codes(self) -> Dict[int, int]:
+        """解析修饰键扫描码 -> 位"""
+        modifier_codes = {}
+        for name, key_names in self.MODIFIER_KEYS.items():
+            for key_name in key_names:
+                for code in self._resolve_scan_codes(key_name):
+                    modifier_codes[code] = MODIFIER_BITS[name]
+        return modifier_codes
 
-        # 检查映射
-        self.mode_manager.set_current_index(self.disk.current_mode)
-        mode = self.mode_manager.get_current_mode()
+    def _parse_source(self, key_str: str) -> Tuple[int, tuple]:
+        """按键字符串 -> (修饰键掩码, 扫描码元组)，无法识别时扫描码为空"""
+        try:
+            mask, key = split_modifiers(key_str)
+        except ValueError:
+            return 0, ()
+        return mask, self._resolve_scan_codes(key) if key else ()
 
-        if mode.enabled and key_name in mode.mappings:
-            mapping = mode.mappings[key_name]
+    def _build_hotkey_entries(self, hotkey_config: Dict[str, str]) -> Dict[int, list]:
+        """解析热键配置为 {打包键: [回调]}
 
-            # 使用新的 execute_mapping 方法（支持不同的 action_type）
-            # 这会自动处理 keyboard、mouse_scroll、mouse_click、command 等类型
-            should_block = mode.execute_mapping(key_name)
+        按住的修饰键多于热键要求时同样触发（与原先逐个检查修饰键的行为一致）。
+        """
+        callbacks = self._hotkey_callbacks()
+        hotkey_entries: Dict[int, List[Callable]] = {}
+        for name, combo in hotkey_config.items():
+            mask, codes = self._parse_source(combo)
+            if not codes:
+                print(f"[热键] 无法识别的热键: {combo}")
+            for code in codes:
+                for held in range(MODIFIER_MASKS):
+                    if held & mask == mask:
+                        hotkey_entries.setdefault(pack_key(held, code), []).append(callbacks[name])
+        return hotkey_entries
 
-            print(f"  -> 映射执行: {key_name} -> {mapping.target_key} (类型: {mapping.action_type})")
+    def _mode_signature(self, mode) -> tuple:
+        """模式映射快照 - 映射对象被替换、增删或启用状态变化时快照不同"""
+        return (mode.enabled, tuple((src, id(m), id(m.action)) for src, m in mode.mappings.items()))
 
-            # 显示提示文本（已经在 execute_mapping 中处理，这里保留兼容性）
-            if self.hint_overlay and hasattr(mapping, 'hint') and mapping.hint:
-                try:
-                    self.disk.root.after(0, lambda: self.hint_overlay.show(mapping.hint))
-                except:
-                    pass
+    def _build_mode_table(self, mode) -> Dict[int, Any]:
+        """构建单个模式的 {打包键: KeyMapping}"""
+        table = {}
+        if not mode.enabled:
+            return table
+        qualified = []
+        for source_key, mapping in mode.mappings.items():
+            if mapping.is_sequence:
+                continue
+            mask, codes = self._parse_source(source_key)
+            if not codes:
+                print(f"[热键] 无法识别的源按键: {source_key} ({mode.name})")
+            for code in codes:
+                if mask:
+                    qualified.append((pack_key(mask, code), mapping))
+                else:
+                    for held in range(MODIFIER_MASKS):
+                        table[pack_key(held, code)] = mapping
+        # 带修饰键的映射覆盖同组合下的单键映射
+        table.update(qualified)
+        return table
+
+    def _build_mode_trie(self, mode, table: Dict[int, Any]) -> SequenceNode:
+        """构建单个模式的序列前缀树
+
+        与序列首键相同的单键映射挂在首键节点上，成为歧义前缀，超时后触发。
+        """
+        root = SequenceNode()
+        if not mode.enabled:
+            return root
+        for source_key, mapping in mode.mappings.items():
+            if not mapping.is_sequence:
+                continue
+            nodes = [root]
+            for key in source_key.split():
+                mask, codes = self._parse_source(key)
+                if not codes:
+                    print(f"[热键] 无法识别的序列按键: {key} ({source_key}, {mode.name})")
+                    nodes = []
+                    break
+                nodes = [node.child(pack_key(mask, code)) for node in nodes for code in codes]
+            for node in nodes:
+                node.mode = mode
+                node.mapping = mapping
+        for key, node in root.children.items():
+            if key in table:
+                node.mode = mode
+                node.mapping = table[key]
+        return root
+
+    def reload(self):
+        """
+        重新加载映射和热键配置，只重建发生变化的部分
+
+        新的分发表构建完成后通过一次引用赋值整体替换，
+        钩子始终保持安装，重建期间的按键按旧表处理，不会丢失。
+        """
+        modes = self.mode_manager.modes if self.mode_manager else []
+        self._modifier_codes = self._build_modifier_codes()
+
+        # 热键配置
+        hotkey_config = {name: GlobalConfig.get(f'hotkeys.{name}', default)
+                         for name, default in self.DEFAULT_HOTKEYS.items()}
+        if hotkey_config != self._hotkey_config:
+            for name, combo in hotkey_config.items():
+                old = self._hotkey_config.get(name)
+                if old is not None and old != combo:
+                    print(f"[热键] {self.HOTKEY_LABELS[name]}: {old.upper()} -> {combo.upper()}")
+            self._hotkey_entries = self._build_hotkey_entries(hotkey_config)
+            self._hotkey_config = hotkey_config
+            self._resume_keys = frozenset(key for key, callbacks in self._hotkey_entries.items()
+                                          if self._on_pause_hotkey in callbacks)
+
+        # 各模式映射：只重建快照变化的模式
+        old_tables, old_signatures = self._mode_tables, self._mode_signatures
+        mode_tables, mode_tries, signatures = [], [], []
+        for i, mode in enumerate(modes):
+            signature = self._mode_signature(mode)
+            if i < len(old_signatures) and old_signatures[i] == signature:
+                mode_tables.append(old_tables[i])
+                mode_tries.append(self._mode_tries[i])
+            else:
+                table = self._build_mode_table(mode)
+                if i < len(old_tables):
+                    old_keys = {m.source_key for m in old_tables[i].values()}
+                    new_keys = {m.source_key for m in table.values()}
+                    added, removed = new_keys - old_keys, old_keys - new_keys
+                    if added or removed:
+                        print(f"[热键] {mode.name}: 新增 {sorted(added)} 移除 {sorted(removed)}")
+                mode_tables.append(table)
+                mode_tries.append(self._build_mode_trie(mode, table))
+            signatures.append(signature)
+        self._mode_tables, self._mode_signatures = mode_tables, signatures
+        self._mode_tries = mode_tries
+
+        # 合并为每个模式的完整分发表，整体替换
+        tables = []
+        for mode, mode_table in zip(modes or [None], mode_tables or [{}]):
+            table: Dict[int, KeyEntry] = {}
+            for code, entries in self._hotkey_entries.items():
+                table.setdefault(code, KeyEntry()).hotkeys.extend(entries)
+            for code, mapping in mode_table.items():
+                entry = table.setdefault(code, KeyEntry())
+                entry.mode = mode
+                entry.mapping = mapping
+            tables.append(table)
+        self.mode_state.set_tables(tables, mode_tries or [SequenceNode()])
+
+        # 等待中的序列按旧的前缀树结束
+        self._sequence.reset()
+
+
+    def _on_key_event(self, event) -> bool:
+        """全局钩子回调，返回 True 放行按键，返回 False 屏蔽按键
+
+        只有需要替换的按键才屏蔽；未映射、暂停或映射不屏蔽的按键都直接放行原事件，
+        唯一的例外是打断序列的按键，需要排在补发的缓冲按键之后。
+        """
+        t_hook = time.perf_counter_ns() if self.latency.enabled else 0
+        code = event.scan_code
+        bit = self._modifier_codes.get(code)
+        if bit:
+            self._track_modifier(event, bit)
+
+        if event.event_type == KEY_UP:
+            # 按下时被屏蔽的按键，抬起事件同样屏蔽
+            if code in self._suppressed:
+                self._suppressed.discard(code)
+                return False
+            return True
+
+        # 补发的按键不再参与匹配
+        if code in self._replaying:
+            return True
+
+        snapshot = self.mode_state.snapshot
+        key = pack_key(self._modifiers, code)
+        entry = snapshot.table.get(key)
+        if entry is None:
+            # 未映射的按键：原事件原样放行（保留时间戳和扫描码），不屏蔽后补发
+            if not self._sequence.pending and key not in snapshot.trie.children:
+                return True
+        else:
+            for callback in entry.hotkeys:
+                callback()
 
-            # 如果不屏蔽，发送原按键
-            if not should_block:
-                kb.send(key_name)
+        if self.is_paused or not self.mode_manager:
+            return True
+
+        # 序列匹配：没有等待中的序列且不是任何序列的首键时不进入匹配器，修饰键本身不打断序列
+        flushed = False
+        if not bit and (self._sequence.pending or key in snapshot.trie.children):
+            result = self._sequence.feed(snapshot.trie, key, event.name)
+            if result == SEQ_CONSUMED:
+                self._suppressed.add(code)
+                return False
+            flushed = result == SEQ_FLUSHED
+
+        # 没有映射，直接放行原按键
+        if entry is None or entry.mapping is None:
+            if flushed:
+                # 打断序列的按键排在补发按键之后，保持原始顺序
+                self.action_queue.put(self._replay_keys, [(code, event.name)])
+                self._suppressed.add(code)
+                return False
+            return True
+
+        if t_hook:
+            self.latency.record("lookup", entry.mapping.action_type, time.perf_counter_ns() - t_hook)
+
+        # 只做屏蔽决定，动作交给执行线程
+        self.action_queue.put(self._handle_mapped_key, entry.mode, entry.mapping, t_hook,
+                              key=(self._handle_mapped_key, entry.mode, entry.mapping))
+        if entry.mapping.block:
+            self._suppressed.add(code)
+            return False
+        return True
+
+    def _on_paused_event(self, event) -> bool:
+        """暂停时的监听回调：不拦截任何按键，只检测暂停/恢复热键"""
+        code = event.scan_code
+        bit = self._modifier_codes.get(code)
+        if bit:
+            self._track_modifier(event, bit)
+        elif event.event_type != KEY_UP and pack_key(self._modifiers, code) in self._resume_keys:
+            self._on_pause_hotkey()
+        return True
+
+    def _track_modifier(self, event, bit: int):
+        """维护修饰键位掩码"""
+        if event.event_type == KEY_UP:
+            self._modifiers_down.pop(event.scan_code, None)
+        else:
+            self._modifiers_down[event.scan_code] = bit
+        mask = 0
+        for held in self._modifiers_down.values():
+            mask |= held
+        self._modifiers = mask
+
+    def _handle_mapped_key(self, mode, mapping, t_hook: int = 0):
+        """处理映射按键（在动作执行线程中运行）
+
+        Args:
+            t_hook: 钩子入口时间戳 (perf_counter_ns)，未启用延迟统计时为 0
+        """
+        # 直接执行加载时预编译好的动作（支持不同的 action_type）
+        if t_hook:
+            t_start = time.perf_counter_ns()
+            mode.run_mapping(mapping)
+            t_end = time.perf_counter_ns()
+            action_type = mapping.action_type
+            self.latency.record("queue_wait", action_type, t_start - t_hook)
+            self.latency.record("execute", action_type, t_end - t_start)
+            self.latency.record("total", action_type, t_end - t_hook)
         else:
-            # 没有映射，发送原按键
-            kb.send(key_name)
+            mode.run_mapping(mapping)
+
+        print(f"  -> 映射执行: {mapping.source_key} -> {mapping.target_key} (类型: {mapping.action_type})")
+
+        # 显示提示文本，同一帧内只显示最新的提示
+        if self.hint_overlay and mapping.hint:
+            self.disk.ui_queue.post('hint', self.hint_overlay.show, mapping.hint)
+
+    def _on_sequence_match(self, mode, mapping, keys):
+        """序列完整匹配（钩子线程、调度线程或执行线程，持有序列匹配器的锁，入队不阻塞）"""
+        if not mapping.block:
+            self.action_queue.put(self._replay_keys, keys, block=False)
+        self.action_queue.put(self._handle_mapped_key, mode, mapping, block=False)
+
+    def _on_sequence_flush(self, keys):
+        """缓冲的按键不构成序列，按原顺序补发（钩子线程、调度线程或执行线程，入队不阻塞）"""
+        self.action_queue.put(self._replay_keys, keys, block=False)
+
+    def _replay_keys(self, keys):
+        """补发按键（在动作执行线程中运行）"""
+        codes = {key & 0xFFFF for key, _ in keys}  # 打包键 -> 扫描码
+        self._replaying.update(codes)
+        try:
+            for _, name in keys:
+                self.backend.send(name)
+        finally:
+            get_scheduler().call_later(self.REPLAY_GRACE, self._replaying.difference_update, codes)
 
     def _open_settings(self):
         """打开设置面板"""
@@ -127,13 +521,24 @@ class HotkeyListener:
     def stop(self):
         """停止监听"""
         if self.running:
-            kb.unhook_all()
+            self.backend.unhook()
+            self._sequence.reset()
+            self._suppressed.clear()
             self.running = False
 
+            if self.watchdog:
+                self.watchdog.stop()
+                self.watchdog = None
+
+            if self.action_queue:
+                self.action_queue.stop()
+            get_command_runner().shutdown()
+            self.mode_state.dispatch = ModeState.call_direct
+
             # 销毁提示窗口
             if self.hint_overlay:
                 try:
                     self.hint_overlay.destroy()
                 except:
                     pass
-                self.hint_overlay = None
\ No newline at end of file
+                self.hint_overlay = None
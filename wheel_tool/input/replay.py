@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+按键轨迹回放
+把录制的按键轨迹按原速或最快速度通过内存后端喂给 HotkeyListener、ModeManager 和 ActionExecutor，
+注入只记录不发送，用于在无真实钩子的环境下复现突发输入并测量吞吐和尾延迟
+"""
+
+import time
+from typing import Dict, List
+
+from key_mapper.backends import MemoryBackend, get_backend
+from key_mapper.core.action_queue import ActionQueue
+from key_mapper.utils.latency import LatencyHistogram
+from ..ui.ui_queue import UiCommandQueue
+from .hotkey_listener import HotkeyListener
+from .trace import TraceEvent, KEY_DOWN
+
+
+class _FakeRoot:
+    """假 Tk 根窗口 - after 回调立即执行"""
+
+    def after(self, ms, func=None, *args):
+        if func:
+            func(*args)
+
+    def after_cancel(self, timer_id):
+        pass
+
+
+class _FakeDisk:
+    """假圆盘 - 只观察模式状态并统计切换次数"""
+
+    def __init__(self, mode_state):
+        self.mode_state = mode_state
+        self.mode_state.add_observer(self._on_mode_changed)
+        self.root = _FakeRoot()
+        self.ui_queue = UiCommandQueue(self.root)
+        self.switches = 0
+
+    @property
+    def current_mode(self) -> int:
+        return self.mode_state.index
+
+    @current_mode.setter
+    def current_mode(self, index: int):
+        self.mode_state.set_index(index)
+
+    def _on_mode_changed(self, snapshot, direction: int):
+        if direction:
+            self.switches += 1
+
+    def next_mode(self):
+        self.mode_state.step(-1)
+
+    def prev_mode(self):
+        self.mode_state.step(1)
+
+    def hide(self):
+        pass
+
+
+class TraceReplayer:
+    """轨迹回放器"""
+
+    def __init__(self, mode_manager):
+        backend = get_backend()
+        if not isinstance(backend, MemoryBackend):
+            raise ValueError("轨迹回放需要 memory 后端，请在创建 ModeManager 之前调用 use_backend('memory')")
+        self.backend = backend
+        self.mode_manager = mode_manager
+        self.commands: List[str] = []
+        self.window_cycles: List[bool] = []
+        self.window_jumps: List[str] = []
+
+        # 命令和窗口切换不属于后端接口，替换为记录函数后重新编译
+        for mode in mode_manager.modes:
+            executor = mode.action_executor
+            executor._run_command = self._run_command
+            executor._cycle_window = self._cycle_window
+            executor._jump_to_window = self._jump_to_window
+            mode.compile()
+
+        self.disk = _FakeDisk(mode_manager.mode_state)
+        self.listener = HotkeyListener(self.disk, None, mode_manager, backend=backend)
+
+    def _run_command(self, command) -> bool:
+        self.commands.append(command.text)
+        return True
+
+    def _cycle_window(self, forward: bool) -> bool:
+        self.window_cycles.append(forward)
+        return True
+
+    def _jump_to_window(self, query) -> bool:
+        self.window_jumps.append(query.pattern)
+        return True
+
+    def _bind_scan_codes(self, events: List[TraceEvent]):
+        """按轨迹中的 名称->扫描码 对应关系解析按键"""
+        codes: Dict[str, int] = {}
+        for e in events:
+            codes.setdefault(e.name.lower(), e.scan_code)
+        self.backend.bind_scan_codes(codes)
+
+    def replay(self, events: List[TraceEvent], realtime: bool = False,
+               settle: float = 0.05) -> dict:
+        """
+        回放轨迹
+
+        Args:
+            events: 按键事件序列
+            realtime: True 按原始时间间隔回放，False 以最快速度回放
+            settle: 队列清空后额外等待的秒数（等待滚轮合并窗口结束）
+
+        Returns:
+            dict: 吞吐、钩子延迟和注入统计
+        """
+        listener = self.listener
+        self._bind_scan_codes(events)
+        listener.latency.enabled = True
+        listener.latency.reset()
+        listener.action_queue = ActionQueue(maxsize=max(64, len(events)))
+        listener.action_queue.start()
+        listener.reload()
+        self.backend.clear()
+        self.backend.hook(listener._on_key_event)
+
+        hook_hist = LatencyHistogram()
+        suppressed = 0
+        start = time.perf_counter_ns()
+        for e in events:
+            if realtime:
+                delay = (start + e.time_ns - time.perf_counter_ns()) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+            t0 = time.perf_counter_ns()
+            passed = self.backend.feed(e)
+            hook_hist.record(time.perf_counter_ns() - t0)
+            if not passed:
+                suppressed += 1
+        hook_done = time.perf_counter_ns()
+
+        listener.action_queue.wait_idle(timeout=30)
+        time.sleep(settle)
+        end = time.perf_counter_ns()
+        listener.action_queue.stop()
+        self.backend.unhook()
+
+        elapsed = (end - start) / 1e9
+        return {
+            "events": len(events),
+            "key_downs": sum(1 for e in events if e.event_type == KEY_DOWN),
+            "suppressed": suppressed,
+            "passed": len(events) - suppressed,
+            "elapsed_s": elapsed,
+            "hook_elapsed_s": (hook_done - start) / 1e9,
+            "throughput_eps": len(events) / elapsed if elapsed > 0 else 0.0,
+            "hook_latency": hook_hist.summary(),
+            "latency": listener.latency.snapshot(),
+            "injected": {
+                "keyboard": self.backend.count('batch'),
+                "scroll": self.backend.count('scroll'),
+                "click": self.backend.count('click'),
+                "replayed": self.backend.count('send'),
+                "commands": len(self.commands),
+                "window_cycles": len(self.window_cycles),
+                "window_jumps": len(self.window_jumps),
+                "mode_switches": self.disk.switches,
+            },
+            "scroll": self.mode_manager.get_scroll_stats(),
+            "queue": {"dropped": listener.action_queue.dropped, "merged": listener.action_queue.merged,
+                      "deferred": listener.action_queue.deferred},
+        }
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+按键序列匹配
+源键为 "f16 f16"、"f13 j" 这类以空格分隔的序列时，按前缀树逐键匹配，
+每个按键只走一步节点；歧义前缀（既是完整映射又是更长序列的前缀）在超时后通过共享调度器决议
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from key_mapper.utils.scheduler import TimerHandle, get_scheduler
+
+# feed 返回值
+SEQ_MISS = 0  # 不属于任何序列，按普通按键处理
+SEQ_CONSUMED = 1  # 已被序列吸收，屏蔽原按键
+SEQ_FLUSHED = 2  # 打断了等待中的序列（缓冲按键已补发），当前按键按普通按键处理
+
+
+class SequenceNode:
+    """前缀树节点"""
+
+    __slots__ = ('children', 'mode', 'mapping')
+
+    def __init__(self):
+        self.children: Dict[int, "SequenceNode"] = {}  # 按键 -> 子节点
+        self.mode = None  # 在此节点结束的映射所属模式
+        self.mapping = None  # 在此节点结束的 KeyMapping
+
+    def child(self, key: int) -> "SequenceNode":
+        """获取或创建子节点"""
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = SequenceNode()
+        return node
+
+
+class SequenceMatcher:
+    """序列匹配状态机
+
+    on_match(mode, mapping, keys) 在序列完整匹配时调用，
+    on_flush(keys) 在缓冲按键最终不构成序列时调用，keys 为按顺序的 (按键, name)。
+    按键为调用方使用的整数键，匹配器只做相等比较。
+    两个回调可能在钩子线程或调度线程中调用，只应做入队等轻量操作。
+    """
+
+    def __init__(self, on_match: Callable, on_flush: Callable, timeout_ms: int = 500):
+        self.on_match = on_match
+        self.on_flush = on_flush
+        self.timeout = max(0, timeout_ms) / 1000.0
+        self._lock = threading.Lock()
+        self._node: Optional[SequenceNode] = None  # 当前所在节点，None 表示未在匹配中
+        self._keys: List[Tuple[int, str]] = []  # 已吸收的按键
+        self._timer: Optional[TimerHandle] = None
+
+    @property
+    def pending(self) -> bool:
+        """是否有等待后续按键的序列"""
+        return self._node is not None
+
+    def feed(self, root: SequenceNode, key: int, name: str) -> int:
+        """处理一次按下事件，返回 SEQ_MISS / SEQ_CONSUMED / SEQ_FLUSHED"""
+        with self._lock:
+            result = SEQ_MISS
+            if self._node is not None:
+                node = self._node.children.get(key)
+                if node is not None:
+                    self._advance(node, key, name)
+                    return SEQ_CONSUMED
+                self._resolve()
+                result = SEQ_FLUSHED
+
+            node = root.children.get(key)
+            if node is None:
+                return result
+            self._advance(node, key, name)
+            return SEQ_CONSUMED
+
+    def reset(self):
+        """结束等待中的序列（如映射重新加载时）"""
+        with self._lock:
+            if self._node is not None:
+                self._resolve()
+
+    def _advance(self, node: SequenceNode, key: int, name: str):
+        """前进到子节点；叶子节点立即触发，否则等待下一个按键或超时"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._keys.append((key, name))
+        if not node.children:
+            self._node = node
+            self._resolve()
+            return
+        self._node = node
+        self._timer = get_scheduler().call_later(self.timeout, self._on_timeout, node)
+
+    def _resolve(self):
+        """在当前节点结束匹配：有映射则触发，否则补发缓冲的按键"""
+        node, keys = self._node, self._keys
+        self._node, self._keys = None, []
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if node.mapping is not None:
+            self.on_match(node.mode, node.mapping, keys)
+        else:
+            self.on_flush(keys)
+
+    def _on_timeout(self, node: SequenceNode):
+        """超时回调（调度线程）"""
+        with self._lock:
+            if self._node is node:
+                self._resolve()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+按键轨迹文件
+紧凑的二进制格式，记录带时间戳的按键事件（名称、扫描码、按下/抬起）
+
+文件格式（小端）:
+    头部: b'FKTR' + 版本(u8)
+    记录: 类型(u8) + 内容
+        0 名称定义: 名称编号(u16) + 长度(u8) + UTF-8 名称
+        1 按键事件: 距上一事件微秒数(u32) + 扫描码(u16) + 名称编号(u16) + 按下(u8)
+"""
+
+import struct
+from typing import BinaryIO, Dict, Iterable, List, Optional
+
+MAGIC = b'FKTR'
+VERSION = 1
+
+KEY_DOWN = 'down'
+KEY_UP = 'up'
+
+_TAG_NAME = 0
+_TAG_EVENT = 1
+_NAME = struct.Struct('<HB')
+_EVENT = struct.Struct('<IHHB')
+
+
+class TraceEvent:
+    """轨迹中的一个按键事件，属性与 keyboard.KeyboardEvent 一致，可直接喂给钩子回调"""
+
+    __slots__ = ('time_ns', 'name', 'scan_code', 'event_type')
+
+    def __init__(self, time_ns: int, name: str, scan_code: int, event_type: str):
+        self.time_ns = time_ns  # 相对轨迹开始的时间（纳秒）
+        self.name = name
+        self.scan_code = scan_code
+        self.event_type = event_type
+
+    def __repr__(self):
+        return f"TraceEvent({self.time_ns / 1e6:.3f}ms, {self.name}, {self.scan_code}, {self.event_type})"
+
+
+class TraceWriter:
+    """轨迹写入器"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        self._file.write(MAGIC + bytes([VERSION]))
+        self._names: Dict[str, int] = {}
+        self._last_ns: Optional[int] = None
+        self.count = 0
+
+    def write(self, name: str, scan_code: int, is_down: bool, time_ns: int):
+        """
+        写入一个按键事件
+
+        Args:
+            name: 按键名称
+            scan_code: 扫描码
+            is_down: 是否为按下事件
+            time_ns: 事件时间戳（纳秒，任意起点，单调递增）
+        """
+        name = name or 'unknown'
+        name_id = self._names.get(name)
+        if name_id is None:
+            name_id = self._names[name] = len(self._names)
+            encoded = name.encode('utf-8')[:255]
+            self._file.write(bytes([_TAG_NAME]) + _NAME.pack(name_id, len(encoded)) + encoded)
+
+        delta_us = 0 if self._last_ns is None else max(0, (time_ns - self._last_ns) // 1000)
+        self._last_ns = time_ns
+        self._file.write(bytes([_TAG_EVENT]) + _EVENT.pack(
+            min(delta_us, 0xFFFFFFFF), scan_code & 0xFFFF, name_id, 1 if is_down else 0))
+        self.count += 1
+
+    def close(self):
+        """关闭文件"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: str) -> List[TraceEvent]:
+    """读取轨迹文件"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:4] != MAGIC:
+        raise ValueError(f"不是有效的轨迹文件: {path}")
+    if data[4] != VERSION:
+        raise ValueError(f"不支持的轨迹版本: {data[4]}")
+
+    names: Dict[int, str] = {}
+    events: List[TraceEvent] = []
+    pos, t_ns = 5, 0
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        if tag == _TAG_NAME:
+            name_id, length = _NAME.unpack_from(data, pos)
+            pos += _NAME.size
+            names[name_id] = data[pos:pos + length].decode('utf-8')
+            pos += length
+        elif tag == _TAG_EVENT:
+            delta_us, scan_code, name_id, down = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            t_ns += delta_us * 1000
+            events.append(TraceEvent(t_ns, names.get(name_id, 'unknown'), scan_code,
+                                     KEY_DOWN if down else KEY_UP))
+        else:
+            raise ValueError(f"轨迹文件损坏: 位置 {pos - 1} 的记录类型 {tag}")
+    return events
+
+
+def write_trace(path: str, events: Iterable[TraceEvent]):
+    """将事件序列写入轨迹文件"""
+    writer = TraceWriter(path)
+    try:
+        for e in events:
+            writer.write(e.name, e.scan_code, e.event_type == KEY_DOWN, e.time_ns)
+    finally:
+        writer.close()
+
+
+def synthesize_spin(key_name: str, scan_code: int, detents: int = 200,
+                    interval_ms: float = 2.0, hold_ms: float = 0.5) -> List[TraceEvent]:
+    """
+    生成旋转编码器快速旋转的轨迹（每个刻度一次按下+抬起）
+
+    Args:
+        key_name: 编码器发出的按键名，如 "f20"
+        scan_code: 对应扫描码
+        detents: 刻度数
+        interval_ms: 相邻刻度间隔
+        hold_ms: 按下到抬起的间隔
+    """
+    events = []
+    for i in range(detents):
+        t = int(i * interval_ms * 1e6)
+        events.append(TraceEvent(t, key_name, scan_code, KEY_DOWN))
+        events.append(TraceEvent(t + int(hold_ms * 1e6), key_name, scan_code, KEY_UP))
+    return events
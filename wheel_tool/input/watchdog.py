@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+钩子看门狗
+Windows 会静默移除回调超时的低级键盘钩子，之后映射全部失效且没有任何提示。
+看门狗为每次钩子回调计时，超出预算时抓取钩子线程的调用栈并按映射统计超时次数；
+长时间收不到事件而系统中又有按键按下时，判定钩子已失效并自动重新安装
+"""
+
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Callable, Dict, Optional, Tuple
+
+
+class HookWatchdog:
+    """低级钩子看门狗
+
+    wrap() 返回的包装函数只在钩子线程中记录入口时间；
+    看门狗线程在有按键活动时每半个预算检查一次回调是否卡住，
+    空闲后只按失效检测间隔唤醒（未启用失效检测时完全休眠，等待下一个事件唤醒）。
+    """
+
+    IDLE_AFTER = 2.0  # 最后一个事件之后多久进入空闲（秒）
+    RECENT_WINDOW = 60.0  # 近期超时统计的时间窗口（秒）
+
+    def __init__(self, listener, budget_ms: float = 50, dead_hook_s: float = 5.0):
+        self.listener = listener
+        self.budget = max(1.0, budget_ms) / 1000.0  # 单次回调的时间预算（秒）
+        self.dead_after = max(0.0, dead_hook_s)  # 有按键按下却收不到事件多久判定钩子失效，0 表示不检测
+        self.total_overruns: Counter = Counter()  # (源按键, 动作类型) -> 累计超时次数
+        self.recent_overruns: deque = deque(maxlen=256)  # (时间, (源按键, 动作类型), 耗时毫秒)
+        self.last_stall: Optional[str] = None  # 最近一次卡住时钩子线程的调用栈
+        self.reinstalls = 0  # 自动重新安装钩子的次数
+
+        self._entered = 0.0  # 当前回调的入口时间，不在回调中时为 0
+        self._reported = 0.0  # 已抓取过调用栈的回调入口时间
+        self._hook_thread: Optional[int] = None
+        self._last_event = time.perf_counter()
+        self._reinstalled_at = 0.0  # 最近一次重新安装钩子的时间
+        self._sleeping = False
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def wrap(self, callback: Callable) -> Callable:
+        """包装钩子回调，为每次调用计时"""
+        def watched(event):
+            start = time.perf_counter()
+            self._entered = start
+            self._hook_thread = threading.get_ident()
+            if self._sleeping:
+                self._sleeping = False
+                self._wake.set()
+            try:
+                return callback(event)
+            finally:
+                end = time.perf_counter()
+                self._entered = 0.0
+                self._last_event = end
+                if end - start > self.budget:
+                    self._record_overrun(event, end - start)
+        return watched
+
+    def start(self):
+        """启动看门狗线程"""
+        if self._running:
+            return
+        self._running = True
+        self._last_event = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="HookWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止看门狗线程"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def overrun_counts(self, window: Optional[float] = None) -> Dict[Tuple[str, str], int]:
+        """最近 window 秒（默认 RECENT_WINDOW）内各映射的超时次数"""
+        since = time.perf_counter() - (window or self.RECENT_WINDOW)
+        return dict(Counter(key for t, key, _ in list(self.recent_overruns) if t >= since))
+
+    def summary(self) -> dict:
+        """看门狗统计摘要"""
+        return {
+            "budget_ms": self.budget * 1000,
+            "recent_overruns": {f"{src}/{action}": n for (src, action), n in self.overrun_counts().items()},
+            "total_overruns": sum(self.total_overruns.values()),
+            "reinstalls": self.reinstalls,
+        }
+
+    def _record_overrun(self, event, elapsed: float):
+        """记录一次超时（钩子线程，只在已经超时后执行）"""
+        entry = self.listener.entry_for(event.scan_code)
+        if entry is not None and entry.mapping is not None:
+            key = (entry.mapping.source_key, entry.mapping.action_type)
+        elif entry is not None and entry.hotkeys:
+            key = (event.name or str(event.scan_code), "hotkey")
+        else:
+            key = (event.name or str(event.scan_code), "none")
+        self.total_overruns[key] += 1
+        self.recent_overruns.append((time.perf_counter(), key, elapsed * 1000))
+        print(f"[看门狗] 钩子回调超时: {key[0]} ({key[1]}) 用时 {elapsed * 1000:.1f}ms，"
+              f"预算 {self.budget * 1000:.0f}ms")
+
+    def _capture_stack(self, elapsed: float):
+        """抓取卡住的钩子线程的调用栈"""
+        frame = sys._current_frames().get(self._hook_thread)
+        if frame is None:
+            return
+        self.last_stall = "".join(traceback.format_stack(frame))
+        print(f"[看门狗] 钩子回调已运行 {elapsed * 1000:.1f}ms，调用栈:\n{self.last_stall}")
+
+    def _check_dead_hook(self, now: float):
+        """有按键按下却长时间收不到事件：钩子已被系统移除，重新安装"""
+        if now - self._last_event < self.dead_after or self._last_event < self._reinstalled_at:
+            # 重新安装后还没有收到过事件时不再重复安装（重复安装会产生重复的系统钩子）
+            return
+        if not self.listener.backend.keys_pressed():
+            return
+        print(f"[看门狗] {now - self._last_event:.1f} 秒未收到按键事件但有按键按下，重新安装钩子")
+        self.reinstalls += 1
+        self._reinstalled_at = now
+        try:
+            self.listener.reinstall_hook()
+        except Exception as e:
+            print(f"[看门狗] 重新安装钩子失败: {e}")
+
+    def _run(self):
+        while self._running:
+            now = time.perf_counter()
+            entered = self._entered
+            if entered and now - entered > self.budget and entered != self._reported:
+                self._reported = entered
+                self._capture_stack(now - entered)
+            if self.dead_after:
+                self._check_dead_hook(now)
+
+            if entered or now - self._last_event < self.IDLE_AFTER:
+                timeout = self.budget / 2
+            else:
+                self._sleeping = True
+                if self._entered:
+                    # 设置休眠标志前刚进入回调
+                    self._sleeping = False
+                    continue
+                timeout = self.dead_after or None
+            self._wake.wait(timeout)
+            self._wake.clear()
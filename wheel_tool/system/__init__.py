@@ -2,10 +2,31 @@
 """
 系统模块
 包含系统级功能，如托盘图标、开机启动等
+
+名称按需导入，托盘图标（pystray）和开机启动（winreg）只在使用时加载
 """
 
-from .tray_icon import TrayIcon
-from .app import WheelToolApp
-from .startup_manager import StartupManager
+import importlib
+
+# 名称 -> 所在子模块
+_EXPORTS = {
+    'TrayIcon': '.tray_icon',
+    'WheelToolApp': '.app',
+    'StartupManager': '.startup_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """首次访问时导入对应子模块"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['TrayIcon', 'WheelToolApp', 'StartupManager']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,12 +6,13 @@
 
 import signal
 import sys
-import threading
 import time
 import os
 import subprocess
 from typing import Optional, Callable
 
+from key_mapper.utils.scheduler import get_scheduler
+from key_mapper.utils.timer_wheel import get_ui_timers
 from .tray_icon import TrayIcon
 from ..config.settings import GlobalConfig
 
@@ -27,6 +28,10 @@ class WheelToolApp:
         self.tray_icon = None
         self.running = False
         self._setup_tray_icon()
+
+        # 映射配置保存后热重载监听器的分发表
+        if self.mode_manager and self.listener:
+            self.mode_manager.on_config_changed = self.listener.reload
         
     def _setup_tray_icon(self):
         """设置系统托盘图标"""
@@ -35,7 +40,7 @@ class WheelToolApp:
             
         def on_settings():
             if self.settings_panel and self.disk:
-                self.disk.root.after(0, self.settings_panel.show)
+                self.disk.ui_queue.post('settings', self.settings_panel.show)
         
         def on_pause_state_changed(paused: bool):
             if self.listener:
@@ -66,6 +71,9 @@ class WheelToolApp:
 
         # 启动热键监听（必须在 disk.create_window() 之后）
         if self.listener:
+            if self.tray_icon:
+                # 暂停热键经托盘切换，图标和监听器状态保持一致
+                self.listener.on_pause_toggle = self.tray_icon.toggle_pause
             self.listener.start()
 
         # 设置信号处理
@@ -85,12 +93,14 @@ class WheelToolApp:
     def _run_main_loop(self):
         """运行主循环"""
         def check_interrupt():
-            """定期检查以响应信号"""
+            """定期让解释器运行以响应 Ctrl+C（Tk 主循环空闲时不会处理信号）"""
             if self.disk and self.running:
-                self.disk.root.after(100, check_interrupt)
+                get_ui_timers().call_later(0.1, check_interrupt)
 
         if self.disk:
-            check_interrupt()
+            # 只有在控制台中运行时才需要响应 Ctrl+C，托盘运行时主循环没有任何定时唤醒
+            if sys.stdin is not None and sys.stdin.isatty():
+                check_interrupt()
             try:
                 self.disk.root.mainloop()
             except KeyboardInterrupt:
@@ -106,7 +116,7 @@ class WheelToolApp:
         
         # 保存配置
         if self.mode_manager:
-            self.mode_manager.save_config()
+            self.mode_manager.save_config(notify=False)
         
         # 停止各个组件
         if self.listener:
@@ -130,7 +140,7 @@ class WheelToolApp:
         
         # 保存配置
         if self.mode_manager:
-            self.mode_manager.save_config()
+            self.mode_manager.save_config(notify=False)
         
         print("保存配置并清理资源...")
         
@@ -145,7 +155,7 @@ class WheelToolApp:
                            creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0)
             print("程序重启中...")
             # 延迟退出当前进程
-            threading.Timer(1.0, lambda: os._exit(0)).start()
+            get_scheduler().call_later(1.0, os._exit, 0)
         except Exception as e:
             print(f"重启失败: {e}")
             # 备用重启方式
@@ -154,7 +164,7 @@ class WheelToolApp:
                     os.system(f'start "" "{sys.executable}" "{current_script}"')
                 else:
                     os.system(f'nohup "{sys.executable}" "{current_script}" &')
-                threading.Timer(1.0, lambda: os._exit(0)).start()
+                get_scheduler().call_later(1.0, os._exit, 0)
             except Exception as e2:
                 print(f"无法重启程序: {e2}")
                 os._exit(0)
@@ -171,5 +181,7 @@ class WheelToolApp:
             "pause_state": self.tray_icon.is_paused if self.tray_icon else False,
             "current_mode": self.disk.current_mode if self.disk else None,
             "listener_running": self.listener.running if self.listener else False,
+            "scroll_stats": self.mode_manager.get_scroll_stats() if self.mode_manager else None,
+            "watchdog": self.listener.watchdog.summary() if self.listener and self.listener.watchdog else None,
         }
         return status
\ No newline at end of file
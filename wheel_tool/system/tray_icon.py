@@ -11,6 +11,9 @@ import subprocess
 from typing import Optional, Callable
 from PIL import Image, ImageDraw
 from pystray import Icon, Menu, MenuItem
+from key_mapper.utils.latency import get_latency_stats
+from key_mapper.utils.scheduler import get_scheduler
+from ..config.settings import GlobalConfig
 
 
 class TrayIcon:
@@ -49,7 +52,14 @@ class TrayIcon:
         """启动托盘图标"""
         menu = Menu(
             MenuItem('设置', self._open_settings),
-            MenuItem('暂停/恢复', self._toggle_pause),
+            MenuItem('暂停/恢复', self.toggle_pause),
+            MenuItem('延迟统计', Menu(
+                MenuItem('查看', self._show_latency),
+                MenuItem('导出 JSON', self._dump_latency),
+                MenuItem('启用统计', self._toggle_latency,
+                         checked=lambda item: get_latency_stats().enabled),
+                MenuItem('清空', lambda: get_latency_stats().reset()),
+            )),
             MenuItem('重启', self._restart_app),
             MenuItem('退出', self._exit_app)
         )
@@ -61,7 +71,7 @@ class TrayIcon:
         )
         threading.Thread(target=self.icon.run, daemon=True).start()
 
-    def _toggle_pause(self):
+    def toggle_pause(self):
         """切换暂停状态"""
         self.is_paused = not self.is_paused
         
@@ -78,6 +88,31 @@ class TrayIcon:
         
         print(f"暂停状态: {'已暂停' if self.is_paused else '已恢复'}")
 
+    def _show_latency(self):
+        """显示延迟统计摘要"""
+        summary = get_latency_stats().format_summary()
+        print("延迟统计:\n" + summary)
+        if self.icon:
+            try:
+                self.icon.notify(summary, "延迟统计")
+            except Exception as e:
+                print(f"显示通知失败: {e}")
+
+    def _dump_latency(self):
+        """导出延迟统计到 JSON 文件"""
+        path = GlobalConfig.get('diagnostics.latency_dump_path', 'latency_stats.json')
+        try:
+            get_latency_stats().dump_json(path)
+            print(f"延迟统计已导出: {os.path.abspath(path)}")
+        except Exception as e:
+            print(f"导出延迟统计失败: {e}")
+
+    def _toggle_latency(self):
+        """启用/停用延迟统计"""
+        stats = get_latency_stats()
+        stats.enabled = not stats.enabled
+        print(f"延迟统计: {'已启用' if stats.enabled else '已停用'}")
+
     def _open_settings(self):
         """打开设置"""
         if self.on_settings:
@@ -103,7 +138,7 @@ class TrayIcon:
                            creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0)
             print("程序重启中...")
             # 延迟退出当前进程，给新进程启动时间
-            threading.Timer(1.0, lambda: os._exit(0)).start()
+            get_scheduler().call_later(1.0, os._exit, 0)
         except Exception as e:
             print(f"重启失败: {e}")
             # 如果subprocess失败，尝试使用os.system
@@ -112,7 +147,7 @@ class TrayIcon:
                     os.system(f'start "" "{sys.executable}" "{current_script}"')
                 else:
                     os.system(f'nohup "{sys.executable}" "{current_script}" &')
-                threading.Timer(1.0, lambda: os._exit(0)).start()
+                get_scheduler().call_later(1.0, os._exit, 0)
             except Exception as e2:
                 print(f"无法重启程序: {e2}")
                 os._exit(0)
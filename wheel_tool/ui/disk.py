@@ -6,14 +6,19 @@
 
 import tkinter as tk
 import math
+from typing import Callable, List, Optional
 from PIL import Image, ImageDraw, ImageTk, ImageFont
 from ..config.settings import GlobalConfig
+from key_mapper.core.mode_state import ModeState
+from key_mapper.utils.latency import get_latency_stats
+from key_mapper.utils.timer_wheel import install_ui_timers
+from .ui_queue import UiCommandQueue
 
 
 class WheelDisk:
     """旋转环形指示器类 - 圆环旋转指向当前模式"""
 
-    MODES = ["浏览模式", "影音模式", "视频模式", "窗口管理"]
+    MODES = ["浏览模式", "影音模式", "视频模式", "窗口管理"]  # 未提供模式名称时的默认标签
     # 简约配色 - 低饱和度的现代色调
     COLORS = [
         "#E8E8E8",  # 浅灰 - 浏览模式
@@ -25,14 +30,17 @@ class WheelDisk:
     ACTIVE_COLOR = "#FFFFFF"  # 纯白
     INACTIVE_COLOR = "#404040"  # 深灰
 
-    # 模式标签的固定角度位置（对齐到每个象限的中心）
-    MODE_ANGLES = [45, 135, 225, 315]  # 右上、左上、左下、右下（每个象限中心）
-
-    def __init__(self):
-        self.current_mode = 0
+    def __init__(self, mode_state: ModeState = None, mode_names: Optional[Callable[[], List[str]]] = None):
+        # 当前模式由共享的 ModeState 维护，圆盘只负责显示
+        self.mode_state = mode_state or ModeState(len(self.MODES))
+        # 模式名称来源（通常为模式管理器），圆环按实际模式数量等分
+        self.mode_names = mode_names
+        self.mode_state.add_observer(self._on_mode_changed)
         self.root = None
         self.canvas = None
         self.visible = False
+        self.timers = None  # 界面定时器服务（时间轮的 Tk 适配器）
+        self.ui_queue: Optional[UiCommandQueue] = None  # 其他线程向界面投递命令的队列
         self.hide_timer = None
         self.size = 320
         self.scale = 4
@@ -68,6 +76,9 @@ class WheelDisk:
     def create_window(self):
         """创建圆盘窗口"""
         self.root = tk.Tk()
+        self.timers = install_ui_timers(self.root)
+        self.ui_queue = UiCommandQueue(self.root)
+        self.ui_queue.start()
         self.root.title("模式切换")
         self.root.overrideredirect(True)
 
@@ -111,6 +122,25 @@ class WheelDisk:
             diff -= 360
         return diff
 
+    def _mode_count(self) -> int:
+        """圆环上的扇区数量（与模式状态一致）"""
+        return self.mode_state.mode_count
+
+    def _mode_span(self) -> float:
+        """每个模式扇区的角度"""
+        return 360 / self._mode_count()
+
+    def _mode_angle(self, index: int) -> float:
+        """模式扇区中心的角度（4 个模式时为 45、135、225、315 度）"""
+        return (index + 0.5) * self._mode_span()
+
+    def _mode_name(self, index: int) -> str:
+        """模式标签文字"""
+        names = self.mode_names() if self.mode_names else self.MODES
+        if index < len(names):
+            return names[index]
+        return f"模式{index + 1}"
+
     def _animate_rotation(self):
         """执行指针旋转动画（按固定方向旋转）"""
         if not self.is_animating or not self.root:
@@ -131,7 +161,6 @@ class WheelDisk:
         if abs(diff) < 1:
             self.pointer_angle = self.target_pointer_angle
             self.is_animating = False
-            self.animation_timer = None
             self.draw_disk()
             # 动画完成后重新设置自动隐藏定时器
             self._reset_hide_timer()
@@ -144,7 +173,7 @@ class WheelDisk:
 
         # 重绘并继续动画
         self.draw_disk()
-        self.animation_timer = self.root.after(10, self._animate_rotation)  # ~100fps 更流畅
+        self.animation_timer = self.timers.reschedule(self.animation_timer, 0.01, self._animate_rotation)  # ~100fps 更流畅
 
     def draw_disk(self):
         """绘制旋转环形指示器"""
@@ -179,20 +208,20 @@ class WheelDisk:
         self.tk_image = ImageTk.PhotoImage(img)
         self.canvas.create_image(self.size // 2, self.size // 2, image=self.tk_image)
 
+        # 记录模式切换到首帧重绘完成的延迟
+        get_latency_stats().end_mode_switch()
+
     def _draw_rotating_ring(self, draw, cx, cy, size):
         """绘制简约风格的固定圆环"""
         r_outer = int(size * 0.40)  # 稍微增大外半径
         r_inner = int(size * 0.26)  # 稍微减小内半径，让圆环更宽
 
-        # 固定的4个象限，使用简约配色
-        quadrants = [
-            (0, 90, 0),      # 右侧 - 浏览模式
-            (90, 180, 1),    # 上侧 - 影音模式
-            (180, 270, 2),   # 左侧 - 视频模式
-            (270, 360, 3),   # 下侧 - 窗口管理
-        ]
+        # 按模式数量等分圆环（4 个模式时即四个象限），使用简约配色
+        span = self._mode_span()
+        count = self._mode_count()
+        sectors = [(round(i * span), round((i + 1) * span), i) for i in range(count)]
 
-        for start_angle, end_angle, mode_idx in quadrants:
+        for start_angle, end_angle, mode_idx in sectors:
             # 当前模式用白色，其他用深灰
             if mode_idx == self.current_mode:
                 color = self._hex_to_rgb(self.ACTIVE_COLOR)
@@ -201,11 +230,12 @@ class WheelDisk:
 
             # 绘制纯色扇形，不要渐变
             for i in range(start_angle, end_angle, 2):
-                self._draw_arc_segment(draw, cx, cy, r_outer, r_inner, i, i + 2, color)
+                self._draw_arc_segment(draw, cx, cy, r_outer, r_inner, i, min(i + 2, end_angle), color)
 
         # 绘制分隔线（细线条）
         separator_width = 2 * self.scale
-        for angle in [0, 90, 180, 270]:
+        separators = [start_angle for start_angle, _, _ in sectors] if count > 1 else []
+        for angle in separators:
             rad = math.radians(angle)
             x1 = cx + r_inner * math.cos(rad)
             y1 = cy - r_inner * math.sin(rad)
@@ -274,8 +304,8 @@ class WheelDisk:
         # 标签半径
         label_radius = self.size * 0.33
 
-        for i, angle in enumerate(self.MODE_ANGLES):
-            rad = math.radians(angle)
+        for i in range(self._mode_count()):
+            rad = math.radians(self._mode_angle(i))
             tx = cx + label_radius * math.cos(rad)
             ty = cy - label_radius * math.sin(rad)
 
@@ -285,7 +315,7 @@ class WheelDisk:
             else:
                 text_color = (200, 200, 200, 255)  # 亮灰色，在深色背景上清晰
 
-            draw.text((tx, ty), self.MODES[i], font=font,
+            draw.text((tx, ty), self._mode_name(i), font=font,
                      fill=text_color, anchor="mm")
 
     def show(self):
@@ -312,18 +342,8 @@ class WheelDisk:
 
     def _reset_hide_timer(self):
         """重置自动隐藏定时器"""
-        if self.hide_timer:
-            try:
-                self.root.after_cancel(self.hide_timer)
-                self.hide_timer = None
-            except:
-                pass
-
-        try:
-            delay = self.display_config.get('hide_delay', 600)
-            self.hide_timer = self.root.after(delay, self.hide)
-        except Exception as e:
-            print(f"设置隐藏定时器失败: {e}")
+        delay = self.display_config.get('hide_delay', 600)
+        self.hide_timer = self.timers.reschedule(self.hide_timer, delay / 1000.0, self.hide)
 
     def _start_rotation_animation(self, target_angle, direction=1):
         """开始指针旋转动画
@@ -337,52 +357,48 @@ class WheelDisk:
 
         # 取消自动隐藏定时器，避免动画过程中被隐藏
         if self.hide_timer:
-            try:
-                self.root.after_cancel(self.hide_timer)
-                self.hide_timer = None
-            except:
-                pass
+            self.hide_timer.cancel()
 
         # 如果已经在动画中，取消旧动画
         if self.animation_timer:
-            try:
-                self.root.after_cancel(self.animation_timer)
-                self.animation_timer = None
-            except:
-                pass
+            self.animation_timer.cancel()
 
         self.is_animating = True
         self._animate_rotation()
 
-    def next_mode(self):
-        """切换到下一个模式"""
-        # 改为逆向切换模式索引，但保持顺时针旋转
-        self.current_mode = (self.current_mode - 1) % 4
-
-        # 计算指针目标角度（指针转动，指向当前模式象限中心）
-        # 模式0=右上(45度), 模式1=左上(135度), 模式2=左下(225度), 模式3=右下(315度)
-        target_angle = 45 + self.current_mode * 90
+    @property
+    def current_mode(self) -> int:
+        """当前模式索引"""
+        return self.mode_state.index
 
-        # 确保窗口显示
-        if not self.visible:
-            self.root.attributes('-alpha', 1.0)
-            self.root.deiconify()
-            self.root.lift()
-            self.root.attributes('-topmost', True)
-            self.visible = True
+    @current_mode.setter
+    def current_mode(self, index: int):
+        self.mode_state.set_index(index)
 
-        # 启动旋转动画 - 顺时针旋转（与旋钮方向一致）
-        self._start_rotation_animation(target_angle, direction=1)
+    def _on_mode_changed(self, snapshot, direction: int):
+        """模式状态变化（可能在非界面线程中调用），转到界面线程显示，连续切换只显示最新的目标模式"""
+        if self.ui_queue:
+            self.ui_queue.post('mode', self._show_mode, snapshot.index, direction)
 
-        print(f"切换到: {self.MODES[self.current_mode]}")
+    def next_mode(self):
+        """切换到下一个模式"""
+        # 改为逆向切换模式索引，但保持顺时针旋转
+        self.mode_state.step(-1)
 
     def prev_mode(self):
         """切换到上一个模式"""
         # 改为正向切换模式索引，但保持逆时针旋转
-        self.current_mode = (self.current_mode + 1) % 4
+        self.mode_state.step(1)
+
+    def _show_mode(self, index: int, direction: int):
+        """显示并旋转到指定模式（界面线程）
 
-        # 计算指针目标角度（指向象限中心）
-        target_angle = 45 + self.current_mode * 90
+        Args:
+            direction: 索引变化方向，-1（下一模式）顺时针旋转，1（上一模式）逆时针旋转
+        """
+        # 计算指针目标角度（指针转动，指向当前模式扇区中心）
+        # 4 个模式时：模式0=右上(45度), 模式1=左上(135度), 模式2=左下(225度), 模式3=右下(315度)
+        target_angle = self._mode_angle(index)
 
         # 确保窗口显示
         if not self.visible:
@@ -392,10 +408,10 @@ class WheelDisk:
             self.root.attributes('-topmost', True)
             self.visible = True
 
-        # 启动旋转动画 - 逆时针旋转（与旋钮方向一致）
-        self._start_rotation_animation(target_angle, direction=-1)
+        # 启动旋转动画 - 与旋钮方向一致
+        self._start_rotation_animation(target_angle, direction=-1 if direction > 0 else 1)
 
-        print(f"切换到: {self.MODES[self.current_mode]}")
+        print(f"切换到: {self._mode_name(index)}")
 
     def get_current_mode(self):
         return self.current_mode
@@ -6,6 +6,7 @@
 
 import tkinter as tk
 from PIL import Image, ImageDraw, ImageTk, ImageFont
+from key_mapper.utils.timer_wheel import TkTimerService, get_ui_timers
 from ..config.settings import GlobalConfig
 
 
@@ -23,7 +24,8 @@ class HintOverlay:
         self.window = None
         self.canvas = None
         self.tk_image = None
-        self.hide_timer = None
+        self.hide_timer = None  # 自动隐藏定时器（界面时间轮）
+        self.timers = None
         self.visible = False
 
         # 从配置加载提示显示参数
@@ -138,14 +140,6 @@ class HintOverlay:
         if not self.window:
             self.create_window()
 
-        # 取消之前的隐藏定时器
-        if self.hide_timer:
-            try:
-                self.window.after_cancel(self.hide_timer)
-                self.hide_timer = None
-            except:
-                pass
-
         # 绘制提示内容
         self._draw_hint(hint_text)
 
@@ -156,9 +150,15 @@ class HintOverlay:
             self.window.attributes('-topmost', True)
             self.visible = True
 
-        # 设置自动隐藏定时器
+        # 设置（或顺延）自动隐藏定时器
         duration = self.hint_config.get('display_duration', 1200)
-        self.hide_timer = self.window.after(duration, self.hide)
+        self.hide_timer = self._timers().reschedule(self.hide_timer, duration / 1000.0, self.hide)
+
+    def _timers(self) -> TkTimerService:
+        """界面定时器服务；没有主窗口的服务时（独立预览）使用自己的"""
+        if self.timers is None:
+            self.timers = get_ui_timers() or TkTimerService(self.window)
+        return self.timers
 
     def _draw_hint(self, hint_text: str):
         """绘制提示内容"""
@@ -225,11 +225,7 @@ class HintOverlay:
 
             # 取消定时器
             if self.hide_timer:
-                try:
-                    self.window.after_cancel(self.hide_timer)
-                    self.hide_timer = None
-                except:
-                    pass
+                self.hide_timer.cancel()
 
     def update_config(self, new_config: dict):
         """更新配置并重新创建窗口"""
@@ -257,11 +253,8 @@ class HintOverlay:
     def destroy(self):
         """销毁窗口"""
         if self.hide_timer:
-            try:
-                self.window.after_cancel(self.hide_timer)
-                self.hide_timer = None
-            except:
-                pass
+            self.hide_timer.cancel()
+            self.hide_timer = None
 
         if self.window:
             try:
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+界面命令队列
+钩子线程、执行线程和托盘线程向 Tk 主循环投递界面更新的唯一入口，
+投递方只把命令放入队列，队列由空变为非空时向 Tk 发出一个虚拟事件唤醒主循环，
+Tk 线程按帧合并执行；空闲时没有任何定时唤醒
+"""
+
+import threading
+from typing import Callable, Dict
+
+
+class UiCommandQueue:
+    """跨线程界面命令队列
+
+    带 key 的命令按 key 合并，只保留最新的一条（最新的提示、最新的目标模式）；
+    key 为 None 的命令不合并。post 只把命令放入队列（任意线程），
+    只有队列由空变为非空时才通过 event_generate（Tcl 把它转交给 Tk 线程）唤醒一次。
+    Tk 线程收到唤醒后立即执行，有命令继续到达时每帧执行一次，队列清空后停止。
+    """
+
+    FRAME = 1 / 60  # 有命令时两次执行之间的间隔（秒）
+    WAKE_EVENT = '<<UiCommands>>'  # 唤醒 Tk 线程的虚拟事件
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._commands: Dict[object, tuple] = {}  # key -> (func, args)，按投递顺序
+        self._armed = False  # 是否已唤醒或预约了下一帧
+        self._started = False
+        self._after_id = None
+        self.merged = 0  # 被更新的命令取代的次数
+        self.wakeups = 0  # 由空变为非空的唤醒次数
+
+    def start(self):
+        """绑定唤醒事件并执行已投递的命令（Tk 线程，主窗口创建后调用）"""
+        if self._started:
+            return
+        self._started = True
+        self.root.bind(self.WAKE_EVENT, lambda event: self._poll())
+        with self._lock:
+            self._armed = bool(self._commands)
+        if self._armed:
+            self._poll()
+
+    def stop(self):
+        """停止执行（Tk 线程）"""
+        self._started = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def post(self, key, func: Callable, *args):
+        """投递命令（任意线程），同 key 的旧命令被取代"""
+        with self._lock:
+            if key is None:
+                key = object()
+            elif self._commands.pop(key, None) is not None:
+                self.merged += 1
+            self._commands[key] = (func, args)
+            if self._armed or not self._started:
+                return
+            self._armed = True
+            self.wakeups += 1
+
+        try:
+            self.root.event_generate(self.WAKE_EVENT, when='tail')
+        except Exception as e:
+            # 主窗口已销毁
+            with self._lock:
+                self._armed = False
+            print(f"[界面队列] 唤醒主循环失败: {e}")
+
+    def pending(self) -> int:
+        """待执行的命令数量"""
+        with self._lock:
+            return len(self._commands)
+
+    def _poll(self):
+        """执行所有待处理命令（Tk 线程）；执行了命令时预约下一帧，否则停止"""
+        self._after_id = None
+        with self._lock:
+            commands = list(self._commands.values())
+            self._commands.clear()
+            self._armed = bool(commands) and self._started
+
+        for func, args in commands:
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[界面队列] 命令执行失败: {e}")
+
+        if commands and self._started:
+            # 同一帧内继续到达的命令等到下一帧一起执行
+            try:
+                self._after_id = self.root.after(int(self.FRAME * 1000), self._poll)
+            except Exception as e:
+                with self._lock:
+                    self._armed = False
+                print(f"[界面队列] 预约执行失败: {e}")